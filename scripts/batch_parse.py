@@ -0,0 +1,155 @@
+# scripts/batch_parse.py
+"""
+Parse many saved division match pages in parallel into one Parquet file.
+
+    python -m scripts.batch_parse data/snapshots data/ic_mixed_matches_parsed.parquet
+    python -m scripts.batch_parse path/to/pages out.parquet --workers 8
+
+Pages are parsed with extract_all_matches_lxml in a ProcessPoolExecutor. Each
+worker returns a small Arrow table per page, and the parent streams those
+tables straight into a ParquetWriter in input order, so the output is
+deterministic and the parent never holds the full list of match dicts.
+"""
+
+import argparse
+import glob
+import gzip
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import pyarrow.parquet as pq
+from lxml import html as lxml_html
+
+from scripts.match_store import RAW_MATCH_SCHEMA, matches_to_table
+from scripts.scraper_utils import extract_all_matches_lxml
+from scripts.snapshot_store import INDEX_FILE, list_snapshots, object_path
+
+
+def page_context(html):
+    """
+    Season and division from the selected options of the page's dropdowns,
+    (None, None) where they can't be found.
+    """
+    root = lxml_html.document_fromstring(html)
+
+    def selected(select_id):
+        options = root.xpath(f'//select[@id="{select_id}"]/option')
+        chosen = [o for o in options if o.get("selected") is not None]
+        return chosen[0].text_content().strip() if chosen else None
+
+    return selected("arch_season_list"), selected("divgs_div_list")
+
+
+def collect_jobs(sources):
+    """
+    Turn the input into a list of (path, season, division) jobs.
+
+    sources can be:
+        - a snapshot store folder (has index.jsonl): latest 'matches' snapshot per division
+        - a folder of .html / .html.gz files
+        - a list of file paths, or of (path, season, division) tuples
+    Season / division left as None are read from the page itself.
+    """
+    if isinstance(sources, (str, os.PathLike)):
+        folder = str(sources)
+        if os.path.exists(os.path.join(folder, INDEX_FILE)):
+            snapshots = list_snapshots(folder, kind="matches")
+            return [
+                (object_path(folder, s.sha256), s.season, s.division)
+                for s in snapshots.itertuples(index=False)
+            ]
+        sources = sorted(
+            glob.glob(os.path.join(folder, "*.html")) + glob.glob(os.path.join(folder, "*.html.gz"))
+        )
+
+    return [
+        tuple(source) if isinstance(source, (tuple, list)) else (str(source), None, None)
+        for source in sources
+    ]
+
+
+def _read_html(path):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return f.read()
+
+
+def parse_page_file(job):
+    """
+    Worker: parse one saved page into an Arrow table with RAW_MATCH_SCHEMA.
+    """
+    path, season, division = job
+    html = _read_html(path)
+
+    if season is None or division is None:
+        page_season, page_division = page_context(html)
+        season = season or page_season or "N/A"
+        division = division or page_division or os.path.basename(path).split(".")[0]
+
+    matches = extract_all_matches_lxml(html, season, division)
+    return matches_to_table(pd.DataFrame(matches)) if matches else None
+
+
+def _ordered_results(executor, func, jobs, window):
+    """
+    Like executor.map, but keeps at most `window` jobs in flight so finished
+    results don't pile up in the parent. Results come back in input order.
+    """
+    pending = deque()
+    jobs = iter(jobs)
+
+    for job in jobs:
+        pending.append(executor.submit(func, job))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+
+    while pending:
+        yield pending.popleft().result()
+
+
+def batch_parse_pages(sources, output_path, max_workers=None):
+    """
+    Parse saved match pages in parallel and write one Parquet file.
+
+    Parameters:
+        sources: see collect_jobs
+        output_path (str): Parquet file to write
+        max_workers (int, optional): worker processes (default: number of CPUs)
+
+    Returns:
+        dict: pages, matches and output path
+    """
+    jobs = collect_jobs(sources)
+    max_workers = max_workers or os.cpu_count() or 1
+    n_matches = 0
+
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    tmp_path = f"{output_path}.tmp"
+
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor, \
+                pq.ParquetWriter(tmp_path, RAW_MATCH_SCHEMA) as writer:
+            for table in _ordered_results(executor, parse_page_file, jobs, window=4 * max_workers):
+                if table is not None:
+                    writer.write_table(table)
+                    n_matches += table.num_rows
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        # Don't leave a half-written file behind
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    print(f"✅ Parsed {len(jobs)} pages → {n_matches} matches → {output_path}")
+    return {"pages": len(jobs), "matches": n_matches, "output": output_path}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parse saved match pages into one Parquet file.")
+    parser.add_argument("source", help="snapshot store or folder of .html pages")
+    parser.add_argument("output", help="output .parquet file")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all CPUs)")
+    args = parser.parse_args()
+
+    batch_parse_pages(args.source, args.output, max_workers=args.workers)
@@ -0,0 +1,85 @@
+# scripts/benchmark_extract.py
+"""
+Compare the BeautifulSoup and lxml match extraction engines on saved pages.
+
+    python -m scripts.benchmark_extract                    # latest snapshots in data/snapshots
+    python -m scripts.benchmark_extract path/to/pages      # a folder of saved .html files
+
+Checks that both engines return identical records for every page, then reports
+per-engine time and the speedup.
+"""
+
+import contextlib
+import glob
+import io
+import os
+import sys
+import time
+
+import pandas as pd
+
+from scripts.scraper_utils import extract_all_matches, extract_all_matches_lxml
+from scripts.snapshot_store import DEFAULT_SNAPSHOT_PATH, list_snapshots, load_snapshot
+
+ENGINES = {
+    "bs4 (html.parser)": extract_all_matches,
+    "lxml (xpath)": extract_all_matches_lxml,
+}
+
+
+def load_pages(source=DEFAULT_SNAPSHOT_PATH):
+    """
+    Pages to benchmark as (html, season, division) tuples, from a snapshot store
+    or a folder of .html files.
+    """
+    html_files = sorted(glob.glob(os.path.join(source, "*.html")))
+    if html_files:
+        pages = []
+        for path in html_files:
+            with open(path, encoding="utf-8") as f:
+                pages.append((f.read(), "N/A", os.path.splitext(os.path.basename(path))[0]))
+        return pages
+
+    snapshots = list_snapshots(source, kind="matches")
+    return [(load_snapshot(s.sha256, source), s.season, s.division) for s in snapshots.itertuples(index=False)]
+
+
+def benchmark_extract(pages, repeat=3):
+    """
+    Time each engine over all pages (best of `repeat` runs) and check they agree.
+
+    Returns:
+        pandas DataFrame: one row per engine with seconds, ms_per_page and speedup
+    """
+    if not pages:
+        raise ValueError("No pages to benchmark")
+
+    # Both engines print the same per-block errors; keep the report readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        reference = [extract_all_matches(*page) for page in pages]
+        fast = [extract_all_matches_lxml(*page) for page in pages]
+    mismatches = [page[2] for page, a, b in zip(pages, reference, fast) if a != b]
+    if mismatches:
+        raise AssertionError(f"Engines disagree on {len(mismatches)} pages: {mismatches[:5]}")
+
+    rows = []
+    for name, engine in ENGINES.items():
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                for page in pages:
+                    engine(*page)
+            best = min(best, time.perf_counter() - start)
+        rows.append({"engine": name, "seconds": best, "ms_per_page": 1000 * best / len(pages)})
+
+    results = pd.DataFrame(rows).set_index("engine")
+    results["speedup"] = results["seconds"].iloc[0] / results["seconds"]
+    return results
+
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_SNAPSHOT_PATH
+    pages = load_pages(source)
+    print(f"📄 {len(pages)} pages, {sum(len(p[0]) for p in pages) / 1e6:.1f} MB of HTML")
+    print(benchmark_extract(pages).round(3))
@@ -0,0 +1,189 @@
+# scripts/calibration.py
+"""
+Parallel ELO calibration grid search.
+
+The cleaned match table (the output of clean_metadata_pipeline) is turned into
+integer match arrays once: player keys, dates, outcomes, division level and
+line. Those arrays are copied into shared memory, and a process pool scores
+chunks of the parameter grid with elo.sweep_elo. Workers map the shared
+blocks as NumPy arrays, so match data is never pickled or copied per worker.
+
+Usage (from the project root), after incremental_clean has run:
+    python -m scripts.calibration
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from scripts.cleaning import clean_full_dataframe
+from scripts.dimensions import split_dimensions
+from scripts.elo import DEFAULT_SCALE, independent_waves, match_arrays, param_grid, sweep_elo
+
+DEFAULT_RESULTS_PATH = "data/calibration/elo_grid_results.csv"
+
+# Arrays shared with the workers
+SHARED_ARRAYS = ["home1", "home2", "away1", "away2", "outcome", "level", "line", "date", "order", "bounds"]
+
+DEFAULT_GRID = {
+    "k_factors": [8, 12, 16, 20, 24, 32, 40, 48, 64],
+    "initial_ratings": [1400, 1500, 1600],
+    "division_offsets": [
+        None,
+        {"Major": 100, "A": 50, "B": 0, "C": -50},
+        {"Major": 200, "A": 100, "B": 0, "C": -100},
+    ],
+}
+
+
+# -- Match arrays --
+def calibration_arrays(df_clean):
+    """
+    Match arrays for calibration from clean_metadata_pipeline output.
+
+    Scores are summarized with clean_full_dataframe when needed, so matches
+    without scraped win flags can still be scored. Dates are stored as
+    datetime64[s] ints.
+
+    Returns:
+        dict of NumPy arrays (see elo.match_arrays), plus the waves order / bounds
+    """
+    if "set_wins_home" not in df_clean.columns and "Score" in df_clean.columns:
+        df_clean = clean_full_dataframe(df_clean)
+
+    tables = split_dimensions(df_clean)
+    arrays = match_arrays(tables["matches"], tables["divisions"])
+    if "date" in arrays:
+        arrays["date"] = arrays["date"].astype("datetime64[s]").astype(np.int64)
+    for name in ["home1", "home2", "away1", "away2"]:
+        # sweep_elo indexes with int64; store them that way so workers don't convert
+        arrays[name] = arrays[name].astype(np.int64)
+
+    arrays["order"], arrays["bounds"] = independent_waves(
+        arrays["home1"], arrays["home2"], arrays["away1"], arrays["away2"]
+    )
+    return {name: np.ascontiguousarray(arrays[name]) for name in SHARED_ARRAYS if name in arrays}
+
+
+# -- Shared memory --
+def share_arrays(arrays):
+    """
+    Copy arrays into new shared memory blocks.
+
+    Returns:
+        tuple: (blocks, spec) -- the SharedMemory objects (close and unlink
+               them when done) and {name: (block name, shape, dtype)} for attach_arrays
+    """
+    blocks, spec = [], {}
+    for name, array in arrays.items():
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+        blocks.append(block)
+        spec[name] = (block.name, array.shape, array.dtype.str)
+    return blocks, spec
+
+def attach_arrays(spec):
+    """
+    Map shared blocks from share_arrays as read-only NumPy arrays (no copy).
+
+    Returns:
+        tuple: (blocks, arrays) -- keep the blocks referenced while using the arrays
+    """
+    blocks, arrays = [], {}
+    for name, (block_name, shape, dtype) in spec.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+        array.flags.writeable = False
+        blocks.append(block)
+        arrays[name] = array
+    return blocks, arrays
+
+def release_arrays(blocks, unlink=False):
+    for block in blocks:
+        block.close()
+        if unlink:
+            block.unlink()
+
+
+# -- Workers --
+_worker_blocks = []
+_worker_arrays = {}
+
+def _init_worker(spec):
+    global _worker_blocks, _worker_arrays
+    _worker_blocks, _worker_arrays = attach_arrays(spec)
+
+def _score_chunk(job):
+    """
+    Worker: score one chunk of the grid against the shared match arrays.
+    """
+    chunk_id, configs, scale, burn_in = job
+    start = time.perf_counter()
+    arrays = _worker_arrays
+    results = sweep_elo(
+        arrays, configs, scale=scale, burn_in=burn_in, waves=(arrays["order"], arrays["bounds"])
+    )
+    results["chunk"] = chunk_id
+    results["chunk_seconds"] = time.perf_counter() - start
+    results["worker_pid"] = os.getpid()
+    return results
+
+
+# -- Grid search --
+def calibrate(df_clean, grid=None, max_workers=None, n_chunks=None, scale=DEFAULT_SCALE, burn_in=0):
+    """
+    Score every configuration in the grid and rank them by log-loss.
+
+    Parameters:
+        df_clean (DataFrame): clean_metadata_pipeline output
+        grid (DataFrame, optional): configurations (see elo.param_grid);
+                                    default: DEFAULT_GRID
+        max_workers (int, optional): worker processes (default: number of CPUs)
+        n_chunks (int, optional): grid chunks (default: 2 per worker)
+        burn_in (int): initial matches left out of the scores
+
+    Returns:
+        pandas DataFrame: one row per configuration with rank, log_loss, brier,
+                          n_scored, and the chunk / chunk_seconds / worker_pid it ran in
+    """
+    grid = param_grid(**DEFAULT_GRID) if grid is None else grid.reset_index(drop=True)
+    max_workers = max_workers or os.cpu_count() or 1
+    n_chunks = max(1, min(n_chunks or 2 * max_workers, len(grid)))
+
+    start = time.perf_counter()
+    arrays = calibration_arrays(df_clean)
+    print(f"🎾 {len(arrays['outcome'])} rateable matches loaded in {time.perf_counter() - start:.2f}s")
+
+    jobs = [
+        (chunk_id, grid.iloc[positions], scale, burn_in)
+        for chunk_id, positions in enumerate(np.array_split(np.arange(len(grid)), n_chunks))
+    ]
+
+    blocks, spec = share_arrays(arrays)
+    try:
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(spec,)) as executor:
+            results = pd.concat(executor.map(_score_chunk, jobs), ignore_index=True)
+        print(f"✅ Scored {len(grid)} configurations in {len(jobs)} chunks on {max_workers} workers "
+              f"in {time.perf_counter() - start:.2f}s")
+    finally:
+        release_arrays(blocks, unlink=True)
+
+    results = results.sort_values(["log_loss", "brier"], kind="stable").reset_index(drop=True)
+    results.insert(0, "rank", np.arange(1, len(results) + 1))
+    return results
+
+
+if __name__ == "__main__":
+    from scripts.incremental_clean import DEFAULT_CLEANED_PATH
+
+    results = calibrate(pd.read_parquet(DEFAULT_CLEANED_PATH), burn_in=1000)
+
+    os.makedirs(os.path.dirname(DEFAULT_RESULTS_PATH), exist_ok=True)
+    results.to_csv(DEFAULT_RESULTS_PATH, index=False)
+    print(results.head(10).to_string(index=False))
+    print(f"\n📄 Full results → {DEFAULT_RESULTS_PATH}")
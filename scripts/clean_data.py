@@ -2,17 +2,17 @@ import pandas as pd
 import re
 import os
 import glob
-from cleaning import (
-    fix_match_date, 
-    parse_division_level, 
-    cast_division_level, 
+from scripts.cleaning import (
     validate_line,
     create_team_match_id,
     create_match_id
     )
+from scripts.match_store import read_matches
+from scripts.metadata_utils import fix_match_dates, map_unique, parse_division_levels
 
 # Import any other cleaning functions you have (e.g., fix_bad_scores later)
 
+# Run from the project root: python -m scripts.clean_data
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 
 clean_data_path = os.path.join(project_root, "data", "ic_mixed_matches_cleaned.csv")
@@ -20,15 +20,22 @@ clean_data_path = os.path.join(project_root, "data", "ic_mixed_matches_cleaned.c
 df_clean = pd.read_csv(clean_data_path)
 
 
-# Grab all match files from the 'data/processed' folder
-match_files = glob.glob(os.path.join(project_root, "data", "processed", "ic_mixed_matches*.csv"))
+match_store_path = os.path.join(project_root, "data", "matches")
 
-# Combine them into one DataFrame
-df_raw = pd.concat([pd.read_csv(f) for f in match_files], ignore_index=True)
+if os.path.isdir(match_store_path):
+    # Load everything from the partitioned Parquet match store
+    df_raw = read_matches(match_store_path)
+else:
+    # Grab all match files from the 'data/processed' folder
+    match_files = glob.glob(os.path.join(project_root, "data", "processed", "ic_mixed_matches*.csv"))
+
+    # Combine them into one DataFrame
+    df_raw = pd.concat([pd.read_csv(f) for f in match_files], ignore_index=True)
 
 
 # --- Step 2: Fix Dates ---
-df_raw['Date_fixed'] = df_raw['Date'].apply(fix_match_date)
+df_raw['Date_fixed'], used_fallback = fix_match_dates(df_raw['Date'])
+print(f"🐢 Dates parsed by the slow fallback: {used_fallback.sum()}")
 
 # Number of missing (bad) dates
 num_bad_dates = df_raw['Date_fixed'].isna().sum()
@@ -46,11 +53,9 @@ else:
     print("⚠️  All dates missing — check your data!")
 
 
-# --- Step 3: Parse Division Level ---
-df_raw['division_level'] = df_raw['Division'].apply(parse_division_level)
-
-# --- Step 4: Cast Division Level to Ordered Categorical ---
-df_raw['division_level'] = cast_division_level(df_raw['division_level'])
+# --- Step 3 + 4: Parse Division Level straight into an Ordered Categorical ---
+# (ordered as metadata_utils.DIVISION_ORDER, as in clean_metadata)
+df_raw['division_level'] = parse_division_levels(df_raw['Division'])
 
 # --- Step 4.1: Check for Bad Divisions ---
 
@@ -64,7 +69,7 @@ else:
     print("✅ All divisions fit expected schema.")
 
 # --- Step 5: Validate Line Column ---
-df_raw['Line_validated'] = df_raw['Line'].apply(validate_line)
+df_raw['Line_validated'] = map_unique(df_raw['Line'], validate_line).astype('Int64')
 
 # --- Step 5.1: Check for Bad Line Values ---
 
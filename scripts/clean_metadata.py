@@ -1,19 +1,18 @@
-from metadata_utils import (
-    fix_match_date, 
-    parse_division_level, 
-    cast_division_level, 
-    validate_line,
+from scripts.metadata_utils import (
+    fix_match_dates, 
+    parse_division_levels,
+    validate_lines,
     create_team_match_id,
     create_match_id
     )
 
-from validation_utils import (
+from scripts.validation_utils import (
     validate_dates, validate_division_levels, validate_line_values,
     validate_team_match_lines, validate_unique_temp_match_ids
 )
 
 
-def clean_metadata_pipeline(df_raw):
+def clean_metadata_pipeline(df_raw, id_method='sequential'):
     """
     Clean and validate metadata (dates, divisions, lines, IDs) from a raw DataFrame.
     
@@ -21,6 +20,8 @@ def clean_metadata_pipeline(df_raw):
     -----------
     df_raw : pandas.DataFrame
         Raw match data with columns like 'Date', 'Division', 'Line', 'Home Team', 'Away Team'.
+    id_method : str
+        'sequential' or 'hash' (stable between runs), see metadata_utils.assign_group_ids.
     
     Returns:
     --------
@@ -28,24 +29,27 @@ def clean_metadata_pipeline(df_raw):
         Cleaned and validated DataFrame.
     """
     # --- Step 1: Dates ---
-    df_raw['Date_fixed'] = df_raw['Date'].apply(fix_match_date)
+    df_raw['Date_fixed'], used_fallback = fix_match_dates(df_raw['Date'])
+    if used_fallback.any():
+        print(f"⚠️  {used_fallback.sum()} dates needed the slow fallback parser:")
+        print(df_raw.loc[used_fallback, 'Date'].value_counts())
     validate_dates(df_raw)
 
     # --- Step 2: Divisions ---
-    df_raw['division_level'] = df_raw['Division'].apply(parse_division_level)
-    df_raw['division_level'] = cast_division_level(df_raw['division_level'])
+    df_raw['division_level'] = parse_division_levels(df_raw['Division'])
     validate_division_levels(df_raw)
 
     # --- Step 3: Lines ---
-    df_raw['Line_validated'] = df_raw['Line'].apply(validate_line)
+    df_raw['Line_validated'] = validate_lines(df_raw['Line'])
     validate_line_values(df_raw)
 
     # --- Step 4: Team Match IDs ---
-    df_raw = create_team_match_id(df_raw)
+    df_raw = create_team_match_id(df_raw, id_method=id_method)
     validate_team_match_lines(df_raw)
 
     # --- Step 5: Individual Match IDs ---
-    df_raw = create_match_id(df_raw)
+    # Per-match labels are unique per row, so render them on demand instead
+    df_raw = create_match_id(df_raw, id_method=id_method, labels=None)
     validate_unique_temp_match_ids(df_raw)
 
     return df_raw
@@ -1,8 +1,12 @@
+import numpy as np
 import pandas as pd
 import re
 import os
 import glob
 
+from scripts.metadata_utils import create_match_id as _create_match_id
+from scripts.metadata_utils import create_team_match_id
+
 # -- Fix date function --
 def fix_match_date(date_value):
     """
@@ -81,43 +85,9 @@ def validate_line(line_value):
         return None
 
 # --- ID and label functions ---
-def create_team_match_id(df, date_col='Date_fixed', division_col='Division', 
-                         home_col='Home Team', away_col='Away Team'):
-    """
-    Create temp_team_match_id (shared across all matches in a team match)
-    and a readable team_match_id_label.
-    
-    Returns:
-        DataFrame with new columns added.
-    """
-    df = df.copy()
-
-    # Step 1: Sort by match date to keep IDs sequential
-    df = df.sort_values(by=[date_col, division_col, home_col, away_col]).reset_index(drop=True)
-
-    # Step 2: Group rows by team match (Date + Division + Home + Away)
-    team_keys = df[[date_col, division_col, home_col, away_col]].astype(str)
-
-    # Step 3: Create group ID (simple increasing ID)
-    df['temp_team_match_id'] = (
-        team_keys
-        .drop_duplicates()
-        .reset_index(drop=True)
-        .reset_index()  # this gives a sequential ID
-        .merge(team_keys, on=[date_col, division_col, home_col, away_col], how='right')
-        .sort_index()['index'] + 1  # start IDs from 1
-    )
-
-    # Step 4: Create readable team_match_id_label
-    df['team_match_id_label'] = (
-        df[date_col].dt.strftime('%Y-%m-%d') + ' ' +
-        df[division_col].astype(str) + ' ' +
-        df[home_col].astype(str) + ' vs ' +
-        df[away_col].astype(str)
-    )
-
-    return df
 
+# IDs and labels are built by metadata_utils; this module's create_match_id
+# keeps its own label column name
 def create_match_id(df, 
                     date_col='Date_fixed', 
                     division_col='Division', 
@@ -127,68 +97,21 @@ def create_match_id(df,
                     home_p1_col='Home Player 1',
                     home_p2_col='Home Player 2',
                     away_p1_col='Away Player 1',
-                    away_p2_col='Away Player 2'):
+                    away_p2_col='Away Player 2',
+                    id_method='sequential',
+                    labels='categorical'):
     """
     Create temp_match_id for individual matches (including players and line),
-    and a readable temp_match_id_label.
+    and a readable temp_match_id_label (see metadata_utils.create_match_id).
     
     Returns:
         DataFrame with new columns added.
     """
-    
-    # Map line numbers to line names
-    line_mapping = {
-            1: "Ladies",
-            2: "Mixed 1",
-            3: "Mixed 2",
-            4: "Mens",
-            5: "Open 1",
-            6: "Open 2"
-        }
-
-    df['Line_label'] = df[line_col].map(line_mapping)
-
-    df = df.copy()
-
-    # Step 1: Sort by match key columns
-    df = df.sort_values(
-        by=[date_col, division_col, home_col, away_col, line_col, home_p1_col, home_p2_col, away_p1_col, away_p2_col]
-    ).reset_index(drop=True)
-
-    # Step 2: Build a unique grouping key
-    match_keys = df[[date_col, division_col, home_col, away_col, line_col, home_p1_col, home_p2_col, away_p1_col, away_p2_col]].astype(str)
-
-    # Step 3: Create group ID (simple increasing ID)
-    df['temp_match_id'] = (
-        match_keys
-        .drop_duplicates()
-        .reset_index(drop=True)
-        .reset_index()
-        .merge(match_keys, on=[date_col, division_col, home_col, away_col, line_col, home_p1_col, home_p2_col, away_p1_col, away_p2_col], how='right')
-        .sort_index()['index'] + 1
-    )
-
-    # Step 4: Create a readable label
-    df['temp_match_id_label'] = (
-        df[date_col].dt.strftime('%Y-%m-%d') + ' ' +
-        df[division_col].astype(str) + ' ' +
-        df[home_col].astype(str) + ' vs ' +
-        df[away_col].astype(str) + ' (' +
-        df[line_col].astype(str) + ' - ' +
-        df['Line_label'].astype(str) + ')' + ' - ' +
-        df[home_p1_col].astype(str) + ' & ' +
-        df[home_p2_col].astype(str) + ' vs ' +
-        df[away_p1_col].astype(str) + ' & ' +
-        df[away_p2_col].astype(str)
+    return _create_match_id(
+        df, date_col, division_col, home_col, away_col, line_col,
+        home_p1_col, home_p2_col, away_p1_col, away_p2_col,
+        id_method=id_method, labels=labels, label_col='temp_match_id_label'
     )
-    
-    return df
-
-
-
-
-
-
 
 
 def scan_weird_scores(score_str):
@@ -207,53 +130,48 @@ def scan_weird_scores(score_str):
 
 
 # --- Parsing functions ---
-def parse_score_string(score_str):
-    """
-    Parse a match score string into a list of dictionaries, each containing:
-    - home_games
-    - away_games
-    - home_tb_points
-    - away_tb_points
-    - tiebreak_type ('none', 'regular', 'super')
-    
-    Parameters:
-        score_str (str): The raw match score string (e.g., '6-4, 6-7 [4-7], 10-8')
 
-    Returns:
-        list of dicts: One dict per set
+# Compiled once and shared by the scalar and vectorized score parsers
+TIEBREAK_PATTERN = re.compile(r'\[(\d+)[^\d]+(\d+)\]')
+BRACKET_PATTERN = re.compile(r'\[.*?\]')
+SET_SCORE_PATTERN = re.compile(r'(\d+)[^\d]+(\d+)')
+
+TIEBREAK_TYPES = ['none', 'regular', 'super']
+
+
+def _parse_set_tuples(score_str):
+    """
+    Parse a match score string into a list of
+    (home_games, away_games, home_tb_points, away_tb_points, tiebreak_type) tuples.
+    Shared by parse_score_string and parse_scores_vectorized.
     """
-    if pd.isna(score_str) or not isinstance(score_str, str):
-        return []
-    
     parsed_sets = []
-    
+
     # Split score string by commas
-    set_strings = score_str.split(',')
-    
-    for set_str in set_strings:
+    for set_str in score_str.split(','):
         set_str = set_str.strip()
-        
+
         # Extract any tiebreak score inside brackets
-        tiebreak_match = re.search(r'\[(\d+)[^\d]+(\d+)\]', set_str)
+        tiebreak_match = TIEBREAK_PATTERN.search(set_str)
         if tiebreak_match:
             home_tb_points = int(tiebreak_match.group(1))
             away_tb_points = int(tiebreak_match.group(2))
         else:
             home_tb_points = None
             away_tb_points = None
-        
+
         # Remove brackets from the set score for main parsing
-        set_str_clean = re.sub(r'\[.*?\]', '', set_str).strip()
-        
+        set_str_clean = BRACKET_PATTERN.sub('', set_str).strip()
+
         # Extract home and away games
-        main_match = re.match(r'(\d+)[^\d]+(\d+)', set_str_clean)
+        main_match = SET_SCORE_PATTERN.match(set_str_clean)
         if not main_match:
             # Skip if can't parse properly
             continue
-        
+
         home_games = int(main_match.group(1))
         away_games = int(main_match.group(2))
-        
+
         # Determine tiebreak type based on games
         if (home_games == 7 and away_games == 6) or (home_games == 6 and away_games == 7):
             tiebreak_type = 'regular'
@@ -261,37 +179,258 @@ def parse_score_string(score_str):
             tiebreak_type = 'super'
         else:
             tiebreak_type = 'none'
-        
-        parsed_sets.append({
+
+        parsed_sets.append((home_games, away_games, home_tb_points, away_tb_points, tiebreak_type))
+
+    return parsed_sets
+
+
+def parse_score_string(score_str):
+    """
+    Parse a match score string into a list of dictionaries, each containing:
+    - home_games
+    - away_games
+    - home_tb_points
+    - away_tb_points
+    - tiebreak_type ('none', 'regular', 'super')
+    
+    Parameters:
+        score_str (str): The raw match score string (e.g., '6-4, 6-7 [4-7], 10-8')
+
+    Returns:
+        list of dicts: One dict per set
+    """
+    if pd.isna(score_str) or not isinstance(score_str, str):
+        return []
+
+    return [
+        {
             'home_games': home_games,
             'away_games': away_games,
             'home_tb_points': home_tb_points,
             'away_tb_points': away_tb_points,
             'tiebreak_type': tiebreak_type
-        })
-    
-    return parsed_sets
+        }
+        for home_games, away_games, home_tb_points, away_tb_points, tiebreak_type
+        in _parse_set_tuples(score_str)
+    ]
+
+
+def parse_scores_vectorized(scores, match_ids=None):
+    """
+    Parse a whole Series of score strings into one long-format sets table.
+
+    Each distinct score string is parsed once with the compiled patterns above,
+    and the parsed sets are broadcast back to every row with NumPy indexing.
+    Gives exactly the same sets as parse_score_string, row by row.
+
+    Parameters:
+        scores (pd.Series): Raw score strings (e.g., df['Score'])
+        match_ids (array-like, optional): One ID per row. Defaults to the Series index.
+
+    Returns:
+        pandas DataFrame with one row per set and columns:
+        match_id, set_no (1-based), home_games, away_games,
+        home_tb_points, away_tb_points (nullable Int32), tiebreak_type (categorical)
+    """
+    if match_ids is None:
+        match_ids = scores.index.to_numpy()
+    else:
+        match_ids = np.asarray(match_ids)
+        if len(match_ids) != len(scores):
+            raise ValueError("match_ids must have the same length as scores")
+
+    # Only real strings are parsed; everything else yields no sets
+    values = scores.to_numpy(dtype=object)
+    is_str = np.fromiter((isinstance(v, str) for v in values), dtype=bool, count=len(values))
+    codes = np.full(len(values), -1, dtype=np.int64)
+    uniques = []
+    if is_str.any():
+        str_codes, uniques = pd.factorize(values[is_str])
+        codes[is_str] = str_codes
+
+    # Parse each unique string once into flat per-set arrays
+    per_unique = [_parse_set_tuples(s) for s in uniques]
+    n_sets_unique = np.array([len(p) for p in per_unique], dtype=np.int64)
+    flat = [t for p in per_unique for t in p]
+    unique_offsets = np.cumsum(n_sets_unique) - n_sets_unique
+
+    if flat:
+        u_home, u_away, u_home_tb, u_away_tb, u_type = zip(*flat)
+    else:
+        u_home = u_away = u_home_tb = u_away_tb = u_type = ()
+    u_home = np.array(u_home, dtype=np.int32)
+    u_away = np.array(u_away, dtype=np.int32)
+    u_tb_mask = np.array([tb is None for tb in u_home_tb], dtype=bool)
+    u_home_tb = np.array([0 if tb is None else tb for tb in u_home_tb], dtype=np.int32)
+    u_away_tb = np.array([0 if tb is None else tb for tb in u_away_tb], dtype=np.int32)
+    u_type = np.array([TIEBREAK_TYPES.index(t) for t in u_type], dtype=np.int8)
+
+    # Broadcast: row i contributes n_sets_unique[codes[i]] sets
+    valid = codes >= 0
+    row_counts = np.zeros(len(values), dtype=np.int64)
+    row_counts[valid] = n_sets_unique[codes[valid]]
+    row_offsets = np.zeros(len(values), dtype=np.int64)
+    row_offsets[valid] = unique_offsets[codes[valid]]
+
+    row_index = np.repeat(np.arange(len(values)), row_counts)
+    row_starts = np.cumsum(row_counts) - row_counts
+    set_no = np.arange(int(row_counts.sum())) - np.repeat(row_starts, row_counts)
+    flat_index = np.repeat(row_offsets, row_counts) + set_no
+
+    return pd.DataFrame({
+        'match_id': match_ids[row_index],
+        'set_no': (set_no + 1).astype(np.int16),
+        'home_games': u_home[flat_index],
+        'away_games': u_away[flat_index],
+        'home_tb_points': pd.arrays.IntegerArray(u_home_tb[flat_index], u_tb_mask[flat_index]),
+        'away_tb_points': pd.arrays.IntegerArray(u_away_tb[flat_index], u_tb_mask[flat_index]),
+        'tiebreak_type': pd.Categorical.from_codes(u_type[flat_index], categories=TIEBREAK_TYPES),
+    })
 
 
 
 
 # --- Calculation functions ---
 
+WINNER_LABELS = ['Home', 'Away']
+
+
 def calculate_set_wins(score_list):
-    pass
+    """
+    Count sets won by each side from a parsed score list (see parse_score_string).
+    Sets with equal games (e.g., unfinished) count for nobody.
+
+    Returns:
+        tuple: (set_wins_home, set_wins_away)
+    """
+    set_wins_home = sum(1 for s in score_list if s['home_games'] > s['away_games'])
+    set_wins_away = sum(1 for s in score_list if s['away_games'] > s['home_games'])
+    return set_wins_home, set_wins_away
 
 def calculate_game_wins(score_list):
-    pass
+    """
+    Total games won by each side from a parsed score list.
+    A super tiebreak is parsed as 1-0 and so counts as a single game.
+
+    Returns:
+        tuple: (game_wins_home, game_wins_away)
+    """
+    game_wins_home = sum(s['home_games'] for s in score_list)
+    game_wins_away = sum(s['away_games'] for s in score_list)
+    return game_wins_home, game_wins_away
 
 def determine_winner(set_wins_home, set_wins_away):
-    pass
+    """
+    Return 'Home' or 'Away' for the side with more sets, or None if level.
+    """
+    if set_wins_home > set_wins_away:
+        return 'Home'
+    elif set_wins_away > set_wins_home:
+        return 'Away'
+    else:
+        return None
+
+def summarize_sets(sets):
+    """
+    Reduce a long-format sets table (see parse_scores_vectorized) to one row per match.
+
+    Parameters:
+        sets (pd.DataFrame): Output of parse_scores_vectorized
+
+    Returns:
+        pandas DataFrame indexed by match_id with columns:
+        set_wins_home, set_wins_away, game_wins_home, game_wins_away,
+        regular_tiebreaks, super_tiebreaks
+    """
+    codes, match_ids = pd.factorize(sets['match_id'])
+    n_matches = len(match_ids)
+
+    home_games = sets['home_games'].to_numpy()
+    away_games = sets['away_games'].to_numpy()
+    tiebreak_codes = sets['tiebreak_type'].cat.codes.to_numpy()
+
+    def count(mask):
+        return np.bincount(codes[mask], minlength=n_matches).astype(np.int16)
+
+    def total(values):
+        return np.bincount(codes, weights=values, minlength=n_matches).astype(np.int32)
+
+    return pd.DataFrame({
+        'set_wins_home': count(home_games > away_games),
+        'set_wins_away': count(away_games > home_games),
+        'game_wins_home': total(home_games),
+        'game_wins_away': total(away_games),
+        'regular_tiebreaks': count(tiebreak_codes == TIEBREAK_TYPES.index('regular')),
+        'super_tiebreaks': count(tiebreak_codes == TIEBREAK_TYPES.index('super')),
+    }, index=pd.Index(match_ids, name='match_id'))
+
+def _winner_from_counts(home, away):
+    """
+    Vectorized determine_winner: Categorical of 'Home'/'Away', NaN when level.
+    """
+    codes = np.select([home > away, away > home], [0, 1], default=-1)
+    return pd.Categorical.from_codes(codes, categories=WINNER_LABELS)
 
 # --- Row cleaning ---
 
-def clean_match_row(row):
-    pass
+def clean_match_row(row, score_col='Score'):
+    """
+    Compute set wins, game wins, tiebreak counts and winner for a single match row.
+    Use clean_full_dataframe for whole DataFrames.
+
+    Returns:
+        pandas Series with the same columns clean_full_dataframe adds (except flag checks).
+    """
+    score_list = parse_score_string(row[score_col])
+    set_wins_home, set_wins_away = calculate_set_wins(score_list)
+    game_wins_home, game_wins_away = calculate_game_wins(score_list)
+
+    return pd.Series({
+        'set_wins_home': set_wins_home,
+        'set_wins_away': set_wins_away,
+        'game_wins_home': game_wins_home,
+        'game_wins_away': game_wins_away,
+        'regular_tiebreaks': sum(1 for s in score_list if s['tiebreak_type'] == 'regular'),
+        'super_tiebreaks': sum(1 for s in score_list if s['tiebreak_type'] == 'super'),
+        'winner': determine_winner(set_wins_home, set_wins_away),
+    })
 
 # --- Full DataFrame cleaning ---
 
-def clean_full_dataframe(df):
-    pass
+def clean_full_dataframe(df, score_col='Score', home_won_col='Home Won', away_won_col='Away Won'):
+    """
+    Add set wins, game wins, tiebreak counts and winner for every match in one pass.
+
+    Scores are parsed with parse_scores_vectorized and reduced with summarize_sets,
+    so no Python code runs per row. If the scraped win flags are present, the
+    computed winner is cross-checked against them:
+    - winner_scraped: 'Home'/'Away' from the flags (NaN if neither or both are set)
+    - winner_mismatch: True where both winners are known and disagree
+
+    Returns:
+        DataFrame with new columns added.
+    """
+    df = df.copy()
+    n_rows = len(df)
+
+    sets = parse_scores_vectorized(df[score_col], match_ids=np.arange(n_rows))
+    summary = summarize_sets(sets).reindex(np.arange(n_rows), fill_value=0)
+
+    for col in summary.columns:
+        df[col] = summary[col].to_numpy()
+
+    df['winner'] = _winner_from_counts(
+        summary['set_wins_home'].to_numpy(), summary['set_wins_away'].to_numpy()
+    )
+
+    if home_won_col in df.columns and away_won_col in df.columns:
+        home_won = df[home_won_col].fillna(False).astype(bool).to_numpy()
+        away_won = df[away_won_col].fillna(False).astype(bool).to_numpy()
+        df['winner_scraped'] = _winner_from_counts(home_won.astype(np.int8), away_won.astype(np.int8))
+        df['winner_mismatch'] = (
+            df['winner'].notna() & df['winner_scraped'].notna() &
+            (df['winner'].astype(object) != df['winner_scraped'].astype(object))
+        ).to_numpy()
+
+    return df
@@ -0,0 +1,372 @@
+# scripts/dimensions.py
+"""
+Split cleaned match rows into integer-keyed dimension tables and a compact fact table.
+
+    players    player_key (int32), player_id, name, first_season, last_season, seasons
+    teams      team_key (int32), team, first_season, last_season, seasons
+    divisions  division_key (int16), Division, division_level
+    matches    one row per match line, with only integer keys, numbers and flags
+
+Key 0 means "no player / unknown" (e.g. a missing partner), so the fact table
+needs no nulls in its key columns and rating loops can index NumPy arrays
+with it directly. Likewise a missing season or unknown line is stored as 0
+(seasons that are present but not years are an error).
+
+A player is identified by their decoded ID, or by name when the page gave no
+ID. Passing the previous run's dimension tables as `existing` keeps every
+known player and team on the same key.
+
+Usage (from the project root), after incremental_clean has run:
+    python -m scripts.dimensions
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_DIMENSIONS_PATH = "data/cleaned"
+
+TABLE_NAMES = ["players", "teams", "divisions", "matches"]
+
+# Fact column -> (name column, ID column) in the scraped rows
+PLAYER_SLOTS = {
+    "home1_key": ("Home Player 1", "Home ID 1"),
+    "home2_key": ("Home Player 2", "Home ID 2"),
+    "away1_key": ("Away Player 1", "Away ID 1"),
+    "away2_key": ("Away Player 2", "Away ID 2"),
+}
+TEAM_SLOTS = {"home_team_key": "Home Team", "away_team_key": "Away Team"}
+
+MISSING_IDS = {"", "N/A"}
+
+# Result columns copied to the fact table when present (see cleaning.clean_full_dataframe)
+FLAG_COLUMNS = {"Home Won": "home_won", "Away Won": "away_won", "Defaulted": "defaulted", "Retired": "retired"}
+COUNT_COLUMNS = [
+    "set_wins_home", "set_wins_away", "game_wins_home", "game_wins_away",
+    "regular_tiebreaks", "super_tiebreaks",
+]
+
+
+# -- Helpers --
+def _clean_strings(series):
+    """
+    Stripped strings with '', 'N/A' and missing values as NaN.
+    """
+    values = series.astype("object").where(series.notna())
+    values = values.map(lambda v: v.strip() if isinstance(v, str) else v)
+    return values.where(~values.isin(MISSING_IDS) & values.notna())
+
+def player_identity(names, ids):
+    """
+    The key a player is tracked under: their decoded ID, or 'name:<name>' if
+    the row had no ID. NaN where both are missing.
+    """
+    ids = _clean_strings(ids.astype("object").map(lambda v: v if pd.isna(v) else str(v)))
+    names = _clean_strings(names)
+    return ids.where(ids.notna(), "name:" + names)
+
+def _seasons(df):
+    """
+    Seasons as Int16 years; missing ('', 'N/A') seasons are NA. Raises ValueError
+    for seasons that aren't years (e.g. '2024 Winter') rather than losing them.
+    """
+    raw = _clean_strings(df["Season"].astype("object").map(lambda v: v if pd.isna(v) else str(v)))
+    seasons = pd.to_numeric(raw, errors="coerce")
+    bad = raw[seasons.isna() & raw.notna()]
+    if len(bad):
+        raise ValueError(f"Seasons that aren't years: {sorted(bad.unique())}")
+    return seasons.astype("Int16")
+
+def _assign_keys(identities, existing=None):
+    """
+    int32 keys for sorted unique identities, continuing after (and keeping)
+    the keys in `existing` ({identity: key}).
+    """
+    existing = existing or {}
+    new = sorted(set(identities) - set(existing))
+    start = max(existing.values(), default=0) + 1
+    keys = dict(existing)
+    keys.update(zip(new, range(start, start + len(new))))
+    return keys
+
+def _lookup_keys(values, identities, keys):
+    """
+    Vectorized identity -> key lookup; 0 for missing / unknown identities.
+    """
+    index = pd.Index(identities)
+    if len(index) == 0:
+        return np.zeros(len(values), dtype=np.int32)
+    positions = index.get_indexer(values)
+    key_array = np.asarray(keys, dtype=np.int32)
+    return np.where(positions >= 0, key_array[positions], 0).astype(np.int32)
+
+def _season_summary(long):
+    """
+    Per-identity first_season, last_season and sorted list of seasons.
+    """
+    grouped = long.dropna(subset=["season"]).groupby("identity")["season"]
+    return pd.DataFrame({
+        "first_season": grouped.min(),
+        "last_season": grouped.max(),
+        "seasons": grouped.agg(lambda s: sorted(int(v) for v in s.unique())),
+    })
+
+def _previous_keys(existing, table, identity_col, key_col):
+    if not existing or table not in existing:
+        return {}
+    previous = existing[table]
+    return dict(zip(previous[identity_col], previous[key_col].astype(int)))
+
+def _season_list(value):
+    return [] if value is None or np.ndim(value) == 0 else [int(v) for v in value]
+
+def _merge_seasons(dim, previous, identity_col):
+    """
+    Add the seasons recorded for each entity in the previous run to this run's summary.
+    """
+    old = previous.drop_duplicates(identity_col).set_index(identity_col)["seasons"]
+    old = old.reindex(dim[identity_col]).to_numpy()
+    seasons = [
+        sorted(set(_season_list(new)) | set(_season_list(before)))
+        for new, before in zip(dim["seasons"], old)
+    ]
+    return dim.assign(
+        first_season=pd.array([s[0] if s else pd.NA for s in seasons], dtype="Int16"),
+        last_season=pd.array([s[-1] if s else pd.NA for s in seasons], dtype="Int16"),
+        seasons=seasons,
+    )
+
+def _merge_previous(dim, existing, table, identity_col):
+    """
+    Keep entities from the previous run that don't appear in this data, and
+    merge the season summaries of those that do.
+    """
+    if not existing or table not in existing:
+        return dim
+    previous = existing[table]
+    if "seasons" in dim.columns and "seasons" in previous.columns:
+        dim = _merge_seasons(dim, previous, identity_col)
+    missing = previous[~previous[identity_col].isin(dim[identity_col])]
+    return pd.concat([dim, missing[dim.columns]], ignore_index=True)
+
+
+# -- Dimension tables --
+def build_player_dimension(df, existing=None):
+    """
+    One row per player seen in any of the four player slots.
+
+    The canonical name is the name used most often with that ID (ties go to
+    the name used most recently).
+
+    Parameters:
+        df (DataFrame): match rows with the Home/Away Player/ID columns and Season
+        existing (dict, optional): previous run's tables, to keep player keys stable
+
+    Returns:
+        pandas DataFrame sorted by player_key
+    """
+    seasons = _seasons(df)
+    long = pd.concat([
+        pd.DataFrame({
+            "identity": player_identity(df[name_col], df[id_col]) if id_col in df.columns
+            else player_identity(df[name_col], pd.Series(np.nan, index=df.index)),
+            "name": _clean_strings(df[name_col]),
+            "season": seasons,
+        })
+        for name_col, id_col in PLAYER_SLOTS.values()
+        if name_col in df.columns
+    ], ignore_index=True).dropna(subset=["identity"])
+
+    names = (
+        long.dropna(subset=["name"])
+        .groupby(["identity", "name"])
+        .agg(uses=("season", "size"), last_used=("season", "max"))
+        .reset_index()
+        .sort_values(["uses", "last_used", "name"], ascending=[False, False, True], na_position="last")
+        .drop_duplicates("identity")
+        .set_index("identity")["name"]
+    )
+
+    keys = _assign_keys(long["identity"].unique(), _previous_keys(existing, "players", "identity", "player_key"))
+    identities = sorted(long["identity"].unique())
+    summary = _season_summary(long).reindex(identities)
+
+    dim = pd.DataFrame({
+        "player_key": np.array([keys[i] for i in identities], dtype=np.int32),
+        "identity": identities,
+        "player_id": [None if i.startswith("name:") else i for i in identities],
+        "name": names.reindex(identities).to_numpy(),
+        "first_season": summary["first_season"].astype("Int16").array,
+        "last_season": summary["last_season"].astype("Int16").array,
+        "seasons": summary["seasons"].to_numpy(),
+    })
+    dim = _merge_previous(dim, existing, "players", "identity")
+    return dim.sort_values("player_key").reset_index(drop=True)
+
+def build_team_dimension(df, existing=None):
+    """
+    One row per team name seen as home or away team.
+
+    Returns:
+        pandas DataFrame with team_key, team, first_season, last_season, seasons
+    """
+    seasons = _seasons(df)
+    long = pd.concat([
+        pd.DataFrame({"identity": _clean_strings(df[col]), "season": seasons})
+        for col in TEAM_SLOTS.values()
+    ], ignore_index=True).dropna(subset=["identity"])
+
+    keys = _assign_keys(long["identity"].unique(), _previous_keys(existing, "teams", "team", "team_key"))
+    identities = sorted(long["identity"].unique())
+    summary = _season_summary(long).reindex(identities)
+
+    dim = pd.DataFrame({
+        "team_key": np.array([keys[i] for i in identities], dtype=np.int32),
+        "team": identities,
+        "first_season": summary["first_season"].astype("Int16").array,
+        "last_season": summary["last_season"].astype("Int16").array,
+        "seasons": summary["seasons"].to_numpy(),
+    })
+    dim = _merge_previous(dim, existing, "teams", "team")
+    return dim.sort_values("team_key").reset_index(drop=True)
+
+def build_division_dimension(df, existing=None):
+    """
+    One row per division name, with its level (Major / A / B / C) if known.
+    """
+    divisions = _clean_strings(df["Division"])
+    levels = df["division_level"] if "division_level" in df.columns else pd.Series(np.nan, index=df.index)
+    pairs = (
+        pd.DataFrame({"Division": divisions, "division_level": levels.astype("object")})
+        .dropna(subset=["Division"])
+        .drop_duplicates("Division")
+        .sort_values("Division")
+    )
+
+    keys = _assign_keys(pairs["Division"], _previous_keys(existing, "divisions", "Division", "division_key"))
+    dim = pd.DataFrame({
+        "division_key": np.array([keys[d] for d in pairs["Division"]], dtype=np.int16),
+        "Division": pairs["Division"].to_numpy(),
+        "division_level": pairs["division_level"].to_numpy(),
+    })
+    dim = _merge_previous(dim, existing, "divisions", "Division")
+    return dim.sort_values("division_key").reset_index(drop=True)
+
+
+# -- Fact table --
+def build_match_facts(df, players, teams, divisions):
+    """
+    The compact matches fact table: one row per match line, no string columns.
+
+    Parameters:
+        df (DataFrame): cleaned match rows (clean_metadata_pipeline, optionally
+                        with cleaning.clean_full_dataframe result columns)
+        players, teams, divisions (DataFrame): dimension tables for df
+
+    Returns:
+        pandas DataFrame
+    """
+    facts = pd.DataFrame(index=df.index)
+
+    if "temp_match_id" in df.columns:
+        facts["match_id"] = df["temp_match_id"].to_numpy()
+    if "temp_team_match_id" in df.columns:
+        facts["team_match_id"] = df["temp_team_match_id"].to_numpy()
+
+    facts["season"] = _seasons(df).fillna(0).to_numpy(dtype=np.int16)
+    if "Date_fixed" in df.columns:
+        facts["date"] = df["Date_fixed"].to_numpy()
+
+    facts["division_key"] = _lookup_keys(
+        _clean_strings(df["Division"]), divisions["Division"], divisions["division_key"]
+    ).astype(np.int16)
+
+    line = df["Line_validated"] if "Line_validated" in df.columns else df["Line"]
+    facts["line"] = pd.to_numeric(line, errors="coerce").fillna(0).to_numpy(dtype=np.int8)
+
+    for key_col, team_col in TEAM_SLOTS.items():
+        facts[key_col] = _lookup_keys(_clean_strings(df[team_col]), teams["team"], teams["team_key"])
+
+    for key_col, (name_col, id_col) in PLAYER_SLOTS.items():
+        ids = df[id_col] if id_col in df.columns else pd.Series(np.nan, index=df.index)
+        identities = player_identity(df[name_col], ids)
+        facts[key_col] = _lookup_keys(identities, players["identity"], players["player_key"])
+
+    for source, target in FLAG_COLUMNS.items():
+        if source in df.columns:
+            facts[target] = df[source].fillna(False).astype(bool).to_numpy()
+
+    for col in COUNT_COLUMNS:
+        if col in df.columns:
+            facts[col] = df[col].astype(np.int8).to_numpy()
+
+    return facts.reset_index(drop=True)
+
+def split_dimensions(df, existing=None):
+    """
+    Build all dimension tables and the fact table from cleaned match rows.
+
+    Returns:
+        dict: {'players', 'teams', 'divisions', 'matches'} DataFrames
+    """
+    players = build_player_dimension(df, existing)
+    teams = build_team_dimension(df, existing)
+    divisions = build_division_dimension(df, existing)
+    matches = build_match_facts(df, players, teams, divisions)
+    return {"players": players, "teams": teams, "divisions": divisions, "matches": matches}
+
+def memory_usage(tables):
+    """
+    Deep memory use in bytes of each table (a DataFrame or dict of DataFrames).
+    """
+    if isinstance(tables, pd.DataFrame):
+        return int(tables.memory_usage(deep=True).sum())
+    return {name: int(table.memory_usage(deep=True).sum()) for name, table in tables.items()}
+
+
+# -- Storage --
+def write_dimensions(tables, output_dir=DEFAULT_DIMENSIONS_PATH):
+    """
+    Write each table to <output_dir>/<name>.parquet (temp file + rename).
+
+    Returns:
+        dict: {name: path}
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {}
+    for name, table in tables.items():
+        path = os.path.join(output_dir, f"{name}.parquet")
+        tmp_path = f"{path}.tmp"
+        table.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+        paths[name] = path
+    return paths
+
+def read_dimensions(output_dir=DEFAULT_DIMENSIONS_PATH, names=TABLE_NAMES):
+    """
+    Load the tables written by write_dimensions ({} if none exist yet).
+    """
+    tables = {}
+    for name in names:
+        path = os.path.join(output_dir, f"{name}.parquet")
+        if os.path.exists(path):
+            tables[name] = pd.read_parquet(path)
+    return tables
+
+
+if __name__ == "__main__":
+    from scripts.incremental_clean import DEFAULT_CLEANED_PATH
+    from scripts.metadata_utils import apply_player_aliases, update_player_aliases
+
+    cleaned = pd.read_parquet(DEFAULT_CLEANED_PATH)
+    # Merge name variants (and fill missing IDs) before players get keys
+    cleaned = apply_player_aliases(cleaned, update_player_aliases(cleaned))
+    tables = split_dimensions(cleaned, existing=read_dimensions())
+    paths = write_dimensions(tables)
+
+    before = memory_usage(cleaned)
+    after = sum(memory_usage(tables).values())
+    for name, table in tables.items():
+        print(f"✅ {name}: {len(table)} rows → {paths[name]}")
+    print(f"📦 {before / 1e6:.1f} MB of cleaned rows → {after / 1e6:.1f} MB of keyed tables")
@@ -0,0 +1,528 @@
+# scripts/elo.py
+"""
+Streaming ELO ratings for players, backed by NumPy arrays indexed by player key.
+
+Input is the integer-keyed matches fact table from dimensions.split_dimensions.
+Matches are processed in date order. Each one is an O(1) update:
+
+    team rating   mean of the two partners' ratings (one player if no partner)
+    expected      1 / (1 + 10 ** ((away - home) / scale))
+    update        every home player += K * (result - expected), every away player -= the same
+
+A player's first rating is initial_rating plus the offset for the division
+level they first appear in (e.g. start Major players higher than C players).
+
+EloEngine keeps its state between calls, so new matches can be fed in as they
+are scraped without replaying history. Match IDs already rated are skipped, and
+save() / load() carry the state between runs.
+
+sweep_elo replays the same matches under a whole grid of K-factors, initial
+ratings and division offsets at once and scores each configuration.
+
+Usage (from the project root), after dimensions has run:
+    python -m scripts.elo
+"""
+
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+from scripts.metadata_utils import DIVISION_ORDER
+
+DEFAULT_K_FACTOR = 32.0
+DEFAULT_INITIAL_RATING = 1500.0
+DEFAULT_SCALE = 400.0
+
+DEFAULT_STATE_PATH = "data/ratings/elo_state.npz"
+
+# Level code for matches whose division level is unknown (gets no offset)
+UNKNOWN_LEVEL = len(DIVISION_ORDER)
+
+
+# -- Match arrays --
+def division_level_codes(division_keys, divisions):
+    """
+    Division level code (index into DIVISION_ORDER, UNKNOWN_LEVEL if unknown)
+    for every division_key.
+
+    Parameters:
+        division_keys (array): division_key per match
+        divisions (DataFrame): the divisions dimension table
+    """
+    keys = np.asarray(division_keys)
+    size = max(int(divisions["division_key"].max()) if len(divisions) else 0, int(keys.max(initial=0))) + 1
+    lookup = np.full(size, UNKNOWN_LEVEL, dtype=np.int8)
+    levels = divisions["division_level"].astype("object")
+    lookup[divisions["division_key"].to_numpy()] = [
+        DIVISION_ORDER.index(level) if level in DIVISION_ORDER else UNKNOWN_LEVEL for level in levels
+    ]
+    return lookup[keys]
+
+def match_outcomes(facts):
+    """
+    1.0 where the home pair won, 0.0 where the away pair won, NaN if unknown.
+
+    Uses the scraped home_won / away_won flags, falling back to set wins.
+    """
+    outcome = np.full(len(facts), np.nan)
+    if "set_wins_home" in facts.columns:
+        home_sets = facts["set_wins_home"].to_numpy()
+        away_sets = facts["set_wins_away"].to_numpy()
+        outcome[home_sets > away_sets] = 1.0
+        outcome[away_sets > home_sets] = 0.0
+    if "home_won" in facts.columns:
+        home_won = facts["home_won"].to_numpy(dtype=bool)
+        away_won = facts["away_won"].to_numpy(dtype=bool)
+        outcome[home_won & ~away_won] = 1.0
+        outcome[away_won & ~home_won] = 0.0
+    return outcome
+
+def match_arrays(facts, divisions=None):
+    """
+    Rateable matches from the fact table, in date order, as NumPy arrays.
+
+    Matches with no result or without a player on each side are dropped.
+
+    Returns:
+        dict: home1, home2, away1, away2 (int32 keys), outcome (float64),
+              level (int8), date (datetime64), match_id, line (int8)
+    """
+    order = [c for c in ["date", "team_match_id", "line"] if c in facts.columns]
+    facts = facts.sort_values(order, kind="stable") if order else facts
+
+    outcome = match_outcomes(facts)
+    keep = ~np.isnan(outcome) & (facts["home1_key"].to_numpy() > 0) & (facts["away1_key"].to_numpy() > 0)
+    facts = facts[keep]
+
+    if divisions is not None and "division_key" in facts.columns:
+        level = division_level_codes(facts["division_key"].to_numpy(), divisions)
+    else:
+        level = np.full(len(facts), UNKNOWN_LEVEL, dtype=np.int8)
+
+    arrays = {
+        "home1": facts["home1_key"].to_numpy(dtype=np.int32),
+        "home2": facts["home2_key"].to_numpy(dtype=np.int32),
+        "away1": facts["away1_key"].to_numpy(dtype=np.int32),
+        "away2": facts["away2_key"].to_numpy(dtype=np.int32),
+        "outcome": outcome[keep],
+        "level": level,
+        "line": pd.to_numeric(facts["line"], errors="coerce").fillna(0).to_numpy(dtype=np.int8)
+        if "line" in facts.columns else np.zeros(len(facts), dtype=np.int8),
+    }
+    if "date" in facts.columns:
+        arrays["date"] = facts["date"].to_numpy()
+    if "match_id" in facts.columns:
+        arrays["match_id"] = facts["match_id"].to_numpy()
+    return arrays
+
+def offsets_array(division_offsets=None):
+    """
+    Starting-rating offset per level code, from a {level: offset} dict.
+    """
+    offsets = np.zeros(UNKNOWN_LEVEL + 1)
+    for level, offset in (division_offsets or {}).items():
+        offsets[DIVISION_ORDER.index(level)] = offset
+    return offsets
+
+
+# -- Core update loop --
+def start_ratings(home1, home2, away1, away2, level, ratings, rated, start_by_level):
+    """
+    Give every unrated player in these matches the starting rating for the
+    level of the first match they play in. Updates ratings and rated in place.
+
+    ratings may also be a (players x configurations) matrix, with start_by_level
+    a (levels x configurations) matrix (see sweep_elo).
+    """
+    keys = np.concatenate([home1, home2, away1, away2])
+    levels = np.tile(level, 4)
+    order = np.tile(np.arange(len(level)), 4)
+
+    new = (keys > 0) & ~rated[keys]
+    keys, levels, order = keys[new], levels[new], order[new]
+
+    first = np.lexsort((order, keys))
+    keys, levels = keys[first], levels[first]
+    is_first = np.r_[True, keys[1:] != keys[:-1]] if len(keys) else np.array([], dtype=bool)
+
+    ratings[keys[is_first]] = np.asarray(start_by_level)[levels[is_first]]
+    rated[keys[is_first]] = True
+
+def elo_replay(home1, home2, away1, away2, outcome, level, ratings, rated,
+               k_factor=DEFAULT_K_FACTOR, initial_rating=DEFAULT_INITIAL_RATING,
+               offsets=None, scale=DEFAULT_SCALE):
+    """
+    Rate a sequence of matches in order, updating ratings and rated in place.
+
+    New players get their starting ratings up front (start_ratings), so the
+    loop only does the rating update. It runs over a Python list of just the
+    players in these matches (indexing NumPy arrays one element at a time is
+    several times slower), and those ratings are written back at the end, so
+    the cost grows with the batch, not with the number of players.
+
+    Parameters:
+        home1, home2, away1, away2 (array): player keys per match (0 = no player)
+        outcome (array): 1.0 home win, 0.0 away win
+        level (array): division level codes (for offsets)
+        ratings (float array), rated (bool array): indexed by player key
+
+    Returns:
+        numpy array: pre-match home win probability for each match
+    """
+    offsets = offsets_array() if offsets is None else offsets
+    start_ratings(home1, home2, away1, away2, level, ratings, rated, initial_rating + offsets)
+
+    # Local indices into the players in this batch; key 0 (no player) stays at 0
+    touched = np.unique(np.concatenate([[0], home1, home2, away1, away2]))
+    home1, home2, away1, away2 = (np.searchsorted(touched, a) for a in (home1, home2, away1, away2))
+    r = ratings[touched].tolist()
+    expected = []
+    append = expected.append
+    exp = math.exp
+    c = math.log(10.0) / scale  # 10 ** (x / scale) == exp(x * c)
+
+    for h1, h2, a1, a2, result in zip(
+        home1.tolist(), home2.tolist(), away1.tolist(), away2.tolist(), outcome.tolist()
+    ):
+        home = (r[h1] + r[h2]) * 0.5 if h2 else r[h1]
+        away = (r[a1] + r[a2]) * 0.5 if a2 else r[a1]
+        e = 1.0 / (1.0 + exp((away - home) * c))
+        append(e)
+
+        delta = k_factor * (result - e)
+        r[h1] += delta
+        if h2:
+            r[h2] += delta
+        r[a1] -= delta
+        if a2:
+            r[a2] -= delta
+
+    ratings[touched[1:]] = r[1:]
+    return np.array(expected, dtype=np.float64)
+
+
+# -- Engine --
+class EloEngine:
+    """
+    Player ratings that can be updated one match, one batch or one scrape at a time.
+    """
+
+    def __init__(self, k_factor=DEFAULT_K_FACTOR, initial_rating=DEFAULT_INITIAL_RATING,
+                 division_offsets=None, scale=DEFAULT_SCALE, n_players=0):
+        self.k_factor = float(k_factor)
+        self.initial_rating = float(initial_rating)
+        self.division_offsets = dict(division_offsets or {})
+        self.scale = float(scale)
+        self.offsets = offsets_array(self.division_offsets)
+
+        self.ratings = np.full(n_players + 1, np.nan)
+        self.rated = np.zeros(n_players + 1, dtype=bool)
+        self.n_matches = 0
+        self.version = 0  # bumped on every update, so caches of ratings know to refresh
+        self.last_date = None
+        self.seen_match_ids = set()
+
+    def _ensure_capacity(self, max_key):
+        if max_key < len(self.ratings):
+            return
+        size = max(max_key + 1, 2 * len(self.ratings))
+        self.ratings = np.concatenate([self.ratings, np.full(size - len(self.ratings), np.nan)])
+        self.rated = np.concatenate([self.rated, np.zeros(size - len(self.rated), dtype=bool)])
+
+    def update_arrays(self, home1, home2, away1, away2, outcome, level=None):
+        """
+        Rate matches given as key / outcome arrays, in order.
+
+        Returns:
+            numpy array: pre-match home win probabilities
+        """
+        arrays = [np.asarray(a, dtype=np.int32) for a in (home1, home2, away1, away2)]
+        outcome = np.asarray(outcome, dtype=np.float64)
+        level = np.full(len(outcome), UNKNOWN_LEVEL, dtype=np.int8) if level is None else np.asarray(level)
+
+        if len(outcome):
+            self._ensure_capacity(int(max(a.max() for a in arrays)))
+
+        expected = elo_replay(
+            *arrays, outcome, level, self.ratings, self.rated,
+            k_factor=self.k_factor, initial_rating=self.initial_rating,
+            offsets=self.offsets, scale=self.scale,
+        )
+        self.n_matches += len(outcome)
+        if len(outcome):
+            self.version += 1
+        return expected
+
+    def update_match(self, home1, home2, away1, away2, home_won, level=UNKNOWN_LEVEL):
+        """
+        Rate a single match in place (O(1)). Returns the pre-match home win probability.
+        """
+        self._ensure_capacity(max(home1, home2, away1, away2))
+        ratings, rated = self.ratings, self.rated
+        start = self.initial_rating + self.offsets[level]
+        for key in (home1, home2, away1, away2):
+            if key and not rated[key]:
+                ratings[key] = start
+                rated[key] = True
+
+        home = (ratings[home1] + ratings[home2]) * 0.5 if home2 else ratings[home1]
+        away = (ratings[away1] + ratings[away2]) * 0.5 if away2 else ratings[away1]
+        expected = 1.0 / (1.0 + math.exp((away - home) * math.log(10.0) / self.scale))
+
+        delta = self.k_factor * (float(home_won) - expected)
+        ratings[home1] += delta
+        if home2:
+            ratings[home2] += delta
+        ratings[away1] -= delta
+        if away2:
+            ratings[away2] -= delta
+
+        self.n_matches += 1
+        self.version += 1
+        return float(expected)
+
+    def update_matches(self, facts, divisions=None):
+        """
+        Rate new matches from the fact table (any chunk of it, e.g. the rows
+        added by the latest scrape). Match IDs already rated are skipped.
+
+        Returns:
+            pandas DataFrame: match_id (if present), pre-match home win probability,
+                              line and outcome (1.0 home win, 0.0 away win)
+        """
+        arrays = match_arrays(facts, divisions)
+
+        if "match_id" in arrays:
+            # Hash IDs are uint64; keep them as int64 bit patterns
+            seen = self.seen_match_ids
+            ids = arrays["match_id"].astype(np.int64).tolist()
+            new = np.fromiter((i not in seen for i in ids), dtype=bool, count=len(ids))
+            arrays = {name: values[new] for name, values in arrays.items()}
+
+        if "date" in arrays and len(arrays["date"]):
+            first_date = arrays["date"].min()
+            if self.last_date is not None and first_date < self.last_date:
+                print(f"⚠️  Rating matches from {first_date} after matches up to {self.last_date}; "
+                      "ratings will differ from a full replay.")
+
+        expected = self.update_arrays(
+            arrays["home1"], arrays["home2"], arrays["away1"], arrays["away2"],
+            arrays["outcome"], arrays["level"],
+        )
+
+        if "date" in arrays and len(arrays["date"]):
+            last = arrays["date"].max()
+            self.last_date = last if self.last_date is None else max(self.last_date, last)
+
+        result = pd.DataFrame({"home_win_prob": expected, "line": arrays["line"], "outcome": arrays["outcome"]})
+        if "match_id" in arrays:
+            self.seen_match_ids.update(arrays["match_id"].astype(np.int64).tolist())
+            result.insert(0, "match_id", arrays["match_id"])
+        return result
+
+    def rating(self, player_key):
+        """
+        Current rating of one player (NaN if they have no matches yet).
+        """
+        return float(self.ratings[player_key]) if player_key < len(self.ratings) else np.nan
+
+    def ratings_table(self, players=None):
+        """
+        Current ratings as a DataFrame, joined to the players dimension if given.
+        """
+        keys = np.flatnonzero(self.rated)
+        table = pd.DataFrame({"player_key": keys.astype(np.int32), "rating": self.ratings[keys]})
+        if players is not None:
+            table = table.merge(players[["player_key", "name", "player_id"]], on="player_key", how="left")
+        return table.sort_values("rating", ascending=False).reset_index(drop=True)
+
+    # -- Saving state between runs --
+    def save(self, path=DEFAULT_STATE_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(
+            tmp_path,
+            ratings=self.ratings,
+            rated=self.rated,
+            seen_match_ids=np.array(sorted(self.seen_match_ids), dtype=np.int64),
+            params=np.array([self.k_factor, self.initial_rating, self.scale, self.n_matches]),
+            offsets=self.offsets,
+            last_date=np.array([] if self.last_date is None else [self.last_date], dtype="datetime64[us]"),
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=DEFAULT_STATE_PATH):
+        with np.load(path) as state:
+            k_factor, initial_rating, scale, n_matches = state["params"]
+            engine = cls(k_factor=k_factor, initial_rating=initial_rating, scale=scale)
+            engine.offsets = state["offsets"]
+            engine.division_offsets = {
+                level: float(offset) for level, offset in zip(DIVISION_ORDER, engine.offsets) if offset
+            }
+            engine.ratings = state["ratings"]
+            engine.rated = state["rated"]
+            engine.seen_match_ids = set(state["seen_match_ids"].tolist())
+            engine.n_matches = int(n_matches)
+            engine.last_date = state["last_date"][0] if len(state["last_date"]) else None
+        return engine
+
+
+# -- Parameter sweeps --
+def score_predictions(expected, outcome, eps=1e-12):
+    """
+    Log-loss and Brier score of home win probabilities against results.
+    """
+    expected = np.clip(np.asarray(expected, dtype=np.float64), eps, 1 - eps)
+    outcome = np.asarray(outcome, dtype=np.float64)
+    log_loss = -np.mean(outcome * np.log(expected) + (1 - outcome) * np.log1p(-expected))
+    brier = np.mean((expected - outcome) ** 2)
+    return {"log_loss": float(log_loss), "brier": float(brier), "n_scored": len(outcome)}
+
+def param_grid(k_factors=(DEFAULT_K_FACTOR,), initial_ratings=(DEFAULT_INITIAL_RATING,), division_offsets=(None,)):
+    """
+    Every combination of the given parameter values, one configuration per row.
+
+    Parameters:
+        k_factors, initial_ratings (iterable): values to try
+        division_offsets (iterable): {level: offset} dicts (or None) to try
+
+    Returns:
+        pandas DataFrame with k_factor, initial_rating and one offset_<level>
+        column per level in DIVISION_ORDER
+    """
+    rows = []
+    for offsets in division_offsets:
+        offset_values = offsets_array(offsets)[:UNKNOWN_LEVEL]
+        for initial_rating in initial_ratings:
+            for k_factor in k_factors:
+                row = {"k_factor": float(k_factor), "initial_rating": float(initial_rating)}
+                row.update({f"offset_{level}": o for level, o in zip(DIVISION_ORDER, offset_values)})
+                rows.append(row)
+    return pd.DataFrame(rows)
+
+def _config_arrays(configs):
+    k_factor = configs["k_factor"].to_numpy(dtype=np.float64)
+    initial = configs["initial_rating"].to_numpy(dtype=np.float64)
+    offsets = np.zeros((UNKNOWN_LEVEL + 1, len(configs)))
+    for code, level in enumerate(DIVISION_ORDER):
+        column = f"offset_{level}"
+        if column in configs.columns:
+            offsets[code] = configs[column].to_numpy(dtype=np.float64)
+    return k_factor, initial[None, :] + offsets
+
+def independent_waves(home1, home2, away1, away2):
+    """
+    Group matches into waves in which no player plays twice.
+
+    Each match goes in the wave after the last wave any of its players appeared
+    in, so processing the waves in order gives every player the same sequence
+    of matches as processing the matches one by one.
+
+    Returns:
+        tuple: (order, bounds) -- match indices sorted by wave, and the start of
+               each wave in `order` (plus the end)
+    """
+    n_players = int(max(np.max(a, initial=0) for a in (home1, home2, away1, away2))) + 1
+    last = [-1] * n_players  # last[0] stays -1: key 0 is "no player"
+    waves = []
+    append = waves.append
+
+    for h1, h2, a1, a2 in zip(home1.tolist(), home2.tolist(), away1.tolist(), away2.tolist()):
+        w = max(last[h1], last[h2], last[a1], last[a2]) + 1
+        append(w)
+        last[h1] = last[a1] = w
+        if h2:
+            last[h2] = w
+        if a2:
+            last[a2] = w
+
+    waves = np.asarray(waves, dtype=np.int64)
+    order = np.argsort(waves, kind="stable")
+    bounds = np.searchsorted(waves[order], np.arange(waves.max(initial=-1) + 2))
+    return order, bounds
+
+def sweep_elo(arrays, configs, scale=DEFAULT_SCALE, burn_in=0, eps=1e-12, waves=None):
+    """
+    Replay the same matches under M parameter configurations at once.
+
+    Ratings are a (players x M) matrix. Matches are grouped into independent
+    waves (see independent_waves) and each wave is one vectorized update of all
+    its matches under all M configurations, so a whole grid costs about as much
+    as a few single runs. Ratings match running EloEngine once per configuration.
+
+    Parameters:
+        arrays (dict): match arrays from match_arrays (home1, home2, away1,
+                       away2, outcome, level)
+        configs (DataFrame): one configuration per row (see param_grid)
+        burn_in (int): number of initial matches not scored (ratings still update)
+        waves (tuple, optional): precomputed independent_waves(...) for these arrays
+
+    Returns:
+        pandas DataFrame: configs with log_loss, brier and n_scored added
+    """
+    home1, home2, away1, away2 = (
+        np.asarray(arrays[name], dtype=np.int64) for name in ("home1", "home2", "away1", "away2")
+    )
+    outcome, level = np.asarray(arrays["outcome"], dtype=np.float64), np.asarray(arrays["level"])
+    k_factor, start_by_level = _config_arrays(configs)
+
+    n_players = int(max(a.max(initial=0) for a in (home1, home2, away1, away2))) + 1
+    ratings = np.full((n_players, len(configs)), np.nan)
+    rated = np.zeros(n_players, dtype=bool)
+    start_ratings(home1, home2, away1, away2, level, ratings, rated, start_by_level)
+
+    # A missing partner stands in as the player themselves: (r + r) / 2 == r
+    partner_home = np.where(home2 > 0, home2, home1)
+    partner_away = np.where(away2 > 0, away2, away1)
+    c = math.log(10.0) / scale
+
+    log_loss = np.zeros(len(configs))
+    brier = np.zeros(len(configs))
+    order, bounds = waves if waves is not None else independent_waves(home1, home2, away1, away2)
+
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        idx = order[lo:hi]
+        h1, h2, a1, a2 = home1[idx], home2[idx], away1[idx], away2[idx]
+        ph, pa = partner_home[idx], partner_away[idx]
+        result = outcome[idx][:, None]
+
+        home = (ratings[h1] + ratings[ph]) * 0.5
+        away = (ratings[a1] + ratings[pa]) * 0.5
+        e = 1.0 / (1.0 + np.exp((away - home) * c))
+
+        scored = idx >= burn_in
+        if scored.any():
+            e_scored = np.clip(e[scored], eps, 1 - eps)
+            r_scored = result[scored]
+            brier += ((e_scored - r_scored) ** 2).sum(axis=0)
+            log_loss -= (r_scored * np.log(e_scored) + (1 - r_scored) * np.log1p(-e_scored)).sum(axis=0)
+
+        delta = k_factor * (result - e)
+        # Players are unique within a wave, so fancy-indexed += is safe
+        ratings[h1] += delta
+        ratings[a1] -= delta
+        has_h2, has_a2 = h2 > 0, a2 > 0
+        ratings[h2[has_h2]] += delta[has_h2]
+        ratings[a2[has_a2]] -= delta[has_a2]
+
+    n_scored = max(len(outcome) - burn_in, 0)
+    results = configs.reset_index(drop=True).copy()
+    results["log_loss"] = log_loss / n_scored if n_scored else np.nan
+    results["brier"] = brier / n_scored if n_scored else np.nan
+    results["n_scored"] = n_scored
+    return results
+
+if __name__ == "__main__":
+    from scripts.dimensions import read_dimensions
+
+    tables = read_dimensions()
+    engine = EloEngine.load() if os.path.exists(DEFAULT_STATE_PATH) else EloEngine()
+    before = engine.n_matches
+    engine.update_matches(tables["matches"], tables["divisions"])
+    engine.save()
+
+    print(f"✅ Rated {engine.n_matches - before} new matches ({engine.n_matches} total) → {DEFAULT_STATE_PATH}")
+    print(engine.ratings_table(tables["players"]).head(20))
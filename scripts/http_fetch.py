@@ -0,0 +1,156 @@
+# scripts/http_fetch.py
+"""
+Browserless fetch backend for the scrapers.
+
+Division match pages and roster pages only need their final HTML, so they can
+be requested directly over a pooled keep-alive HTTP session instead of driving
+Chrome. The Season / Division Group / Division dropdowns
+(arch_season_list, divgs_list, divgs_div_list) are read from the HTML and
+their option values turned into the URLs the browser would navigate to.
+
+HttpFetcher has a quit() method so it can stand in for a Selenium driver in
+scraper_utils.run_driver_pool.
+"""
+
+from urllib.parse import urljoin, urlparse, urlencode, parse_qsl, urlunparse
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from scripts.page_readiness import latency
+
+SEASON_SELECT_ID = "arch_season_list"
+GROUP_SELECT_ID = "divgs_list"
+DIVISION_SELECT_ID = "divgs_div_list"
+
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) intercounty-tennis-scraper"
+
+
+class HttpFetcher:
+    """
+    A requests.Session with a keep-alive connection pool and retries.
+    """
+
+    def __init__(self, pool_size=8, timeout=15, retries=2, recorder=latency):
+        self.timeout = timeout
+        self.recorder = recorder
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=Retry(total=retries, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504]),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def fetch(self, url, step="http_get"):
+        """
+        GET a page and return its HTML. The request is timed under `step`.
+        """
+        with self.recorder.time(step):
+            response = self.session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+        return response.text
+
+    def quit(self):
+        self.session.close()
+
+
+# -- Reading dropdowns and links from HTML --
+def parse_select_options(html, select_id):
+    """
+    Read a <select> from the page.
+
+    Returns:
+        tuple: (name, options) where options is a list of dicts with text, value, selected.
+               (None, []) if the select is not on the page.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    select = soup.find("select", id=select_id)
+    if select is None:
+        return None, []
+
+    options = [
+        {
+            "text": o.text.strip(),
+            "value": o.get("value", o.text.strip()),
+            "selected": o.has_attr("selected"),
+        }
+        for o in select.find_all("option")
+    ]
+    return select.get("name") or select_id, options
+
+def option_url(page_url, select_name, value):
+    """
+    URL the browser ends up on after choosing an option.
+
+    Option values that already look like links (contain '/', '?' or '.php') are
+    resolved against the page URL; plain values are sent as a query parameter
+    named after the <select>, keeping the page's other parameters.
+    """
+    if "/" in value or "?" in value or ".php" in value:
+        return urljoin(page_url, value)
+
+    parts = urlparse(page_url)
+    query = dict(parse_qsl(parts.query))
+    query[select_name] = value
+    return urlunparse(parts._replace(query=urlencode(query)))
+
+def find_link(html, page_url, text):
+    """
+    Absolute URL of the first <a> whose text is `text`, or None.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    for a in soup.find_all("a", href=True):
+        if a.text.strip() == text:
+            return urljoin(page_url, a["href"])
+    return None
+
+
+# -- Division pages --
+def discover_divisions(fetcher, entry_url, group_index=1):
+    """
+    Browserless equivalent of opening the entry URL and picking the Division Group.
+
+    Returns:
+        tuple: (season, {division_name: division_url})
+    """
+    entry_html = fetcher.fetch(entry_url, step="open_entry_url")
+
+    _, seasons = parse_select_options(entry_html, SEASON_SELECT_ID)
+    selected = [o for o in seasons if o["selected"]] or seasons
+    if not selected:
+        raise ValueError(f"No {SEASON_SELECT_ID} dropdown found at {entry_url}")
+    season = selected[0]["text"]
+
+    group_name, groups = parse_select_options(entry_html, GROUP_SELECT_ID)
+    if not 0 <= group_index < len(groups):
+        raise ValueError(
+            f"No option {group_index} in the {GROUP_SELECT_ID} dropdown at {entry_url} "
+            f"(found {[o['text'] for o in groups]})"
+        )
+    group_url = option_url(entry_url, group_name, groups[group_index]["value"])
+    group_html = fetcher.fetch(group_url, step="select_group")
+
+    division_name, divisions = parse_select_options(group_html, DIVISION_SELECT_ID)
+    division_urls = {
+        o["text"]: option_url(group_url, division_name, o["value"])
+        for o in divisions
+        if "Select" not in o["text"]
+    }
+    return season, division_urls
+
+def load_division_matches_http(fetcher, division_url):
+    """
+    Fetch a division page, follow its "Matches" tab and return the matches HTML.
+    """
+    division_html = fetcher.fetch(division_url, step="select_division")
+    matches_url = find_link(division_html, division_url, "Matches")
+    if matches_url is None:
+        # Already on the matches page
+        return division_html
+    return fetcher.fetch(matches_url, step="open_matches")
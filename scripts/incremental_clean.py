@@ -0,0 +1,205 @@
+# scripts/incremental_clean.py
+"""
+Incremental cleaning of the match archive.
+
+A JSON manifest records a content hash for every input file (per-division CSV
+or match store Parquet file) and how many cleaned rows it produced. Each run
+cleans only new or changed inputs, drops rows from changed or deleted inputs,
+and merges the result into the existing cleaned Parquet file.
+
+IDs are content hashes (id_method='hash'), so a team match or match keeps the
+same ID no matter which run cleaned it.
+
+Usage (from the project root):
+    python -m scripts.incremental_clean
+"""
+
+import glob
+import hashlib
+import json
+import os
+from functools import partial
+
+import pandas as pd
+
+from scripts.clean_metadata import clean_metadata_pipeline
+
+DEFAULT_CLEANED_PATH = "data/cleaned/ic_mixed_matches_cleaned.parquet"
+DEFAULT_MANIFEST_PATH = "data/cleaned/manifest.json"
+
+# Raw inputs: the scrapers write every division to both, so only one is read
+DEFAULT_STORE_PATTERN = "data/matches/**/*.parquet"
+DEFAULT_CSV_PATTERN = "data/raw/ic_mixed_matches*.csv"
+
+SOURCE_COL = "source_file"
+
+
+# -- Manifest --
+def file_sha256(path, chunk_size=1 << 20):
+    """
+    SHA-256 of a file's contents.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def load_manifest(manifest_path):
+    """
+    Load the manifest, or an empty one if it doesn't exist yet.
+    """
+    if not os.path.exists(manifest_path):
+        return {"inputs": {}, "output": None}
+    with open(manifest_path) as f:
+        return json.load(f)
+
+def save_manifest(manifest, manifest_path):
+    """
+    Write the manifest atomically (temp file + rename).
+    """
+    os.makedirs(os.path.dirname(manifest_path) or ".", exist_ok=True)
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+def diff_inputs(paths, manifest):
+    """
+    Compare input files against the manifest.
+
+    Files whose size and mtime match the manifest are trusted without hashing,
+    so a run with no changes only stats the files.
+
+    Returns:
+        tuple: (changed, removed, fingerprints)
+            changed: paths that are new or whose content hash changed
+            removed: manifest paths that are no longer inputs
+            fingerprints: {path: {'sha256', 'size', 'mtime_ns'}} for all current inputs
+    """
+    known = manifest["inputs"]
+    changed = []
+    fingerprints = {}
+
+    for path in paths:
+        stat = os.stat(path)
+        entry = known.get(path)
+
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            sha256 = entry["sha256"]
+        else:
+            sha256 = file_sha256(path)
+            if not entry or entry["sha256"] != sha256:
+                changed.append(path)
+
+        fingerprints[path] = {"sha256": sha256, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    removed = sorted(set(known) - set(fingerprints))
+    return changed, removed, fingerprints
+
+
+# -- Inputs and outputs --
+def read_input(path):
+    """
+    Read one raw input file. Parquet files from the match store get their
+    hive partition values (e.g. Season=2024) back as columns.
+    """
+    if path.endswith(".parquet"):
+        df = pd.read_parquet(path)
+        for part in os.path.normpath(path).split(os.sep)[:-1]:
+            if "=" in part:
+                key, value = part.split("=", 1)
+                df[key] = value
+        return df
+    return pd.read_csv(path)
+
+def input_files(store_pattern=DEFAULT_STORE_PATTERN, csv_pattern=DEFAULT_CSV_PATTERN):
+    """
+    Raw input files: the Parquet match store if it has any files, else the
+    per-division CSVs. Never both, since they hold the same matches.
+    """
+    store = sorted(glob.glob(store_pattern, recursive=True))
+    return store if store else sorted(glob.glob(csv_pattern))
+
+def _write_parquet_atomic(df, path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+# -- Incremental run --
+def clean_incremental(input_paths, cleaned_path=DEFAULT_CLEANED_PATH, manifest_path=DEFAULT_MANIFEST_PATH,
+                      clean_func=None):
+    """
+    Clean only new or changed inputs and merge them into the cleaned store.
+
+    Parameters:
+        input_paths (list): raw CSV / Parquet files
+        cleaned_path (str): cleaned Parquet file (created if missing)
+        manifest_path (str): JSON manifest of input hashes and outputs
+        clean_func (callable, optional): raw DataFrame -> cleaned DataFrame.
+            Defaults to clean_metadata_pipeline with content-hash IDs.
+
+    Returns:
+        dict: summary with 'cleaned', 'removed', 'unchanged' and 'rows'
+    """
+    if clean_func is None:
+        clean_func = partial(clean_metadata_pipeline, id_method="hash")
+
+    input_paths = sorted(str(p) for p in input_paths)
+    manifest = load_manifest(manifest_path)
+
+    # A missing output means everything has to be rebuilt
+    if not os.path.exists(cleaned_path):
+        manifest = {"inputs": {}, "output": None}
+
+    changed, removed, fingerprints = diff_inputs(input_paths, manifest)
+    summary = {
+        "cleaned": changed,
+        "removed": removed,
+        "unchanged": len(input_paths) - len(changed),
+        "rows": manifest["output"]["rows"] if manifest["output"] else 0,
+    }
+
+    if not changed and not removed:
+        print("✅ Cleaned store is up to date.")
+        return summary
+
+    # Keep rows from untouched inputs only
+    stale = set(changed) | set(removed)
+    if os.path.exists(cleaned_path):
+        df_existing = pd.read_parquet(cleaned_path)
+        df_existing = df_existing[~df_existing[SOURCE_COL].isin(stale)]
+    else:
+        df_existing = pd.DataFrame()
+
+    df_new = pd.DataFrame()
+    if changed:
+        print(f"🔄 Cleaning {len(changed)} new or changed input files...")
+        df_raw = pd.concat(
+            [read_input(path).assign(**{SOURCE_COL: path}) for path in changed],
+            ignore_index=True
+        )
+        df_new = clean_func(df_raw)
+
+    df_clean = pd.concat([df_existing, df_new], ignore_index=True)
+    _write_parquet_atomic(df_clean, cleaned_path)
+
+    rows_per_input = df_clean[SOURCE_COL].value_counts().to_dict() if len(df_clean) else {}
+    manifest = {
+        "inputs": {
+            path: {**fingerprint, "rows": int(rows_per_input.get(path, 0))}
+            for path, fingerprint in fingerprints.items()
+        },
+        "output": {"path": cleaned_path, "sha256": file_sha256(cleaned_path), "rows": len(df_clean)},
+    }
+    save_manifest(manifest, manifest_path)
+
+    summary["rows"] = len(df_clean)
+    print(f"✅ Cleaned {len(changed)} files, dropped {len(removed)}; cleaned store has {len(df_clean)} rows.")
+    return summary
+
+
+if __name__ == "__main__":
+    clean_incremental(input_files())
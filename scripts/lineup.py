@@ -0,0 +1,375 @@
+# scripts/lineup.py
+"""
+Best lineup for a team match: which pair from our roster plays each line.
+
+Line gender rules (Line_label):
+    1 Ladies       two women
+    2, 3 Mixed     one man and one woman
+    4 Mens         two men
+    5, 6 Open      any two players
+
+Every player plays at most one line. The objective is the expected number of
+lines won against the opponent's likely lineup, using MatchupPredictor.
+
+A line's win probability depends on the pair's mean rating, so it only rises
+when a partner is swapped for a better-rated player. That prunes which 12
+players need to be considered (see search_lineups); within each candidate set,
+every arrangement of the players on the lines is scored at once with NumPy.
+"""
+
+import heapq
+from functools import lru_cache
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from scripts.dimensions import player_identity
+from scripts.metadata_utils import LINE_LABELS
+
+# Genders required on each line: (first, second); None means anyone
+LINE_RULES = {
+    1: ("F", "F"),
+    2: ("M", "F"),
+    3: ("M", "F"),
+    4: ("M", "M"),
+    5: (None, None),
+    6: (None, None),
+}
+
+GENDER_CODES = {
+    "m": "M", "male": "M", "man": "M", "men": "M",
+    "f": "F", "female": "F", "woman": "F", "women": "F", "w": "F", "l": "F", "lady": "F",
+}
+
+
+# -- Genders --
+def _normalize_gender(value):
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    return GENDER_CODES.get(str(value).strip().lower())
+
+def guess_genders(names):
+    """
+    Guess 'M' / 'F' from first names with gender_guesser (None if unsure).
+    """
+    import gender_guesser.detector as gender_detector
+
+    detector = gender_detector.Detector(case_sensitive=False)
+    codes = {"male": "M", "mostly_male": "M", "female": "F", "mostly_female": "F"}
+    return [codes.get(detector.get_gender(str(name).split()[0])) if name else None for name in names]
+
+def player_genders(roster, gender_col="Gender", mapping=None, guess=False):
+    """
+    Gender ('M', 'F' or None) for every roster row.
+
+    Taken from the roster's gender_col if present, then from mapping
+    ({ID or Name: gender}), then (if guess=True) from the first name.
+    """
+    genders = (
+        [_normalize_gender(g) for g in roster[gender_col]]
+        if gender_col in roster.columns else [None] * len(roster)
+    )
+
+    if mapping:
+        for i, (player_id, name) in enumerate(zip(roster["ID"], roster["Name"])):
+            if genders[i] is None:
+                genders[i] = _normalize_gender(mapping.get(player_id, mapping.get(name)))
+
+    if guess:
+        missing = [i for i, g in enumerate(genders) if g is None]
+        for i, g in zip(missing, guess_genders(roster["Name"].iloc[missing])):
+            genders[i] = g
+
+    return genders
+
+
+# -- Pair values --
+def pair_values(ratings, opponent_ratings, predictor):
+    """
+    Win probability of every pair of our players on every line.
+
+    Parameters:
+        ratings (array): our players' ratings
+        opponent_ratings (dict): {line: opponent pair rating}
+        predictor (MatchupPredictor): for the per-line adjustments
+
+    Returns:
+        dict: {line: n x n array}, entry [i, j] for players i and j together
+    """
+    ratings = np.asarray(ratings, dtype=np.float64)
+    pair = (ratings[:, None] + ratings[None, :]) * 0.5
+    values = {}
+    for line in LINE_RULES:
+        bias, slope = predictor.line_terms(line)
+        values[line] = 1.0 / (1.0 + np.exp(-(bias + slope * (pair - opponent_ratings[line]))))
+    return values
+
+
+# -- Player sets --
+def _subsets(n_players, n_used, max_inversions):
+    """
+    Choices of n_used out of n_players (numbered best first) with at most
+    max_inversions inversions: (unused, used) pairs where the unused player is better.
+    """
+    found = []
+
+    def walk(start, chosen, skipped, budget):
+        if len(chosen) == n_used:
+            found.append(tuple(chosen))
+            return
+        if n_players - start < n_used - len(chosen):
+            return
+        # Using this player costs one inversion per better player left out so far
+        if skipped <= budget:
+            walk(start + 1, chosen + [start], skipped, budget - skipped)
+        # Leaving it out makes every later pick cost at least one more
+        if skipped + 1 <= budget:
+            walk(start + 1, chosen, skipped + 1, budget)
+
+    walk(0, [], 0, max_inversions)
+    return found
+
+def _dominating(positions):
+    """
+    Number of choices of the same size (itself included) whose i-th best
+    player is at least as good as the i-th best in positions, for every i.
+    """
+    ways = [1] * (positions[0] + 1) if positions else [1]
+    for s in positions[1:]:
+        below, running = [], 0
+        for v in range(s + 1):
+            below.append(running)
+            running += ways[v] if v < len(ways) else 0
+        ways = below
+    return sum(ways)
+
+def player_sets(ratings, genders, top_k=None):
+    """
+    Candidate sets of the 12 players who take the court.
+
+    Women fill the Ladies line and one seat on each Mixed line (4 to 8 women),
+    men likewise (4 to 8), and players of unknown gender only the Open lines.
+
+    With top_k, only sets dominated by fewer than top_k others are returned:
+    a set dominates another with the same number of each gender when its i-th
+    best woman (man, ...) is rated at least as high, for every i.
+
+    Returns:
+        list: (women, men, others) roster positions as int arrays, fewest dominating sets first
+    """
+    groups = {}
+    for gender in ["F", "M", None]:
+        members = [i for i, g in enumerate(genders) if g == gender]
+        groups[gender] = sorted(members, key=lambda i: -ratings[i])
+    n_women, n_men, n_others = (len(groups[g]) for g in ["F", "M", None])
+
+    # A set dominated by d others has at most d - 1 inversions
+    max_inversions = len(genders) ** 2 if top_k is None else top_k - 1
+    limit = float("inf") if top_k is None else top_k
+
+    def choices(gender, n_players, n_used):
+        found = []
+        for positions in _subsets(n_players, n_used, max_inversions):
+            count = _dominating(positions)
+            if count <= limit:
+                found.append((np.array([groups[gender][i] for i in positions], dtype=np.intp), count))
+        return found
+
+    sets = []
+    for used_women in range(4, min(8, n_women) + 1):
+        for used_men in range(4, min(8, n_men) + 1):
+            used_others = 12 - used_women - used_men
+            if not 0 <= used_others <= min(4, n_others):
+                continue
+            for women, d_women in choices("F", n_women, used_women):
+                for men, d_men in choices("M", n_men, used_men):
+                    for others, d_others in choices(None, n_others, used_others):
+                        count = d_women * d_men * d_others
+                        if count <= limit:
+                            sets.append((count, women, men, others))
+    sets.sort(key=lambda s: s[0])
+    return [(women, men, others) for _, women, men, others in sets]
+
+
+# -- Arrangements --
+# Ways to split the four Open players into Open 1 and Open 2: (a, b, c, d) -> (a, b) and (c, d)
+OPEN_ARRANGEMENTS = np.array([
+    (0, 1, 2, 3), (2, 3, 0, 1),
+    (0, 2, 1, 3), (1, 3, 0, 2),
+    (0, 3, 1, 2), (1, 2, 0, 3),
+], dtype=np.intp)
+
+@lru_cache(maxsize=None)
+def _gender_arrangements(n):
+    """
+    Ways to seat n players of one gender: n - 4 go to the Open lines, two play
+    the single-gender line (Ladies / Mens) and one each plays Mixed 1 and Mixed 2.
+
+    Returns:
+        tuple: (open_choices (A, n - 4), arrangements (A, 12, 4)) where each
+               arrangement is (pair a, pair b, mixed 1, mixed 2) and A indexes open_choices
+    """
+    players = range(n)
+    open_choices, arrangements = [], []
+    for open_players in combinations(players, n - 4):
+        rest = [p for p in players if p not in open_players]
+        rows = []
+        for a, b in combinations(rest, 2):
+            x, y = (p for p in rest if p not in (a, b))
+            rows += [(a, b, x, y), (a, b, y, x)]
+        open_choices.append(open_players)
+        arrangements.append(rows)
+    return (
+        np.array(open_choices, dtype=np.intp).reshape(len(open_choices), n - 4),
+        np.array(arrangements, dtype=np.intp),
+    )
+
+def _score_set(women, men, others, values):
+    """
+    Expected lines won for every arrangement of one player set.
+
+    Returns:
+        tuple: (totals (A, 12, B, 12, 6) array, decode) where decode(index)
+               gives {line: (i, j)} for a flat index into totals
+    """
+    women_open, women_arr = _gender_arrangements(len(women))
+    men_open, men_arr = _gender_arrangements(len(men))
+    W, M = women[women_arr], men[men_arr]  # (A, 12, 4), (B, 12, 4)
+    n_a, n_b = len(women_open), len(men_open)
+
+    ladies = values[1][W[..., 0], W[..., 1]]
+    mens = values[4][M[..., 0], M[..., 1]]
+    mixed = (values[2][W[:, :, None, None, 2], M[None, None, :, :, 2]]
+             + values[3][W[:, :, None, None, 3], M[None, None, :, :, 3]])
+
+    open_players = np.concatenate([
+        np.broadcast_to(women[women_open][:, None, :], (n_a, n_b, women_open.shape[1])),
+        np.broadcast_to(men[men_open][None, :, :], (n_a, n_b, men_open.shape[1])),
+        np.broadcast_to(others, (n_a, n_b, len(others))),
+    ], axis=2)
+    O = open_players[:, :, OPEN_ARRANGEMENTS]  # (A, B, 6, 4)
+    opens = values[5][O[..., 0], O[..., 1]] + values[6][O[..., 2], O[..., 3]]
+
+    totals = (ladies[:, :, None, None, None] + mens[None, None, :, :, None]
+              + mixed[..., None] + opens[:, None, :, None, :])
+
+    def decode(index):
+        a, wi, b, mi, oi = np.unravel_index(index, totals.shape)
+        w, m, o = W[a, wi], M[b, mi], O[a, b, oi]
+        pairs = {1: (w[0], w[1]), 2: (m[2], w[2]), 3: (m[3], w[3]),
+                 4: (m[0], m[1]), 5: (o[0], o[1]), 6: (o[2], o[3])}
+        return {line: (int(i), int(j)) for line, (i, j) in pairs.items()}
+
+    return totals, decode
+
+
+# -- Search --
+def search_lineups(ratings, genders, values, top_k=5, increasing=True):
+    """
+    The top_k lineups by expected lines won.
+
+    A pair's win probability never drops when a partner is swapped for a
+    better-rated player of the same gender. So if another player set dominates
+    a lineup's set (see player_sets), mapping each player to the same-ranked
+    player of that set gives a lineup at least as good. Lineups in sets
+    dominated by top_k or more others can't be needed, which leaves a handful
+    of sets; each set's arrangements are scored at once with NumPy.
+
+    Parameters:
+        ratings (list): our players' ratings
+        genders (list): 'M', 'F' or None per player
+        values (dict): {line: n x n win probabilities} from pair_values
+        increasing (bool): False if win probability isn't increasing in
+                           rating on every line; then every set is scored
+
+    Returns:
+        list: (expected_lines, {line: (i, j)}) best first
+    """
+    best = []  # min-heap of (value, tiebreak, decode, index)
+    counter = 0
+    for women, men, others in player_sets(ratings, genders, top_k if increasing else None):
+        totals, decode = _score_set(women, men, others, values)
+        flat = totals.ravel()
+        top = np.argpartition(flat, -top_k)[-top_k:] if flat.size > top_k else np.arange(flat.size)
+        for index in top:
+            value = float(flat[index])
+            counter += 1
+            entry = (value, -counter, decode, int(index))
+            if len(best) < top_k:
+                heapq.heappush(best, entry)
+            elif value > best[0][0]:
+                heapq.heapreplace(best, entry)
+
+    results = sorted(best, reverse=True)
+    return [(value, decode(index)) for value, _, decode, index in results]
+
+
+# -- Optimizer --
+def optimize_lineup(roster, opponent, predictor, players, top_k=5,
+                    gender_col="Gender", gender_map=None, guess_gender=False):
+    """
+    Best assignment of our roster to lines 1-6 against an opponent's likely lineup.
+
+    Parameters:
+        roster (list or DataFrame): scrape_roster_page rows (Name, ID, ...)
+        opponent (list or dict): opponent (key, key) pair per line, in Line order, or {line: pair}
+        predictor (MatchupPredictor): ratings and line adjustments
+        players (DataFrame): players dimension (identity -> player_key)
+        top_k (int): number of lineups to return
+        gender_col, gender_map, guess_gender: see player_genders
+
+    Returns:
+        list of dicts, best first: expected_lines, team (predict_team_match
+        result) and lines (DataFrame: line, Line_label, players, keys, win_prob)
+    """
+    roster = pd.DataFrame(roster).reset_index(drop=True)
+    opponent = dict(opponent) if isinstance(opponent, dict) else dict(zip(LINE_RULES, opponent))
+
+    identities = player_identity(roster["Name"], roster["ID"])
+    key_lookup = dict(zip(players["identity"], players["player_key"]))
+    keys = [int(key_lookup.get(identity, 0)) if isinstance(identity, str) else 0 for identity in identities]
+    genders = player_genders(roster, gender_col=gender_col, mapping=gender_map, guess=guess_gender)
+
+    usable = []
+    for i, (key, gender) in enumerate(zip(keys, genders)):
+        try:
+            if key:
+                predictor.pair_rating(key)
+                usable.append(i)
+                continue
+        except KeyError:
+            pass
+        print(f"⚠️  {roster.loc[i, 'Name']} has no rating yet and is left out")
+
+    for i in usable:
+        if genders[i] is None:
+            print(f"⚠️  {roster.loc[i, 'Name']} has no known gender: Open lines only")
+
+    use_keys = [keys[i] for i in usable]
+    use_genders = [genders[i] for i in usable]
+    ratings = [predictor.pair_rating(key) for key in use_keys]
+    values = pair_values(ratings, {line: predictor.pair_rating(opponent[line]) for line in LINE_RULES}, predictor)
+
+    # Rating-order pruning needs win probability to rise with rating on every line
+    increasing = all(predictor.line_terms(line)[1] > 0 for line in LINE_RULES)
+    lineups = search_lineups(ratings, use_genders, values, top_k=top_k, increasing=increasing)
+    if not lineups:
+        raise ValueError("The roster can't fill all six lines under the line gender rules")
+
+    results = []
+    for expected_lines, assignment in lineups:
+        rows = []
+        for line in sorted(assignment):
+            i, j = assignment[line]
+            pair = (use_keys[i], use_keys[j])
+            rows.append({
+                "line": line,
+                "Line_label": LINE_LABELS[line],
+                "players": (roster.loc[usable[i], "Name"], roster.loc[usable[j], "Name"]),
+                "keys": pair,
+                "win_prob": predictor.predict_line(pair, opponent[line], line),
+            })
+        team = predictor.predict_team_match([(r["line"], r["keys"], opponent[r["line"]]) for r in rows])
+        results.append({"expected_lines": expected_lines, "team": team, "lines": pd.DataFrame(rows)})
+    return results
@@ -0,0 +1,164 @@
+# scripts/match_store.py
+"""
+Partitioned Parquet store for scraped matches.
+
+Layout (hive partitioning):
+
+    data/matches/Season=2024/division_group=Major/Majors-West-3f2a9c1e-0.parquet
+
+Each division is written to its own file inside its Season / division group
+partition, so re-scraping a division simply overwrites that file. The file name
+ends in a hash of the exact division name, so names that clean to the same
+stem (e.g. 'A West' and 'A/West') never overwrite each other. Readers can
+load only the seasons, division groups and columns they need instead of
+re-parsing every CSV.
+"""
+
+import hashlib
+import re
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from scripts.metadata_utils import parse_division_level
+
+DEFAULT_STORE_PATH = "data/matches"
+
+# Columns produced by scraper_utils.extract_all_matches
+RAW_MATCH_SCHEMA = pa.schema([
+    ("Season", pa.string()),
+    ("Division", pa.string()),
+    ("Date", pa.string()),
+    ("Home Team", pa.string()),
+    ("Away Team", pa.string()),
+    ("Line", pa.int8()),
+    ("Score", pa.string()),
+    ("Defaulted", pa.bool_()),
+    ("Retired", pa.bool_()),
+    ("Home Won", pa.bool_()),
+    ("Away Won", pa.bool_()),
+    ("Home Player 1", pa.string()),
+    ("Home ID 1", pa.string()),
+    ("Home Player 2", pa.string()),
+    ("Home ID 2", pa.string()),
+    ("Away Player 1", pa.string()),
+    ("Away ID 1", pa.string()),
+    ("Away Player 2", pa.string()),
+    ("Away ID 2", pa.string()),
+    ("division_group", pa.string()),
+])
+
+PARTITIONING = ds.partitioning(
+    pa.schema([("Season", pa.string()), ("division_group", pa.string())]),
+    flavor="hive"
+)
+
+BOOL_COLUMNS = ["Defaulted", "Retired", "Home Won", "Away Won"]
+
+
+def _file_stem(s):
+    return re.sub(r"[^\w\-]", "-", str(s)).strip("-").replace("--", "-")
+
+def _division_file_name(division):
+    digest = hashlib.sha1(str(division).encode("utf-8")).hexdigest()[:8]
+    return f"{_file_stem(division)}-{digest}"
+
+
+def division_group(division):
+    """
+    Partition value for a division name: 'Major', 'A', 'B', 'C' or 'Other'.
+    """
+    return parse_division_level(division) or "Other"
+
+
+def matches_to_table(df):
+    """
+    Convert a DataFrame of scraped matches (e.g., from extract_all_matches or an
+    old CSV) to a pyarrow Table with RAW_MATCH_SCHEMA. Missing columns are null.
+    """
+    df = df.copy()
+
+    for field in RAW_MATCH_SCHEMA:
+        if field.name not in df.columns:
+            df[field.name] = None
+
+    df["Season"] = df["Season"].astype(str)
+    df["Line"] = pd.to_numeric(df["Line"], errors="coerce").astype("Int8")
+    for col in BOOL_COLUMNS:
+        df[col] = df[col].astype("boolean")
+
+    groups = {d: division_group(d) for d in df["Division"].dropna().unique()}
+    df["division_group"] = df["Division"].map(groups).fillna("Other")
+
+    return pa.Table.from_pandas(df[RAW_MATCH_SCHEMA.names], schema=RAW_MATCH_SCHEMA, preserve_index=False)
+
+
+def write_matches(df, root=DEFAULT_STORE_PATH):
+    """
+    Write matches into the store, one file per (Season, Division).
+    Existing files for the same division are overwritten; other divisions are kept.
+
+    Returns:
+        int: number of rows written
+    """
+    if df.empty:
+        return 0
+
+    for (season, division), group in df.groupby(["Season", "Division"], sort=False):
+        ds.write_dataset(
+            matches_to_table(group),
+            root,
+            format="parquet",
+            partitioning=PARTITIONING,
+            basename_template=f"{_division_file_name(division)}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+        )
+
+    return len(df)
+
+
+def import_csv_files(paths, root=DEFAULT_STORE_PATH):
+    """
+    One-off migration of per-division CSVs (data/raw or data/processed) into the store.
+
+    Returns:
+        int: number of rows written
+    """
+    return sum(write_matches(pd.read_csv(path), root) for path in paths)
+
+
+def open_match_dataset(root=DEFAULT_STORE_PATH):
+    """
+    Open the store as a pyarrow Dataset with the explicit schema.
+    """
+    return ds.dataset(root, format="parquet", schema=RAW_MATCH_SCHEMA, partitioning=PARTITIONING)
+
+
+def read_matches(root=DEFAULT_STORE_PATH, seasons=None, division_groups=None, divisions=None, columns=None):
+    """
+    Load matches from the store, reading only what is asked for.
+
+    Parameters:
+        seasons (list, optional): e.g. [2023, 2024] — prunes Season partitions
+        division_groups (list, optional): e.g. ['Major', 'A'] — prunes division_group partitions
+        divisions (list, optional): exact Division names
+        columns (list, optional): columns to read (default: all)
+
+    Returns:
+        pandas DataFrame
+    """
+    dataset = open_match_dataset(root)
+
+    conditions = []
+    if seasons is not None:
+        conditions.append(ds.field("Season").isin([str(s) for s in seasons]))
+    if division_groups is not None:
+        conditions.append(ds.field("division_group").isin(list(division_groups)))
+    if divisions is not None:
+        conditions.append(ds.field("Division").isin(list(divisions)))
+
+    filter_expr = None
+    for condition in conditions:
+        filter_expr = condition if filter_expr is None else filter_expr & condition
+
+    return dataset.to_table(columns=columns, filter=filter_expr).to_pandas()
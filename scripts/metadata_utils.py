@@ -1,7 +1,12 @@
 # metadata_utils.py
-import pandas as pd
+import os
 import re
-from rapidfuzz import fuzz
+import unicodedata
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from rapidfuzz import fuzz, process
 
 
 # -- Fix date function --
@@ -21,6 +26,54 @@ def fix_match_date(date_value):
         return pd.NaT
 
 
+# -- Fix a whole date column --
+
+# Explicit formats tried before falling back to fix_match_date
+DATE_FORMATS = ['%Y-%m-%d', '%m/%d/%Y', '%B %d, %Y', '%b %d, %Y']
+
+def fix_match_dates(series, formats=DATE_FORMATS):
+    """
+    Bulk version of fix_match_date for a whole column.
+
+    Each distinct value is parsed only once: strings are first tried against
+    the explicit `formats` (fast, vectorized), and whatever is left goes
+    through fix_match_date one unique value at a time. Results are broadcast
+    back to every row through the factorized codes.
+
+    Returns:
+        tuple: (dates, used_fallback)
+            dates: datetime Series, same output as series.apply(fix_match_date)
+            used_fallback: boolean Series, True for rows parsed by the slow fallback
+    """
+    codes, uniques = pd.factorize(series)
+    uniques = np.asarray(uniques, dtype=object)
+
+    parsed = pd.Series(pd.NaT, index=range(len(uniques)), dtype='datetime64[us]')
+    remaining = np.fromiter((isinstance(u, str) for u in uniques), dtype=bool, count=len(uniques))
+    needs_fallback = ~remaining
+
+    # Fast pass: explicit formats over unique strings only
+    for fmt in formats:
+        if not remaining.any():
+            break
+        attempt = pd.to_datetime(pd.Series(uniques[remaining]), format=fmt, errors='coerce')
+        ok = attempt.notna().to_numpy()
+        idx = np.flatnonzero(remaining)[ok]
+        parsed.iloc[idx] = attempt[ok].to_numpy()
+        remaining[idx] = False
+
+    # Slow pass: anything the formats did not handle, once per unique value
+    needs_fallback |= remaining
+    for i in np.flatnonzero(needs_fallback):
+        parsed.iloc[i] = fix_match_date(uniques[i])
+
+    dates = pd.Series(parsed.to_numpy()[codes], index=series.index, name=series.name)
+    dates[codes < 0] = pd.NaT
+    used_fallback = pd.Series(needs_fallback[codes] & (codes >= 0), index=series.index)
+
+    return dates, used_fallback
+
+
 # -- Parse division level --
 def parse_division_level(division_name):
     """
@@ -45,6 +98,8 @@ def parse_division_level(division_name):
  
 # -- Turn division level into ordered categorical --
 
+DIVISION_ORDER = ['C', 'B', 'A', 'Major']
+
 def cast_division_level(series):
     """
     Cast a pandas Series to an ordered Categorical type for division levels.
@@ -54,9 +109,8 @@ def cast_division_level(series):
     Returns:
         pandas Series: ordered Categorical
     """
-    division_order = ['C', 'B', 'A', 'Major']
     return pd.Series(
-        pd.Categorical(series, categories=division_order, ordered=True),
+        pd.Categorical(series, categories=DIVISION_ORDER, ordered=True),
         index=series.index
     )
 
@@ -81,40 +135,214 @@ def validate_line(line_value):
     else:
         return None
 
+# -- Map scalar cleaners over unique values --
+def map_unique(series, func):
+    """
+    Apply a scalar cleaner (e.g., parse_division_level) to each distinct value once
+    and broadcast the results back through the factorized codes.
+    Same output values as series.apply(func), but cost grows with cardinality.
+
+    Returns:
+        pandas Series (object dtype) aligned with the input.
+    """
+    codes, uniques = pd.factorize(series)
+    mapped = np.empty(len(uniques) + 1, dtype=object)
+    mapped[:-1] = [func(u) for u in uniques]
+    mapped[-1] = func(np.nan)  # missing values, code -1
+    return pd.Series(mapped[codes], index=series.index, name=series.name)
+
+def map_unique_categorical(series, func, categories, ordered=False):
+    """
+    Like map_unique, but build a Categorical directly from the codes.
+    Results not in `categories` (including None) become NaN.
+
+    Returns:
+        pandas Series: Categorical aligned with the input.
+    """
+    codes, uniques = pd.factorize(series)
+    category_codes = {c: i for i, c in enumerate(categories)}
+    mapped = np.empty(len(uniques) + 1, dtype=np.int16)
+    mapped[:-1] = [category_codes.get(func(u), -1) for u in uniques]
+    mapped[-1] = category_codes.get(func(np.nan), -1)
+    return pd.Series(
+        pd.Categorical.from_codes(mapped[codes], categories=categories, ordered=ordered),
+        index=series.index,
+        name=series.name
+    )
+
+def parse_division_levels(series):
+    """
+    Bulk parse_division_level + cast_division_level for a whole Division column.
+
+    Returns:
+        pandas Series: ordered Categorical
+    """
+    return map_unique_categorical(series, parse_division_level, DIVISION_ORDER, ordered=True)
+
+def validate_lines(series):
+    """
+    Bulk validate_line for a whole Line column.
+
+    Returns:
+        pandas Series: nullable Int64, <NA> for invalid lines
+    """
+    return map_unique(series, validate_line).astype('Int64')
+
 # --- ID and label functions ---
+
+# Separator used when building content keys for hashed IDs
+KEY_SEPARATOR = '\x1f'
+
+def _canonical_key_strings(keys):
+    """
+    Render one row of key values per group as a canonical string, so content-hash
+    IDs don't depend on dtypes (datetime unit, Int64 vs float lines, etc.).
+    """
+    parts = []
+    for col in keys.columns:
+        values = keys[col]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            rendered = values.dt.strftime('%Y-%m-%dT%H:%M:%S')
+        elif pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            numeric = values.astype('Float64')
+            if (numeric.dropna() % 1 == 0).all():
+                numeric = numeric.astype('Int64')
+            rendered = numeric.astype(str)
+        else:
+            rendered = values.astype(object).where(values.notna(), '<NA>').astype(str)
+        # None, NaN, NaT and pd.NA all render as '<NA>' (astype(str) would give 'None' / 'nan')
+        parts.append(rendered.astype(object).where(values.notna(), '<NA>').to_numpy(dtype=object))
+
+    return np.array([KEY_SEPARATOR.join(row) for row in zip(*parts)], dtype=object)
+
+def assign_group_ids(df, key_cols, id_method='sequential'):
+    """
+    Assign one ID per distinct combination of key_cols without casting the
+    whole frame to str or merging it back onto itself.
+
+    Parameters:
+        id_method (str):
+            'sequential' - 1, 2, 3, ... in sorted key order (IDs shift when new data is added)
+            'hash'       - uint64 content hash of the key values, stable between runs
+
+    Returns:
+        numpy array of IDs aligned with df's rows.
+    """
+    group_codes = df.groupby(key_cols, sort=True, dropna=False).ngroup().to_numpy()
+
+    if id_method == 'sequential':
+        return group_codes + 1
+    elif id_method == 'hash':
+        # Hash one canonical key string per group, then broadcast to rows
+        first_rows = np.unique(group_codes, return_index=True)[1]
+        key_strings = _canonical_key_strings(df[key_cols].iloc[first_rows])
+        return pd.util.hash_array(key_strings)[group_codes]
+    else:
+        raise ValueError(f"Unknown id_method: {id_method!r} (expected 'sequential' or 'hash')")
+
+# Line numbers to line names
+LINE_LABELS = {
+    1: "Ladies",
+    2: "Mixed 1",
+    3: "Mixed 2",
+    4: "Mens",
+    5: "Open 1",
+    6: "Open 2"
+}
+
+def render_team_match_labels(df, date_col='Date_fixed', division_col='Division',
+                             home_col='Home Team', away_col='Away Team'):
+    """
+    Render readable team match labels (e.g., '2025-06-01 A Toronto Aces vs Oakville Rockets')
+    for the given rows. Use this on a filtered frame when labels were skipped.
+
+    Returns:
+        pandas Series of strings.
+    """
+    return (
+        df[date_col].dt.strftime('%Y-%m-%d') + ' ' +
+        df[division_col].astype(str) + ' ' +
+        df[home_col].astype(str) + ' vs ' +
+        df[away_col].astype(str)
+    )
+
+def render_match_labels(df, 
+                        date_col='Date_fixed', 
+                        division_col='Division', 
+                        home_col='Home Team', 
+                        away_col='Away Team', 
+                        line_col='Line_validated',
+                        home_p1_col='Home Player 1',
+                        home_p2_col='Home Player 2',
+                        away_p1_col='Away Player 1',
+                        away_p2_col='Away Player 2'):
+    """
+    Render readable individual match labels for the given rows, e.g.
+    '2025-06-01 A Toronto Aces vs Oakville Rockets (1 - Ladies) - Alice & Amy vs Bea & Cat'.
+
+    Returns:
+        pandas Series of strings.
+    """
+    line_label = df[line_col].map(LINE_LABELS)
+    return (
+        render_team_match_labels(df, date_col, division_col, home_col, away_col) + ' (' +
+        df[line_col].astype(str) + ' - ' +
+        line_label.astype(str) + ')' + ' - ' +
+        df[home_p1_col].astype(str) + ' & ' +
+        df[home_p2_col].astype(str) + ' vs ' +
+        df[away_p1_col].astype(str) + ' & ' +
+        df[away_p2_col].astype(str)
+    )
+
+def _labels_by_id(df, id_col, render):
+    """
+    Render one label per distinct ID (from its first row) and broadcast it
+    as a Categorical, so label text is stored once per ID rather than per row.
+    """
+    codes, _ = pd.factorize(df[id_col])
+    first_rows = np.unique(codes, return_index=True)[1]
+    rendered = pd.Categorical(render(df.iloc[first_rows]).to_numpy())
+    return pd.Categorical.from_codes(rendered.codes[codes], categories=rendered.categories)
+
+def _add_labels(df, label_col, id_col, labels, render):
+    """
+    Add label_col according to the `labels` option of the ID functions.
+    """
+    if labels == 'categorical':
+        df[label_col] = _labels_by_id(df, id_col, render)
+    elif labels == 'string':
+        df[label_col] = render(df)
+    elif labels is not None:
+        raise ValueError(f"Unknown labels option: {labels!r} (expected 'categorical', 'string' or None)")
+
 def create_team_match_id(df, date_col='Date_fixed', division_col='Division', 
-                         home_col='Home Team', away_col='Away Team'):
+                         home_col='Home Team', away_col='Away Team', id_method='sequential',
+                         labels='categorical'):
     """
     Create temp_team_match_id (shared across all matches in a team match)
     and a readable team_match_id_label.
+
+    id_method='hash' gives IDs that stay the same between runs (see assign_group_ids).
+    labels controls team_match_id_label:
+        'categorical' - one label per ID, stored as a Categorical (default)
+        'string'      - a plain string per row
+        None          - skipped; use render_team_match_labels when needed
     
     Returns:
         DataFrame with new columns added.
     """
-    df = df.copy()
-
-    # Step 1: Sort by match date to keep IDs sequential
-    df = df.sort_values(by=[date_col, division_col, home_col, away_col]).reset_index(drop=True)
+    key_cols = [date_col, division_col, home_col, away_col]
 
-    # Step 2: Group rows by team match (Date + Division + Home + Away)
-    team_keys = df[[date_col, division_col, home_col, away_col]].astype(str)
+    # Step 1: Sort by match date to keep IDs sequential (sort_values returns a new frame)
+    df = df.sort_values(by=key_cols).reset_index(drop=True)
 
-    # Step 3: Create group ID (simple increasing ID)
-    df['temp_team_match_id'] = (
-        team_keys
-        .drop_duplicates()
-        .reset_index(drop=True)
-        .reset_index()  # this gives a sequential ID
-        .merge(team_keys, on=[date_col, division_col, home_col, away_col], how='right')
-        .sort_index()['index'] + 1  # start IDs from 1
-    )
+    # Step 2 + 3: One ID per team match (Date + Division + Home + Away)
+    df['temp_team_match_id'] = assign_group_ids(df, key_cols, id_method=id_method)
 
     # Step 4: Create readable team_match_id_label
-    df['team_match_id_label'] = (
-        df[date_col].dt.strftime('%Y-%m-%d') + ' ' +
-        df[division_col].astype(str) + ' ' +
-        df[home_col].astype(str) + ' vs ' +
-        df[away_col].astype(str)
+    _add_labels(
+        df, 'team_match_id_label', 'temp_team_match_id', labels,
+        lambda rows: render_team_match_labels(rows, date_col, division_col, home_col, away_col)
     )
 
     return df
@@ -128,60 +356,408 @@ def create_match_id(df,
                     home_p1_col='Home Player 1',
                     home_p2_col='Home Player 2',
                     away_p1_col='Away Player 1',
-                    away_p2_col='Away Player 2'):
+                    away_p2_col='Away Player 2',
+                    id_method='sequential',
+                    labels='categorical',
+                    label_col='match_id_label'):
     """
     Create temp_match_id for individual matches (including players and line),
-    and a readable temp_match_id_label.
+    and a readable label (label_col, default match_id_label).
+
+    id_method='hash' gives IDs that stay the same between runs (see assign_group_ids).
+    labels works as in create_team_match_id (see render_match_labels).
     
     Returns:
         DataFrame with new columns added.
     """
-    
-    # Map line numbers to line names
-    line_mapping = {
-            1: "Ladies",
-            2: "Mixed 1",
-            3: "Mixed 2",
-            4: "Mens",
-            5: "Open 1",
-            6: "Open 2"
-        }
-
-    df['Line_label'] = df[line_col].map(line_mapping)
+    key_cols = [date_col, division_col, home_col, away_col, line_col, home_p1_col, home_p2_col, away_p1_col, away_p2_col]
 
-    df = df.copy()
+    # Step 1: Sort by match key columns (sort_values returns a new frame)
+    df = df.sort_values(by=key_cols).reset_index(drop=True)
 
-    # Step 1: Sort by match key columns
-    df = df.sort_values(
-        by=[date_col, division_col, home_col, away_col, line_col, home_p1_col, home_p2_col, away_p1_col, away_p2_col]
-    ).reset_index(drop=True)
-
-    # Step 2: Build a unique grouping key
-    match_keys = df[[date_col, division_col, home_col, away_col, line_col, home_p1_col, home_p2_col, away_p1_col, away_p2_col]].astype(str)
-
-    # Step 3: Create group ID (simple increasing ID)
-    df['temp_match_id'] = (
-        match_keys
-        .drop_duplicates()
-        .reset_index(drop=True)
-        .reset_index()
-        .merge(match_keys, on=[date_col, division_col, home_col, away_col, line_col, home_p1_col, home_p2_col, away_p1_col, away_p2_col], how='right')
-        .sort_index()['index'] + 1
-    )
+    df['Line_label'] = pd.Categorical(df[line_col].map(LINE_LABELS), categories=list(LINE_LABELS.values()))
+
+    # Step 2 + 3: One ID per individual match
+    df['temp_match_id'] = assign_group_ids(df, key_cols, id_method=id_method)
 
     # Step 4: Create a readable label
-    df['match_id_label'] = (
-        df[date_col].dt.strftime('%Y-%m-%d') + ' ' +
-        df[division_col].astype(str) + ' ' +
-        df[home_col].astype(str) + ' vs ' +
-        df[away_col].astype(str) + ' (' +
-        df[line_col].astype(str) + ' - ' +
-        df['Line_label'].astype(str) + ')' + ' - ' +
-        df[home_p1_col].astype(str) + ' & ' +
-        df[home_p2_col].astype(str) + ' vs ' +
-        df[away_p1_col].astype(str) + ' & ' +
-        df[away_p2_col].astype(str)
+    _add_labels(
+        df, label_col, 'temp_match_id', labels,
+        lambda rows: render_match_labels(rows, *key_cols)
     )
     
     return df
 
+
+# --- Player name resolution ---
+
+# Player name and ID columns in match rows
+PLAYER_COLUMNS = [
+    ('Home Player 1', 'Home ID 1'),
+    ('Home Player 2', 'Home ID 2'),
+    ('Away Player 1', 'Away ID 1'),
+    ('Away Player 2', 'Away ID 2'),
+]
+
+DEFAULT_ALIASES_PATH = 'data/cleaned/player_aliases.csv'
+ALIAS_COLUMNS = ['name', 'canonical', 'display_name', 'player_id', 'player_ids', 'score', 'source', 'resolved_at']
+
+# Minimum rapidfuzz token_sort_ratio for two names in the same block to be merged
+NAME_MATCH_THRESHOLD = 90
+
+# First names at least this long may differ slightly (fuzz.ratio >= FIRST_NAME_THRESHOLD)
+FUZZY_FIRST_NAME_LENGTH = 6
+FIRST_NAME_THRESHOLD = 80
+
+SOUNDEX_CODES = {
+    letter: digit
+    for digit, letters in {'1': 'bfpv', '2': 'cgjkqsxz', '3': 'dt', '4': 'l', '5': 'mn', '6': 'r'}.items()
+    for letter in letters
+}
+
+def normalize_player_name(name):
+    """
+    Comparable form of a player name: lowercase ASCII letters and single spaces,
+    'Last, First' turned into 'first last'. None for missing or empty names.
+    """
+    if name is None or pd.isna(name):
+        return None
+    name = str(name)
+    if name.count(',') == 1:
+        last, first = name.split(',')
+        name = f'{first} {last}'
+    name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode().lower()
+    name = re.sub(r"['.]", '', name)
+    name = ' '.join(re.sub(r'[^a-z]+', ' ', name).split())
+    return name or None
+
+@lru_cache(maxsize=None)
+def soundex(word):
+    """
+    American Soundex code of a word ('Robert' and 'Rupert' -> 'R163').
+    """
+    word = ''.join(c for c in word.lower() if c.isalpha())
+    if not word:
+        return ''
+    code, last = word[0].upper(), SOUNDEX_CODES.get(word[0], '')
+    for c in word[1:]:
+        digit = SOUNDEX_CODES.get(c, '')
+        if digit and digit != last:
+            code += digit
+        if c not in 'hw':
+            last = digit
+    return (code + '000')[:4]
+
+def name_block_key(name, method='soundex'):
+    """
+    Blocking key from a normalized name's surname (last word):
+    its Soundex code ('soundex') or first letter ('initial').
+    """
+    surname = name.split()[-1]
+    if method == 'soundex':
+        return soundex(surname)
+    elif method == 'initial':
+        return surname[0]
+    else:
+        raise ValueError(f"Unknown block method: {method!r} (expected 'soundex' or 'initial')")
+
+def _clean_id(value):
+    if value is None or pd.isna(value):
+        return None
+    value = str(value).strip()
+    return value if value not in ('', 'N/A') else None
+
+def _clean_ids(series):
+    return map_unique(series, _clean_id)
+
+def _player_name_rows(df, group_col):
+    """
+    One row per filled player slot: raw name, normalized name, ID, group, season, team match.
+    """
+    n = len(df)
+    seasons = pd.to_numeric(df['Season'], errors='coerce').to_numpy() if 'Season' in df.columns else np.full(n, np.nan)
+    team_matches = df['temp_team_match_id'].to_numpy() if 'temp_team_match_id' in df.columns else np.full(n, np.nan)
+    long = pd.concat([
+        pd.DataFrame({
+            'raw': df[name_col].astype('object').to_numpy(),
+            'id': _clean_ids(df[id_col]).to_numpy() if id_col in df.columns else np.nan,
+            'group': df[group_col].astype('object').to_numpy() if group_col else '',
+            'season': seasons,
+            'team_match': team_matches,
+        })
+        for name_col, id_col in PLAYER_COLUMNS
+        if name_col in df.columns
+    ], ignore_index=True)
+    long['name'] = map_unique(long['raw'], normalize_player_name)
+    return long.dropna(subset=['name'])
+
+def _sets_by(long, key, value):
+    """
+    {key: frozenset of the value column's values seen with it}
+    """
+    rows = long[[key, value]].dropna().drop_duplicates()
+    if not len(rows):
+        return {}
+    codes, uniques = pd.factorize(rows[key])
+    order = np.argsort(codes, kind='stable')
+    values = rows[value].to_numpy(dtype=object)[order]
+    bounds = np.flatnonzero(np.diff(codes[order])) + 1
+    return dict(zip(uniques.tolist(), map(frozenset, np.split(values, bounds))))
+
+def player_name_records(df, group_col='Division'):
+    """
+    Every distinct normalized player name in the match rows.
+
+    Returns:
+        pandas DataFrame indexed by name: raw (most used spelling), rows, and
+        frozensets of the ids, groups (group_col values) and team_matches it appears in
+    """
+    return _name_records(_player_name_rows(df, group_col))
+
+def _name_records(long):
+    spellings = long.groupby(['name', 'raw']).size().sort_values(ascending=False, kind='stable')
+    raw = spellings.reset_index().drop_duplicates('name').set_index('name')['raw']
+
+    records = pd.DataFrame({'raw': raw, 'rows': long.groupby('name').size()})
+    for column, value in [('ids', 'id'), ('groups', 'group'), ('team_matches', 'team_match')]:
+        sets = _sets_by(long, 'name', value)
+        records[column] = [sets.get(name, frozenset()) for name in records.index]
+    return records
+
+def _names_compatible(a, b):
+    """
+    Whether two normalized names can be spellings of one name: surnames with the
+    same Soundex code, and first names that are equal, a prefix of one another
+    (Jon / Jonathan), or both long and close (Jonathan / Jonathon). Short first
+    names that differ (John / Joan) are different people.
+    """
+    first_a, last_a = a.split()[0], a.split()[-1]
+    first_b, last_b = b.split()[0], b.split()[-1]
+    if soundex(last_a) != soundex(last_b):
+        return False
+    if first_a.startswith(first_b) or first_b.startswith(first_a):
+        return True
+    return (min(len(first_a), len(first_b)) >= FUZZY_FIRST_NAME_LENGTH
+            and fuzz.ratio(first_a, first_b) >= FIRST_NAME_THRESHOLD)
+
+def resolve_player_names(df, aliases=None, threshold=NAME_MATCH_THRESHOLD, block_method='soundex',
+                         group_col='Division', workers=-1):
+    """
+    Group the name variants of each player and return the updated alias table.
+
+    Names are only compared within blocks: the same group_col value (e.g.
+    Division) and the same surname key (see name_block_key). Each block is
+    scored with rapidfuzz process.cdist (token_sort_ratio) on `workers` threads;
+    pairs scoring at least `threshold` whose names are compatible (see
+    _names_compatible) are merged with union-find, best score first.
+
+    Names seen with the same player ID are always merged. Two groups are never
+    merged if they played in the same team match, or hold different IDs seen
+    in the same season: different IDs that never overlap are taken to be one
+    player whose ID changed, and player_id is then the most recent one.
+
+    Decisions in `aliases` are kept: known names stay with their canonical
+    name, a new name can't join two groups with different canonical names, and
+    only pairs involving a new name are scored, so later runs only pay for new
+    names. Edit a row's canonical to override it.
+
+    Parameters:
+        df (DataFrame): cleaned match rows (the whole archive)
+        aliases (DataFrame, optional): previous alias table (load_player_aliases)
+
+    Returns:
+        pandas DataFrame: one row per normalized name (ALIAS_COLUMNS)
+    """
+    long = _player_name_rows(df, group_col)
+    records = _name_records(long)
+    raw, n_rows = records['raw'].to_dict(), records['rows'].to_dict()
+    record_ids, record_team_matches = records['ids'].to_dict(), records['team_matches'].to_dict()
+    id_seasons = _sets_by(long, 'id', 'season')
+    id_recency = {
+        player_id: (max(id_seasons.get(player_id, [-1])), rows)
+        for player_id, rows in long.dropna(subset=['id']).groupby('id').size().items()
+    }
+
+    previous = (
+        aliases.set_index('name') if aliases is not None and len(aliases)
+        else pd.DataFrame(columns=ALIAS_COLUMNS).set_index('name')
+    )
+    previous_canonical = previous['canonical'].to_dict()
+    previous_rows = previous[['display_name', 'score', 'source', 'resolved_at']].to_dict('index')
+    names = sorted(set(raw) | set(previous_canonical))
+    is_new = {name: name not in previous_canonical for name in names}
+    ids = {name: record_ids.get(name, frozenset()) for name in names}
+    if 'player_ids' in previous.columns:
+        for name, known in previous['player_ids'].dropna().items():
+            ids[name] = ids[name] | frozenset(known.split('|'))
+
+    # -- Union-find, tracking each group's IDs, team matches and previous canonical --
+    parent = {name: name for name in names}
+    group_ids = dict(ids)
+    group_team_matches = {name: record_team_matches.get(name, frozenset()) for name in names}
+    group_canonical = {name: previous_canonical.get(name) for name in names}
+
+    def find(name):
+        while parent[name] != name:
+            parent[name] = parent[parent[name]]
+            name = parent[name]
+        return name
+
+    def ids_overlap(ids_a, ids_b):
+        return any(
+            id_seasons.get(a, frozenset()) & id_seasons.get(b, frozenset())
+            for a in ids_a - ids_b for b in ids_b - ids_a
+        )
+
+    def union(a, b, check=True):
+        root_a, root_b = find(a), find(b)
+        if root_a == root_b:
+            return False
+        canonical_a, canonical_b = group_canonical[root_a], group_canonical[root_b]
+        if canonical_a and canonical_b and canonical_a != canonical_b:
+            return False  # never merge two earlier decisions
+        if check and (group_team_matches[root_a] & group_team_matches[root_b]
+                      or ids_overlap(group_ids[root_a], group_ids[root_b])):
+            return False  # two different players
+        parent[root_b] = root_a
+        group_ids[root_a] = group_ids[root_a] | group_ids.pop(root_b)
+        group_team_matches[root_a] = group_team_matches[root_a] | group_team_matches.pop(root_b)
+        group_canonical[root_a] = canonical_a or canonical_b
+        return True
+
+    for name, canonical in previous_canonical.items():
+        if canonical in parent:
+            union(canonical, name, check=False)
+
+    joined = {}  # new name -> (score, source)
+
+    # Names sharing a player ID
+    by_id = {}
+    for name in names:
+        for player_id in ids[name]:
+            by_id.setdefault(player_id, []).append(name)
+    for members in by_id.values():
+        for name in members[1:]:
+            if (is_new[name] or is_new[members[0]]) and union(members[0], name, check=False):
+                for n in (name, members[0]):
+                    if is_new[n]:
+                        joined[n] = (100.0, 'id')
+
+    # Fuzzy matches within blocks
+    blocks = {}
+    for name, groups in records['groups'].to_dict().items():
+        key = name_block_key(name, block_method)
+        for group in groups or ['']:
+            blocks.setdefault((group, key), []).append(name)
+
+    edges = []
+    for members in blocks.values():
+        new = [name for name in members if is_new[name]]
+        if not new or len(members) < 2:
+            continue
+        scores = process.cdist(new, members, scorer=fuzz.token_sort_ratio,
+                               score_cutoff=threshold, workers=workers, dtype=np.uint8)
+        for i, j in zip(*np.nonzero(scores)):
+            if new[i] != members[j] and _names_compatible(new[i], members[j]):
+                edges.append((int(scores[i, j]), new[i], members[j]))
+
+    for score, a, b in sorted(set(edges), key=lambda e: (-e[0], e[1], e[2])):
+        if union(a, b):
+            for n in (a, b):
+                if is_new[n] and n not in joined:
+                    joined[n] = (float(score), 'fuzzy')
+
+    # -- Canonical name and player ID per group --
+    members_of = {}
+    for name in names:
+        members_of.setdefault(find(name), []).append(name)
+
+    now = pd.Timestamp.now().isoformat(timespec='seconds')
+    rows = []
+    for root, members in members_of.items():
+        if group_canonical[root]:
+            canonical = group_canonical[root]
+        else:
+            canonical = max(members, key=lambda n: (n_rows.get(n, 0), len(n), n))
+        display_name = raw[canonical] if canonical in raw else previous_rows.get(canonical, {}).get('display_name', canonical)
+        root_ids = group_ids[root]
+        # An ambiguous group (IDs that overlap in time) gets no player_id
+        player_id = None
+        if root_ids and not any(ids_overlap({a}, {b}) for a in root_ids for b in root_ids if a < b):
+            player_id = max(root_ids, key=lambda i: (id_recency.get(i, (-1, 0)), i))
+
+        for name in members:
+            if not is_new[name]:
+                row = previous_rows[name]
+                score, source, resolved_at = row['score'], row['source'], row['resolved_at']
+            else:
+                score, source = joined.get(name, (100.0, 'self'))
+                resolved_at = now
+            rows.append({'name': name, 'canonical': canonical, 'display_name': display_name,
+                         'player_id': player_id, 'player_ids': '|'.join(sorted(root_ids)) or None,
+                         'score': score, 'source': source, 'resolved_at': resolved_at})
+
+    return pd.DataFrame(rows, columns=ALIAS_COLUMNS).sort_values('name').reset_index(drop=True)
+
+def apply_player_aliases(df, aliases):
+    """
+    Replace every player name with its group's canonical display name, and set
+    the group's player_id on rows with no ID or with one of the group's older IDs.
+
+    Returns:
+        A copy of df.
+    """
+    display = dict(zip(aliases['name'], aliases['display_name']))
+    known = aliases.dropna(subset=['player_id'])
+    group_id = dict(zip(known['name'], known['player_id']))
+    group_ids = {
+        name: set(ids.split('|')) if isinstance(ids, str) else set()
+        for name, ids in zip(known['name'], known['player_ids'])
+    }
+
+    df = df.copy()
+    for name_col, id_col in PLAYER_COLUMNS:
+        if name_col not in df.columns:
+            continue
+        normalized = map_unique(df[name_col], normalize_player_name)
+        resolved = normalized.map(display)
+        df[name_col] = resolved.where(resolved.notna(), df[name_col].astype('object'))
+        if id_col in df.columns:
+            ids = _clean_ids(df[id_col])
+            replace = np.array([
+                name in group_id and (pd.isna(player_id) or player_id in group_ids[name])
+                for name, player_id in zip(normalized, ids)
+            ], dtype=bool)
+            df[id_col] = df[id_col].astype('object')
+            df.loc[replace, id_col] = normalized[replace].map(group_id)
+    return df
+
+def load_player_aliases(path=DEFAULT_ALIASES_PATH):
+    """
+    Load the alias table, or an empty one if it doesn't exist yet.
+    """
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=ALIAS_COLUMNS)
+    text_cols = ['name', 'canonical', 'display_name', 'player_id', 'player_ids', 'source', 'resolved_at']
+    return pd.read_csv(path, dtype={col: 'object' for col in text_cols})
+
+def update_player_aliases(df, path=DEFAULT_ALIASES_PATH, **kwargs):
+    """
+    resolve_player_names against the saved alias table, then save the result
+    (temp file + rename). kwargs go to resolve_player_names.
+
+    Returns:
+        pandas DataFrame: the updated alias table
+    """
+    previous = load_player_aliases(path)
+    aliases = resolve_player_names(df, aliases=previous, **kwargs)
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    aliases.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+    merged = (aliases['name'] != aliases['canonical']).sum()
+    print(f"🔗 {len(aliases) - len(previous)} new names; {merged} of {len(aliases)} names "
+          f"are variants of {aliases['canonical'].nunique()} players → {path}")
+    return aliases
@@ -0,0 +1,196 @@
+# scripts/page_readiness.py
+"""
+Condition-based page readiness and per-step latency instrumentation for the scrapers.
+
+Instead of fixed time.sleep calls, wait for concrete DOM conditions (e.g. the
+div.match_results_table blocks are present and their count has stopped
+changing), with timeouts. Every navigation step is timed into a
+LatencyRecorder so a run can report where scrape time goes.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+DEFAULT_TIMEOUT = 10
+POLL_INTERVAL = 0.2
+
+# Histogram bin edges in seconds
+LATENCY_BINS = [0, 0.25, 0.5, 1, 2, 3, 5, 10, np.inf]
+
+# Text the Matches tab shows for a division with no matches yet
+NO_MATCHES_XPATH = (
+    "//*[contains(translate(normalize-space(text()), 'NOMATCHES', 'nomatches'), 'no matches')]"
+)
+
+# Returned by elements_stable when the empty-page marker is showing (truthy, so the wait stops)
+EMPTY_PAGE = "empty page"
+
+
+# -- Latency recording --
+class LatencyRecorder:
+    """
+    Thread-safe record of how long each named scrape step took.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = []
+
+    def record(self, step, seconds):
+        with self._lock:
+            self._samples.append((step, seconds))
+
+    @contextmanager
+    def time(self, step):
+        """
+        Time a block: `with recorder.time("open_matches"): ...`
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(step, time.perf_counter() - start)
+
+    def reset(self):
+        with self._lock:
+            self._samples = []
+
+    def samples(self):
+        """
+        All recorded samples as a DataFrame with columns step, seconds.
+        """
+        with self._lock:
+            return pd.DataFrame(self._samples, columns=["step", "seconds"])
+
+    def summary(self):
+        """
+        Per-step count, total, mean, p50, p95 and max seconds.
+        """
+        grouped = self.samples().groupby("step")["seconds"]
+        return pd.DataFrame({
+            "count": grouped.count(),
+            "total": grouped.sum(),
+            "mean": grouped.mean(),
+            "p50": grouped.quantile(0.5),
+            "p95": grouped.quantile(0.95),
+            "max": grouped.max(),
+        }).sort_values("total", ascending=False)
+
+    def histogram(self, bins=LATENCY_BINS):
+        """
+        Per-step counts of samples in each latency bin (rows: steps, columns: bins).
+        """
+        df = self.samples()
+        df["bin"] = pd.cut(df["seconds"], bins=bins, right=False)
+        return df.groupby(["step", "bin"], observed=False).size().unstack(fill_value=0)
+
+    def report(self):
+        """
+        Print the summary and histogram for this run.
+        """
+        if self.samples().empty:
+            print("⏱️  No scrape steps recorded.")
+            return
+        print("⏱️  Scrape step latency (seconds):")
+        print(self.summary().round(3))
+        print("\n📊 Latency histogram:")
+        print(self.histogram())
+
+
+# Default recorder shared by the scraper functions
+latency = LatencyRecorder()
+
+
+# -- Wait conditions --
+class elements_stable:
+    """
+    Expected condition: at least min_count elements match the locator and the
+    count has not changed over `polls` consecutive checks. Returns the elements,
+    or EMPTY_PAGE if none match and the empty_locator marker is on the page.
+    """
+
+    def __init__(self, locator, min_count=1, polls=2, empty_locator=None):
+        self.locator = locator
+        self.min_count = min_count
+        self.polls = polls
+        self.empty_locator = empty_locator
+        self._last_count = None
+        self._unchanged = 0
+
+    def __call__(self, driver):
+        elements = driver.find_elements(*self.locator)
+        count = len(elements)
+
+        if count == 0 and self.empty_locator and driver.find_elements(*self.empty_locator):
+            return EMPTY_PAGE
+
+        if count == self._last_count:
+            self._unchanged += 1
+        else:
+            self._last_count = count
+            self._unchanged = 0
+
+        if count >= self.min_count and self._unchanged >= self.polls - 1:
+            return elements
+        return False
+
+def wait_for_stable(driver, css_selector, timeout=DEFAULT_TIMEOUT, min_count=1, polls=2, poll_interval=POLL_INTERVAL,
+                    empty_xpath=None):
+    """
+    Wait until elements matching css_selector are present and their count is stable.
+    If empty_xpath is given and matches while no elements do (e.g. NO_MATCHES_XPATH),
+    the page is taken as empty straight away instead of waiting for the timeout.
+
+    Returns:
+        list: the elements, or [] if the page is empty
+
+    Raises:
+        TimeoutException: if the page is neither ready nor empty within the timeout
+                          (so a half-loaded page is never scraped)
+    """
+    empty_locator = (By.XPATH, empty_xpath) if empty_xpath else None
+    try:
+        elements = WebDriverWait(driver, timeout, poll_frequency=poll_interval).until(
+            elements_stable((By.CSS_SELECTOR, css_selector), min_count=min_count, polls=polls,
+                            empty_locator=empty_locator)
+        )
+    except TimeoutException:
+        raise TimeoutException(f"Timed out after {timeout}s waiting for {css_selector}") from None
+    return [] if elements is EMPTY_PAGE else elements
+
+def wait_for_navigation(driver, old_element, timeout=5):
+    """
+    Wait for old_element (taken before a click/select) to go stale, i.e. the page was replaced.
+
+    Returns:
+        bool: True if the page changed within the timeout
+    """
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=POLL_INTERVAL).until(EC.staleness_of(old_element))
+        return True
+    except TimeoutException:
+        return False
+
+def require_navigation(driver, old_element, step, timeout=5):
+    """
+    wait_for_navigation, raising TimeoutException if the page did not change
+    (so the old page is never scraped as if it were the new one).
+    """
+    if not wait_for_navigation(driver, old_element, timeout=timeout):
+        raise TimeoutException(f"Page did not change within {timeout}s after {step}")
+
+def wait_for_options(driver, select_id, min_options=2, timeout=DEFAULT_TIMEOUT):
+    """
+    Wait until the <select> with select_id has at least min_options options.
+    """
+    return WebDriverWait(driver, timeout, poll_frequency=POLL_INTERVAL).until(
+        lambda d: len(d.find_elements(By.CSS_SELECTOR, f"#{select_id} option")) >= min_options
+    )
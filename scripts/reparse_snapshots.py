@@ -0,0 +1,84 @@
+# scripts/reparse_snapshots.py
+"""
+Rebuild match and roster outputs from saved HTML snapshots — no browser, no network.
+
+After fixing a bug in extract_all_matches or parse_roster_html, run:
+
+    python -m scripts.reparse_snapshots            # every season
+    python -m scripts.reparse_snapshots 2024       # one season
+
+Outputs are written exactly where the scrapers write them (data/raw match CSVs,
+data/processed roster tables, and optionally the Parquet match store).
+"""
+
+import os
+import sys
+
+import pandas as pd
+
+from scripts.match_store import write_matches
+from scripts.scraper_utils import (
+    extract_all_matches_lxml,
+    parse_roster_html,
+    clean_filename,
+    write_csv_atomic
+    )
+from scripts.roster_store import rebuild_roster_table
+from scripts.snapshot_store import DEFAULT_SNAPSHOT_PATH, list_snapshots, load_snapshot
+
+
+def reparse_matches(root=DEFAULT_SNAPSHOT_PATH, output_dir="data/raw", store_path=None, season=None):
+    """
+    Re-run match extraction (the lxml engine, same records as extract_all_matches)
+    over the latest snapshot of every division page.
+
+    Returns:
+        int: number of matches written
+    """
+    snapshots = list_snapshots(root, kind="matches", season=season)
+    total = 0
+
+    for snap in snapshots.itertuples(index=False):
+        matches = extract_all_matches_lxml(load_snapshot(snap.sha256, root), snap.season, snap.division)
+        if not matches:
+            continue
+
+        df = pd.DataFrame(matches)
+        filename = os.path.join(output_dir, f"ic_mixed_matches_{clean_filename(snap.season)}_{clean_filename(snap.division)}.csv")
+        write_csv_atomic(df, filename)
+        if store_path:
+            write_matches(df, store_path)
+        total += len(df)
+
+    print(f"✅ Reparsed {len(snapshots)} division pages → {total} matches")
+    return total
+
+
+def reparse_rosters(root=DEFAULT_SNAPSHOT_PATH, output_dir="data/processed", season=None):
+    """
+    Re-run parse_roster_html over the latest snapshot of every team roster page
+    and rewrite each season's roster table and fingerprints (see rebuild_roster_table).
+
+    Returns:
+        int: number of players written
+    """
+    snapshots = list_snapshots(root, kind="roster", season=season)
+    total = 0
+
+    for snap_season, season_snapshots in snapshots.groupby("season", sort=True):
+        rosters = {
+            (snap.division, snap.team, snap.team_id):
+                parse_roster_html(load_snapshot(snap.sha256, root), snap.team, snap.team_id)
+            for snap in season_snapshots.itertuples(index=False)
+        }
+        rebuild_roster_table(rosters, snap_season, output_dir=output_dir)
+        total += sum(len(players) for players in rosters.values())
+
+    print(f"✅ Reparsed {len(snapshots)} roster pages → {total} players")
+    return total
+
+
+if __name__ == "__main__":
+    season = sys.argv[1] if len(sys.argv) > 1 else None
+    reparse_matches(season=season, store_path="data/matches")
+    reparse_rosters(season=season)
@@ -0,0 +1,282 @@
+# scripts/roster_store.py
+"""
+One consolidated, typed roster table per season.
+
+Rosters from every team are kept in a single Parquet file,
+data/processed/ic_mixed_roster_<season>.parquet, instead of one small CSV per team.
+
+Weekly refreshes go through update_roster_table: each team's roster is
+fingerprinted (SHA-256 of its normalized rows) in roster_fingerprints_<season>.json,
+unchanged teams are skipped, the table is only rewritten when some team changed,
+and added / removed / modified players are appended to roster_changes_<season>.csv.
+"""
+
+import hashlib
+import json
+import os
+import re
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+ROSTER_COLUMNS = ["Season", "Division", "Team", "Team ID", "Name", "Suffix", "ID", "Role"]
+
+# Low-cardinality columns stored as categoricals
+CATEGORY_COLUMNS = ["Season", "Division", "Team", "Team ID", "Role"]
+
+# team_roster_table fields that make up a team's fingerprint
+FINGERPRINT_COLUMNS = ["Name", "Suffix", "ID", "Role"]
+
+CHANGE_COLUMNS = ["detected_at", "Season", "Division", "Team", "Team ID", "change", "Name", "ID", "Role"]
+
+
+def team_key(division, team, team_id):
+    """
+    Key a team by its Team ID, or by (Division, Team) when the ID is missing or 'N/A'.
+    """
+    team_id = _normalize(team_id)
+    if team_id and team_id != "N/A":
+        return team_id
+    return f"{_normalize(division)} / {_normalize(team)}"
+
+def _team_keys(df):
+    return pd.Series(
+        [team_key(*row) for row in zip(df["Division"], df["Team"], df["Team ID"])],
+        index=df.index, dtype="object",
+    )
+
+
+def roster_path(season, output_dir="data/processed"):
+    return os.path.join(output_dir, f"ic_mixed_roster_{season}.parquet")
+
+def fingerprints_path(season, output_dir="data/processed"):
+    return os.path.join(output_dir, f"roster_fingerprints_{season}.json")
+
+def changes_path(season, output_dir="data/processed"):
+    return os.path.join(output_dir, f"roster_changes_{season}.csv")
+
+
+def roster_table(players, season):
+    """
+    Build the typed roster table from scrape_roster_page / parse_roster_html records.
+
+    Returns:
+        pandas DataFrame with ROSTER_COLUMNS
+    """
+    df = pd.DataFrame(players, columns=[c for c in ROSTER_COLUMNS if c != "Season"])
+    df.insert(0, "Season", str(season))
+
+    for col in ROSTER_COLUMNS:
+        if col in CATEGORY_COLUMNS:
+            # Mask missing values: astype("str") turns None into "None" on pandas 2
+            df[col] = df[col].astype("str").where(df[col].notna()).astype("category")
+        else:
+            df[col] = df[col].astype("string")
+
+    return df[ROSTER_COLUMNS]
+
+
+def write_roster_table(df, season, output_dir="data/processed"):
+    """
+    Write a season's roster table atomically.
+
+    Returns:
+        str: path written
+    """
+    path = roster_path(season, output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_roster_table(season, output_dir="data/processed", columns=None):
+    """
+    Load a season's roster table, or None if it hasn't been scraped.
+    """
+    path = roster_path(season, output_dir)
+    if not os.path.exists(path):
+        return None
+    return pd.read_parquet(path, columns=columns)
+
+
+# -- Change detection --
+def _normalize(value):
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return ""
+    return re.sub(r"\s+", " ", str(value)).strip()
+
+def roster_fingerprint(players):
+    """
+    SHA-256 of a team's roster rows, independent of row order and whitespace.
+
+    Parameters:
+        players (list): dicts (or rows) with FINGERPRINT_COLUMNS
+    """
+    rows = sorted(
+        "\x1f".join(_normalize(player[col]) for col in FINGERPRINT_COLUMNS)
+        for player in players
+    )
+    return hashlib.sha256("\x1e".join(rows).encode("utf-8")).hexdigest()
+
+def _player_key(df):
+    # Player ID, falling back to the name for rows without one
+    ids = df["ID"].astype("str").where(df["ID"].notna(), "")
+    names = df["Name"].astype("str").where(df["Name"].notna(), "")
+    return ids.where(ids != "", "name:" + names)
+
+def _fingerprint_rows(df):
+    # Each row's FINGERPRINT_COLUMNS, normalized as in roster_fingerprint
+    return pd.Series(
+        ["\x1f".join(_normalize(v) for v in row) for row in zip(*(df[c] for c in FINGERPRINT_COLUMNS))],
+        index=df.index, dtype="object",
+    )
+
+def diff_team_roster(old, new):
+    """
+    Players added to, removed from and modified on one team.
+
+    A player is modified when they are on both rosters but a fingerprinted
+    field (name, suffix or role, e.g. a new captain) changed.
+
+    Parameters:
+        old, new (DataFrame): that team's rows before and after (roster_table columns)
+
+    Returns:
+        DataFrame: the added, removed and modified (new values) rows, with a 'change' column
+    """
+    old_keys = _player_key(old)
+    new_keys = _player_key(new)
+    added = new[~new_keys.isin(old_keys)].assign(change="added")
+    removed = old[~old_keys.isin(new_keys)].assign(change="removed")
+
+    old_rows = dict(zip(old_keys, _fingerprint_rows(old)))
+    kept = new_keys.isin(old_keys)
+    differs = np.array(
+        [old_rows[key] != row for key, row in zip(new_keys[kept], _fingerprint_rows(new[kept]))], dtype=bool
+    )
+    modified = new[kept][differs].assign(change="modified")
+    return pd.concat([added, removed, modified], ignore_index=True)
+
+def _load_fingerprints(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def _save_fingerprints(fingerprints, path):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(fingerprints, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def _append_changes(changes, path):
+    changes = changes.reindex(columns=CHANGE_COLUMNS)
+    changes.to_csv(path, mode="a", header=not os.path.exists(path), index=False)
+
+def _key_rosters(rosters):
+    """
+    Re-key {team label: players} by team_key. Empty rosters are failed fetches,
+    not every player leaving: they are left out and their labels returned.
+    """
+    empty = [str(label) for label, players in rosters.items() if not players]
+    keyed = {
+        team_key(players[0]["Division"], players[0]["Team"], players[0]["Team ID"]): players
+        for players in rosters.values() if players
+    }
+    return keyed, empty
+
+def update_roster_table(rosters, season, output_dir="data/processed", detected_at=None):
+    """
+    Merge freshly scraped rosters into the season's roster table.
+
+    Teams whose fingerprint matches the last run are skipped. Teams missing from
+    `rosters` or with an empty roster (failed fetches) keep their previous rows.
+    The table is only rewritten when at least one team changed.
+
+    Parameters:
+        rosters (dict): {team label: list of player dicts} in team-list order; teams
+                        are keyed by their rows' team_key (Team ID, or Division / Team)
+        season: season label
+        detected_at (str, optional): timestamp for the change log (default: now, UTC)
+
+    Returns:
+        dict: changed (team keys), unchanged (count), empty (team labels skipped as
+              failed fetches), changes (DataFrame of added / removed / modified players),
+              path (table written, or None if nothing changed)
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    fp_path = fingerprints_path(season, output_dir)
+    previous = _load_fingerprints(fp_path)
+    old_table = read_roster_table(season, output_dir)
+    if old_table is None:
+        old_table = roster_table([], season)
+    old_keys = _team_keys(old_table)
+
+    rosters, empty = _key_rosters(rosters)
+
+    fingerprints = dict(previous)
+    changed = []
+    for key, players in rosters.items():
+        fingerprint = roster_fingerprint(players)
+        if previous.get(key) != fingerprint:
+            changed.append(key)
+        fingerprints[key] = fingerprint
+
+    new_table = roster_table(
+        [player for players in rosters.values() for player in players], season
+    )
+    new_keys = _team_keys(new_table)
+
+    changes = [
+        diff_team_roster(old_table[old_keys == key], new_table[new_keys == key])
+        for key in changed
+    ]
+    changes = (
+        pd.concat(changes, ignore_index=True)
+        if changes else pd.DataFrame(columns=ROSTER_COLUMNS + ["change"])
+    )
+    if not changes.empty:
+        changes.insert(0, "detected_at", detected_at or datetime.now(timezone.utc).isoformat())
+        _append_changes(changes, changes_path(season, output_dir))
+
+    path = None
+    if changed or not os.path.exists(roster_path(season, output_dir)):
+        kept = old_table[~old_keys.isin(list(rosters))]
+        merged = pd.concat(
+            [new_table.astype("object"), kept.astype("object")], ignore_index=True
+        )
+        path = write_roster_table(roster_table(merged.to_dict("records"), season), season, output_dir)
+        _save_fingerprints(fingerprints, fp_path)
+
+    return {
+        "changed": changed,
+        "unchanged": len(rosters) - len(changed),
+        "empty": empty,
+        "changes": changes,
+        "path": path,
+    }
+
+def rebuild_roster_table(rosters, season, output_dir="data/processed"):
+    """
+    Replace the season's roster table and fingerprints with `rosters`, without
+    logging changes (e.g. after reparsing snapshots with a fixed parser), so the
+    next update_roster_table compares against rows from the current parser.
+
+    Parameters:
+        rosters (dict): as for update_roster_table
+
+    Returns:
+        str: path written
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    rosters, _ = _key_rosters(rosters)
+    table = roster_table([player for players in rosters.values() for player in players], season)
+    path = write_roster_table(table, season, output_dir)
+    _save_fingerprints(
+        {key: roster_fingerprint(players) for key, players in rosters.items()},
+        fingerprints_path(season, output_dir),
+    )
+    return path
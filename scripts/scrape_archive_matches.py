@@ -27,4 +27,4 @@ if __name__ == "__main__":
     print("   4. Clicked on the 'Matches' tab")
     print()
     entry_url = input("🔗 Paste the Intercounty Matches URL you want to scrape: ").strip()
-    scrape_season_divisions(entry_url=entry_url)
+    scrape_season_divisions(entry_url=entry_url, store_path="data/matches", snapshot_root="data/snapshots")
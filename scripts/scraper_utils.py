@@ -1,10 +1,17 @@
 # scripts/scraper_utils.py
 
-import time
 import re
 import os
+import queue
+import threading
+import time
+from functools import lru_cache
+
+import numpy as np
 import pandas as pd
 from bs4 import BeautifulSoup
+from lxml import etree
+from lxml import html as lxml_html
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
@@ -15,19 +22,91 @@ from webdriver_manager.chrome import ChromeDriverManager
 from urllib.parse import urljoin, urlparse, parse_qs
 import base64
 
+from scripts.match_store import write_matches
+from scripts.roster_store import team_key, update_roster_table
+from scripts.http_fetch import HttpFetcher, discover_divisions, load_division_matches_http
+from scripts.snapshot_store import save_snapshot
+from scripts.page_readiness import (
+    NO_MATCHES_XPATH, latency, require_navigation, wait_for_options, wait_for_stable
+)
+
 def clean_filename(s):
     return re.sub(r"[^\w\-]", "-", s).strip("-").replace("--", "-")
 
+# -- Player IDs --
+# The same few thousand player links recur on every match and roster page, so
+# decoding is cached per href. IDs that can't be decoded are collected here and
+# reported once per run (report_malformed_player_ids) instead of passing silently.
+_malformed_ids = {}
+_malformed_lock = threading.Lock()
+
+def _record_malformed(href, reason):
+    with _malformed_lock:
+        _malformed_ids.setdefault(href, reason)
+
+@lru_cache(maxsize=65536)
 def decode_player_id(href):
+    """
+    Player ID from the base64 `p` parameter of a player link.
+
+    Returns the raw `p` value if it doesn't decode, and "N/A" if there is none;
+    both cases are recorded in malformed_player_ids().
+    """
     query = urlparse(href).query
     p_encoded = parse_qs(query).get("p")
     if p_encoded:
         try:
             return base64.b64decode(p_encoded[0]).decode("utf-8")
-        except Exception:
+        except Exception as e:
+            _record_malformed(href, f"undecodable p: {e}")
             return p_encoded[0]
+    _record_malformed(href, "no p parameter")
     return "N/A"
 
+def decode_player_ids(hrefs):
+    """
+    Decode many player links at once, decoding each distinct href only once.
+
+    Parameters:
+        hrefs: list or pandas Series of hrefs
+
+    Returns:
+        same type as hrefs (a Series keeps its index); missing hrefs give "N/A"
+    """
+    if isinstance(hrefs, pd.Series):
+        codes, uniques = pd.factorize(hrefs)
+        # Missing hrefs get code -1, which picks the trailing "N/A"
+        decoded = np.array([decode_player_id(href) for href in uniques] + ["N/A"], dtype=object)
+        return pd.Series(decoded[codes], index=hrefs.index, name=hrefs.name)
+
+    lookup = {href: decode_player_id(href) for href in set(hrefs) if not pd.isna(href)}
+    return [lookup.get(href, "N/A") for href in hrefs]
+
+def malformed_player_ids():
+    """
+    Player links seen so far whose ID couldn't be decoded.
+
+    Returns:
+        pandas DataFrame with columns href, reason
+    """
+    with _malformed_lock:
+        return pd.DataFrame(list(_malformed_ids.items()), columns=["href", "reason"])
+
+def clear_malformed_player_ids():
+    """
+    Forget recorded malformed IDs (and the decode cache, so they are reported again).
+    """
+    with _malformed_lock:
+        _malformed_ids.clear()
+    decode_player_id.cache_clear()
+
+def report_malformed_player_ids():
+    malformed = malformed_player_ids()
+    if malformed.empty:
+        return
+    print(f"⚠️  {len(malformed)} player links had no decodable ID:")
+    print(malformed.to_string(index=False))
+
 def extract_all_matches(html, season, division):
     soup = BeautifulSoup(html, "html.parser")
     fixtures = soup.select("div.match_results_table")
@@ -115,66 +194,407 @@ def extract_all_matches(html, season, division):
 
     return all_matches
 
-def scrape_season_divisions(entry_url):
-    options = Options()
-    options.add_argument("--headless=new")
-    options.add_argument("--disable-gpu")
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+# -- Fast lxml extraction engine --
+
+def _class_xpath(path, cls):
+    """
+    XPath step matching elements with a class token, like the CSS selector tag.cls.
+    """
+    return f"{path}[contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')]"
+
+_FIXTURES = etree.XPath("//" + _class_xpath("div", "match_results_table"))
+_MATCH_REST = etree.XPath("(.//" + _class_xpath("div", "match_rest") + ")[1]")
+_HOME_LINKS = etree.XPath(".//" + _class_xpath("div", "team_name") + "//a")
+_AWAY_LINKS = etree.XPath(".//" + _class_xpath("div", "team_name2") + "//a")
+_MATCH_BLOCKS = etree.XPath(".//" + _class_xpath("div", "match_results_content"))
+_HOME_WON = etree.XPath("(.//" + _class_xpath("div", "points") + "//img)[1]")
+_AWAY_WON = etree.XPath("(.//" + _class_xpath("div", "points2") + "//img)[1]")
+_SPANS = etree.XPath(".//span")
+
+def _bs4_string(el):
+    """
+    Emulate BeautifulSoup's Tag.string on an lxml element: the single string child
+    (recursing through a single child tag), or None.
+    """
+    nodes = []
+    if el.text:
+        nodes.append(el.text)
+    for child in el:
+        nodes.append(child)
+        if child.tail:
+            nodes.append(child.tail)
+
+    if len(nodes) != 1:
+        return None
+    node = nodes[0]
+    if isinstance(node, str):
+        return node
+    if not isinstance(node.tag, str):  # comment / processing instruction
+        return node.text
+    return _bs4_string(node)
+
+def _text(el):
+    return el.text_content().strip() if el is not None else "N/A"
+
+def _first(xpath, el):
+    found = xpath(el)
+    return found[0] if found else None
+
+def _href(a):
+    href = a.get("href")
+    if href is None:
+        raise KeyError("href")  # same failure as a['href'] in BeautifulSoup
+    return href
+
+def extract_all_matches_lxml(html, season, division):
+    """
+    Faster drop-in for extract_all_matches, returning exactly the same records.
+
+    Uses lxml's C parser and precompiled XPath queries that only visit the
+    div.match_results_table subtrees, instead of BeautifulSoup's html.parser
+    with per-block select/find calls.
+    """
+    if not html or not html.strip():
+        return []
+    root = lxml_html.document_fromstring(html)
+    all_matches = []
 
-    print("🌐 Loading provided URL...")
-    driver.get(entry_url)
+    for i, fixture in enumerate(_FIXTURES(root)):
+        date = _text(_first(_MATCH_REST, fixture))
 
-    try:
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "arch_season_list")))
-        season_dropdown = Select(driver.find_element(By.ID, "arch_season_list"))
-        season = season_dropdown.first_selected_option.text.strip()
-    except Exception as e:
-        print("❌ Could not determine season from the dropdown.")
-        driver.quit()
-        return
+        home_links = _HOME_LINKS(fixture)
+        home_team = home_links[0].text_content().strip() if home_links else "N/A"
 
-    os.makedirs("data/raw", exist_ok=True)
+        away_links = _AWAY_LINKS(fixture)
+        away_team = away_links[0].text_content().strip() if away_links else "N/A"
 
-    group_dropdown = Select(driver.find_element(By.ID, "divgs_list"))
-    group_dropdown.select_by_index(1)
-    time.sleep(2)
+        match_blocks = _MATCH_BLOCKS(fixture)[1:]
+        line_number = 1
 
-    division_select = Select(driver.find_element(By.ID, "divgs_div_list"))
-    division_options = [o.text.strip() for o in division_select.options if "Select" not in o.text]
+        for block in match_blocks:
+            try:
+                home_tags = _HOME_LINKS(block)
+                away_tags = _AWAY_LINKS(block)
 
-    print(f"📋 Found {len(division_options)} divisions to scrape for {season}")
+                home_names = [a.text_content().strip() for a in home_tags]
+                home_ids = [decode_player_id(_href(a)) for a in home_tags]
 
-    for division in division_options:
-        print(f"🔄 Scraping division: {division}")
-        try:
-            Select(driver.find_element(By.ID, "divgs_div_list")).select_by_visible_text(division)
-            time.sleep(2)
+                away_names = [a.text_content().strip() for a in away_tags]
+                away_ids = [decode_player_id(_href(a)) for a in away_tags]
 
-            driver.find_element(By.LINK_TEXT, "Matches").click()
-            time.sleep(3)
+                score = _text(_first(_MATCH_REST, block))
 
-            html = driver.page_source
-            matches = extract_all_matches(html, season, division)
+                if score == "N/A" and len(home_names) == 0 and len(away_names) == 0:
+                    continue
 
-            if matches:
-                df = pd.DataFrame(matches)
-                filename = f"data/raw/ic_mixed_matches_{clean_filename(season)}_{clean_filename(division)}.csv"
-                df.to_csv(filename, index=False)
-                print(f"   ✅ Saved {len(df)} matches → {filename}")
-            else:
-                print(f"   ⚠️ No matches found for {division}")
+                # Detect special outcomes by scanning <span> only (first matching span, like find)
+                span_strings = [_bs4_string(span) for span in _SPANS(block)]
+                is_default = any(t and ("Default" in t or "Forfeit" in t) for t in span_strings)
+                is_retired = any(t and "Retired" in t for t in span_strings)
 
+                home_won = _first(_HOME_WON, block) is not None
+                away_won = _first(_AWAY_WON, block) is not None
+
+                match_record = {
+                    "Season": season,
+                    "Division": division,
+                    "Date": date,
+                    "Home Team": home_team,
+                    "Away Team": away_team,
+                    "Line": line_number,
+                    "Score": score,
+                    "Defaulted": is_default,
+                    "Retired": is_retired,
+                    "Home Won": home_won,
+                    "Away Won": away_won
+                }
+
+                if len(home_names) == 2:
+                    match_record.update({
+                        "Home Player 1": home_names[0],
+                        "Home ID 1": home_ids[0],
+                        "Home Player 2": home_names[1],
+                        "Home ID 2": home_ids[1],
+                    })
+
+                if len(away_names) == 2:
+                    match_record.update({
+                        "Away Player 1": away_names[0],
+                        "Away ID 1": away_ids[0],
+                        "Away Player 2": away_names[1],
+                        "Away ID 2": away_ids[1],
+                    })
+
+                all_matches.append(match_record)
+                line_number += 1
+
+            except Exception as e:
+                print(f"❌ Error in fixture {i+1}, match {line_number}: {e}")
+
+    return all_matches
+
+# -- Drivers and worker pool --
+
+_driver_path = None
+_store_lock = threading.Lock()
+
+def make_driver():
+    """
+    Start a headless Chrome driver. The chromedriver binary is resolved once per process.
+    """
+    global _driver_path
+    if _driver_path is None:
+        _driver_path = ChromeDriverManager().install()
+
+    options = Options()
+    options.add_argument("--headless=new")
+    options.add_argument("--disable-gpu")
+    return webdriver.Chrome(service=Service(_driver_path), options=options)
+
+def run_driver_pool(items, work, driver_factory, max_workers=4):
+    """
+    Process items with a pool of worker threads sharing one queue.
+
+    Each worker creates one driver with driver_factory() the first time it takes
+    an item, reuses it for every item it processes, and quits it at the end.
+    A failure on one item is reported and does not stop the worker.
+
+    Parameters:
+        items (list): work items (e.g., division names)
+        work (callable): work(driver, item) -> result
+        driver_factory (callable): () -> driver (anything with .quit())
+        max_workers (int): concurrency cap (number of drivers)
+
+    Returns:
+        list: one result per item, by position in items (None for failed items),
+              so repeated items each keep their own result
+    """
+    todo = queue.Queue()
+    for position, item in enumerate(items):
+        todo.put((position, item))
+
+    results = [None] * len(items)
+
+    def worker():
+        driver = None
+        try:
+            while True:
+                try:
+                    position, item = todo.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    if driver is None:
+                        driver = driver_factory()
+                    results[position] = work(driver, item)
+                except Exception as e:
+                    print(f"   ❌ Failed: {item}. Error: {e}")
+        finally:
+            if driver is not None:
+                driver.quit()
+
+    n_workers = max(1, min(max_workers, len(items)))
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(n_workers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    return results
+
+class RateLimiter:
+    """
+    Spaces out calls to wait() across threads to at most max_per_second.
+    """
+
+    def __init__(self, max_per_second):
+        self.interval = 1.0 / max_per_second if max_per_second else 0.0
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_time)
+            self._next_time = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+def write_csv_atomic(df, filename):
+    """
+    Write a CSV via a temp file + rename, so readers never see a half-written file.
+    """
+    os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+    tmp_filename = f"{filename}.{threading.get_ident()}.tmp"
+    df.to_csv(tmp_filename, index=False)
+    os.replace(tmp_filename, filename)
+
+def open_division_group(driver, entry_url, recorder=latency):
+    """
+    Load the entry URL and select the Division Group, ready for scrape_division.
+    """
+    with recorder.time("open_entry_url"):
+        driver.get(entry_url)
+        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "arch_season_list")))
+
+    with recorder.time("select_group"):
+        old_divisions = driver.find_element(By.ID, "divgs_div_list")
+        Select(driver.find_element(By.ID, "divgs_list")).select_by_index(1)
+        require_navigation(driver, old_divisions, "selecting the division group")
+        wait_for_options(driver, "divgs_div_list")
+    return driver
+
+def load_division_matches(driver, division, recorder=latency):
+    """
+    Select a division from the dropdown, open its Matches tab and return the page HTML
+    once the match tables are present and stable (or the page says there are no matches).
+
+    Raises TimeoutException if the page does not change after the select or the click,
+    or the match tables don't finish loading.
+    """
+    with recorder.time("select_division"):
+        old_link = driver.find_element(By.LINK_TEXT, "Matches")
+        Select(driver.find_element(By.ID, "divgs_div_list")).select_by_visible_text(division)
+        require_navigation(driver, old_link, f"selecting division {division!r}")
+        WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.LINK_TEXT, "Matches")))
+
+    with recorder.time("open_matches"):
+        old_page = driver.find_element(By.TAG_NAME, "html")
+        driver.find_element(By.LINK_TEXT, "Matches").click()
+        require_navigation(driver, old_page, f"opening the Matches tab for {division!r}")
+        # Divisions with no matches yet show a marker instead of match tables
+        wait_for_stable(driver, "div.match_results_table", empty_xpath=NO_MATCHES_XPATH)
+
+    return driver.page_source
+
+def scrape_division(driver, division, season, output_dir="data/raw", store_path=None,
+                    load_html=load_division_matches, snapshot_root=None):
+    """
+    Scrape one division and write its matches to output_dir (and the match store).
+    If snapshot_root is given, the raw page is also saved to the snapshot store.
+
+    Returns:
+        int: number of matches saved
+    """
+    print(f"🔄 Scraping division: {division}")
+    html = load_html(driver, division)
+    if snapshot_root:
+        save_snapshot(html, "matches", season=season, division=division, root=snapshot_root)
+    with latency.time("parse_matches"):
+        matches = extract_all_matches_lxml(html, season, division)
+
+    if not matches:
+        print(f"   ⚠️ No matches found for {division}")
+        return 0
+
+    df = pd.DataFrame(matches)
+    filename = os.path.join(output_dir, f"ic_mixed_matches_{clean_filename(season)}_{clean_filename(division)}.csv")
+    write_csv_atomic(df, filename)
+    print(f"   ✅ Saved {len(df)} matches → {filename}")
+    if store_path:
+        with _store_lock:
+            write_matches(df, store_path)
+    return len(df)
+
+def scrape_season_divisions(entry_url, store_path=None, max_workers=4, output_dir="data/raw", backend="selenium",
+                            snapshot_root=None):
+    """
+    Scrape every division in the selected Division Group to data/raw CSVs.
+    If store_path is given (e.g. 'data/matches'), matches are also written to the Parquet match store.
+    If snapshot_root is given (e.g. 'data/snapshots'), every fetched page is kept for reparse_snapshots.py.
+
+    Divisions are shared out between up to max_workers workers (see run_driver_pool), each
+    with its own headless Chrome (backend='selenium') or keep-alive HTTP session
+    (backend='http', see http_fetch). A per-step latency report is printed at the end.
+    """
+    latency.reset()
+    clear_malformed_player_ids()
+    print("🌐 Loading provided URL...")
+
+    if backend == "http":
+        first_driver = HttpFetcher(pool_size=max_workers)
+        try:
+            season, division_urls = discover_divisions(first_driver, entry_url)
         except Exception as e:
-            print(f"   ❌ Failed to scrape division: {division}. Error: {e}")
-            continue
+            print(f"❌ Could not determine season and divisions from the dropdowns: {e}")
+            first_driver.quit()
+            return
+        division_options = list(division_urls)
+        new_driver = HttpFetcher
+        load_html = lambda fetcher, division: load_division_matches_http(fetcher, division_urls[division])
+
+    elif backend == "selenium":
+        first_driver = make_driver()
+        try:
+            open_division_group(first_driver, entry_url)
+            season_dropdown = Select(first_driver.find_element(By.ID, "arch_season_list"))
+            season = season_dropdown.first_selected_option.text.strip()
+        except Exception as e:
+            print("❌ Could not determine season from the dropdown.")
+            first_driver.quit()
+            return
+        division_select = Select(first_driver.find_element(By.ID, "divgs_div_list"))
+        division_options = [o.text.strip() for o in division_select.options if "Select" not in o.text]
+        new_driver = lambda: open_division_group(make_driver(), entry_url)
+        load_html = load_division_matches
 
-    driver.quit()
-    print(f"\n🎉 Done scraping all divisions for season {season}")
+    else:
+        raise ValueError(f"Unknown backend: {backend!r} (expected 'selenium' or 'http')")
+
+    os.makedirs(output_dir, exist_ok=True)
+    print(f"📋 Found {len(division_options)} divisions to scrape for {season} ({max_workers} workers)")
+
+    # The driver used to discover divisions becomes the first worker's driver
+    ready_drivers = [first_driver]
 
-def scrape_roster_page(driver, team_url, team_name, team_id):
-    driver.get(team_url)
-    time.sleep(3)
-    html = driver.page_source
+    def driver_factory():
+        try:
+            return ready_drivers.pop()
+        except IndexError:
+            return new_driver()
+
+    results = run_driver_pool(
+        division_options,
+        lambda d, division: scrape_division(
+            d, division, season, output_dir=output_dir, store_path=store_path, load_html=load_html,
+            snapshot_root=snapshot_root
+        ),
+        driver_factory,
+        max_workers=max_workers
+    )
+
+    # Quit the discovery driver if no worker ended up using it
+    for unused in ready_drivers:
+        unused.quit()
+
+    failed = [d for d, n in zip(division_options, results) if n is None]
+    if failed:
+        print(f"⚠️  {len(failed)} divisions failed: {failed}")
+    print(f"\n🎉 Done scraping all divisions for season {season}")
+    report_malformed_player_ids()
+    latency.report()
+
+def fetch_page(driver, url, ready_css, step):
+    """
+    Return the HTML at url using either backend: an HttpFetcher requests it directly,
+    a Selenium driver navigates and waits until ready_css elements are stable
+    (raising TimeoutException if they never are).
+    """
+    if isinstance(driver, HttpFetcher):
+        return driver.fetch(url, step=step)
+
+    with latency.time(step):
+        driver.get(url)
+        wait_for_stable(driver, ready_css)
+    return driver.page_source
+
+def scrape_roster_page(driver, team_url, team_name, team_id, snapshot_root=None, season=None):
+    html = fetch_page(driver, team_url, "table.team_roster_table tr", step="roster_page")
+    if snapshot_root:
+        save_snapshot(html, "roster", season=season, team=team_name, team_id=team_id, url=team_url, root=snapshot_root)
+    return parse_roster_html(html, team_name, team_id)
+
+def parse_roster_html(html, team_name, team_id):
     soup = BeautifulSoup(html, "html.parser")
 
     # 🌟 Extract division name
@@ -211,7 +631,6 @@ def scrape_roster_page(driver, team_url, team_name, team_id):
         name = a_tag.text.strip()
         full_text = row.get_text(separator=" ", strip=True)
         suffix = full_text.replace(name, "").strip()
-        player_id = decode_player_id(a_tag["href"])
 
         players.append({
             "Division": division,
@@ -219,18 +638,20 @@ def scrape_roster_page(driver, team_url, team_name, team_id):
             "Team ID": team_id,
             "Name": name,
             "Suffix": suffix,
-            "ID": player_id,
+            "ID": a_tag["href"],
             "Role": section
         })
 
+    for player, player_id in zip(players, decode_player_ids([p["ID"] for p in players])):
+        player["ID"] = player_id
+
     return players
 
 def get_team_links(driver, base_url):
     from urllib.parse import urljoin, urlparse, parse_qs
 
-    driver.get(base_url)
-    time.sleep(5)
-    soup = BeautifulSoup(driver.page_source, "html.parser")
+    html = fetch_page(driver, base_url, "ul.team-selector li", step="team_list")
+    soup = BeautifulSoup(html, "html.parser")
     team_links = []
 
     current_division = None
@@ -264,42 +685,82 @@ def get_team_links(driver, base_url):
 
     return team_links
 
-def scrape_all_teams(base_url, year="2024"):
-    from selenium import webdriver
-    from selenium.webdriver.chrome.service import Service
-    from selenium.webdriver.chrome.options import Options
-    from webdriver_manager.chrome import ChromeDriverManager
+def scrape_all_teams(base_url, year="2024", backend="selenium", snapshot_root=None,
+                     max_workers=4, max_rate=2.0, output_dir="data/processed"):
+    """
+    Scrape every team roster listed on the standings page into one roster table per season
+    (see roster_store).
 
-    options = Options()
-    options.add_argument("--headless=new")
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-
-    print("🌐 Loading division page...")
-    team_links = get_team_links(driver, base_url)
-    print(f"📋 Found {len(team_links)} teams.")
-
-    all_players = []
-
-    for team in team_links:
-        team_name = team["team_name"]
-        team_url = team["team_url"]
-        team_id = team["team_id"]
-        division = team["division"]
-
-        print(f"🔄 Scraping {team_name}...")
-        players = scrape_roster_page(driver, team_url, team_name, team_id)
-        all_players.extend(players)
-
-        df = pd.DataFrame(players)
-        if not df.empty:
-            safe_team_name = team_name.lower().replace(" ", "-")
-            os.makedirs("data/processed", exist_ok=True)
-            filename = f"data/processed/ic_mixed_roster_{year}_{safe_team_name}.csv"
-            df.to_csv(filename, index=False)
-            print(f"   ✅ Saved {len(df)} players → {filename}")
-        else:
-            print(f"   ⚠️ No data found for {team_name}")
-
-    driver.quit()
-    return all_players
+    Teams are shared out between up to max_workers drivers (see run_driver_pool), and
+    page fetches across all workers are capped at max_rate per second.
+
+    Rosters are merged with update_roster_table, so unchanged teams are skipped and
+    added / removed / modified players are appended to the season's change log.
+
+    Returns:
+        list: one dict per player scraped this run
+    """
+    if backend not in ("selenium", "http"):
+        raise ValueError(f"Unknown backend: {backend!r} (expected 'selenium' or 'http')")
 
+    latency.reset()
+    clear_malformed_player_ids()
+    first_driver = HttpFetcher(pool_size=max_workers) if backend == "http" else make_driver()
+    new_driver = HttpFetcher if backend == "http" else make_driver
+
+    # Drivers no worker has taken yet; quit whatever is left, even if discovery fails
+    ready_drivers = [first_driver]
+    try:
+        print("🌐 Loading division page...")
+        team_links = get_team_links(first_driver, base_url)
+        print(f"📋 Found {len(team_links)} teams ({max_workers} workers, ≤ {max_rate} pages/s).")
+
+        teams_by_url = {team["team_url"]: team for team in team_links}
+        limiter = RateLimiter(max_rate)
+
+        def driver_factory():
+            try:
+                return ready_drivers.pop()
+            except IndexError:
+                return new_driver()
+
+        def scrape_team(driver, team_url):
+            team = teams_by_url[team_url]
+            limiter.wait()
+            players = scrape_roster_page(
+                driver, team_url, team["team_name"], team["team_id"], snapshot_root=snapshot_root, season=year
+            )
+            print(f"   ✅ {team['team_name']}: {len(players)} players")
+            return players
+
+        team_urls = list(teams_by_url)
+        results = run_driver_pool(team_urls, scrape_team, driver_factory, max_workers=max_workers)
+    finally:
+        for unused in ready_drivers:
+            unused.quit()
+
+    failed = [teams_by_url[url]["team_name"] for url, players in zip(team_urls, results) if players is None]
+    if failed:
+        print(f"⚠️  {len(failed)} teams failed: {failed}")
+
+    rosters = {}
+    for url, players in zip(team_urls, results):
+        if players is not None:
+            team = teams_by_url[url]
+            rosters[team_key(team["division"], team["team_name"], team["team_id"])] = players
+    update = update_roster_table(rosters, year, output_dir=output_dir)
+    if update["empty"]:
+        print(f"⚠️  {len(update['empty'])} teams returned an empty roster, kept previous rows: {update['empty']}")
+    changes = update["changes"]["change"].value_counts()
+    print(
+        f"🔁 {len(update['changed'])} teams changed, {update['unchanged']} unchanged "
+        f"(+{changes.get('added', 0)} / -{changes.get('removed', 0)} / ~{changes.get('modified', 0)} players)"
+    )
+    if update["path"]:
+        print(f"✅ Saved roster table → {update['path']}")
+
+    all_players = [player for players in rosters.values() for player in players]
+
+    report_malformed_player_ids()
+    latency.report()
+    return all_players
@@ -0,0 +1,318 @@
+# scripts/season_sim.py
+"""
+Monte Carlo simulation of the rest of a season and its playoffs.
+
+Standings come from the team matches played so far (create_team_match_id
+output): a team's points are the lines it has won. Each remaining fixture is
+played line by line, with win probabilities from MatchupPredictor for each
+team's most recent pair on that line (0.5 where a pair is unknown). All
+simulations in a chunk run at once as NumPy arrays of shape
+(sims, fixtures, lines); ties in the table are broken at random.
+
+The top playoff_spots teams in each division then play a seeded knockout
+(1 v 4, 2 v 3, ...), the better seed at home, and a 3-3 tie goes to a coin flip.
+
+Random numbers come from one generator per block of SIM_BLOCK simulations,
+spawned from the seed, so a seed gives the same results whatever chunk_size is.
+"""
+
+import numpy as np
+import pandas as pd
+
+from scripts.dimensions import FLAG_COLUMNS
+from scripts.elo import match_outcomes
+from scripts.metadata_utils import LINE_LABELS
+
+LINES = list(LINE_LABELS)
+
+DEFAULT_SIMS = 10000
+DEFAULT_PLAYOFF_SPOTS = 4
+
+# Simulations per random generator; chunk sizes are rounded up to a multiple
+SIM_BLOCK = 256
+
+# Memory budget for one chunk's random draws and line results
+DEFAULT_CHUNK_BYTES = 256 * 2**20
+
+
+# -- Current standings --
+def current_standings(df, division_col="Division", home_col="Home Team", away_col="Away Team"):
+    """
+    Points table from the team matches played so far.
+
+    Parameters:
+        df (DataFrame): create_team_match_id output for one season, with
+                        results (Home Won / Away Won, or set_wins_home / set_wins_away)
+
+    Returns:
+        pandas DataFrame: Division, Team, played (team matches), points (lines won), lines_lost
+    """
+    results = pd.DataFrame(index=df.index)
+    for source, target in FLAG_COLUMNS.items():
+        if source in df.columns:
+            results[target] = df[source].fillna(False).astype(bool)
+    for col in ["set_wins_home", "set_wins_away"]:
+        if col in df.columns:
+            results[col] = df[col]
+    outcome = match_outcomes(results)
+
+    rows = pd.DataFrame({
+        "team_match": df["temp_team_match_id"].to_numpy(),
+        "Division": df[division_col].astype("object").to_numpy(),
+        "home": df[home_col].astype("object").to_numpy(),
+        "away": df[away_col].astype("object").to_numpy(),
+        "home_lines": (outcome == 1.0).astype(int),
+        "away_lines": (outcome == 0.0).astype(int),
+    })
+    matches = rows.groupby("team_match", sort=False).agg(
+        Division=("Division", "first"), home=("home", "first"), away=("away", "first"),
+        home_lines=("home_lines", "sum"), away_lines=("away_lines", "sum"),
+    )
+
+    sides = pd.concat([
+        pd.DataFrame({"Division": matches["Division"], "Team": matches["home"],
+                      "points": matches["home_lines"], "lines_lost": matches["away_lines"]}),
+        pd.DataFrame({"Division": matches["Division"], "Team": matches["away"],
+                      "points": matches["away_lines"], "lines_lost": matches["home_lines"]}),
+    ], ignore_index=True)
+    return sides.groupby(["Division", "Team"], sort=True).agg(
+        played=("points", "size"), points=("points", "sum"), lines_lost=("lines_lost", "sum"),
+    ).reset_index()
+
+
+# -- Line win probabilities --
+def recent_lineups(facts, teams):
+    """
+    Each team's most recent pair on every line.
+
+    Parameters:
+        facts (DataFrame): matches fact table (dimensions.split_dimensions)
+        teams (DataFrame): teams dimension table
+
+    Returns:
+        dict: {team name: {line: (key, key)}}
+    """
+    order = [c for c in ["date", "team_match_id", "line"] if c in facts.columns]
+    facts = facts.sort_values(order, kind="stable")
+    sides = pd.concat([
+        pd.DataFrame({"team_key": facts[f"{side}_team_key"].to_numpy(), "line": facts["line"].to_numpy(),
+                      "p1": facts[f"{side}1_key"].to_numpy(), "p2": facts[f"{side}2_key"].to_numpy(),
+                      "position": np.arange(len(facts))})
+        for side in ["home", "away"]
+    ], ignore_index=True)
+    sides = sides[(sides["team_key"] > 0) & (sides["p1"] > 0) & (sides["line"] > 0)]
+    latest = sides.sort_values("position", kind="stable").drop_duplicates(["team_key", "line"], keep="last")
+
+    names = dict(zip(teams["team_key"], teams["team"]))
+    lineups = {}
+    for team_key, line, p1, p2 in latest[["team_key", "line", "p1", "p2"]].itertuples(index=False):
+        lineups.setdefault(names.get(team_key), {})[int(line)] = (int(p1), int(p2))
+    lineups.pop(None, None)
+    return lineups
+
+def team_line_ratings(team_names, lineups, predictor):
+    """
+    Pair rating per team and line, shape (teams, 6); NaN where unknown or unrated.
+    """
+    ratings = np.full((len(team_names), len(LINES)), np.nan)
+    for t, team in enumerate(team_names):
+        pairs = lineups.get(team, {})
+        for l, line in enumerate(LINES):
+            if line in pairs:
+                try:
+                    ratings[t, l] = predictor.pair_rating(pairs[line])
+                except KeyError:
+                    pass
+    return ratings
+
+def line_win_probs(home_ratings, away_ratings, predictor):
+    """
+    P(home pair wins) per line from pair ratings of shape (..., 6); 0.5 where
+    either side's rating is unknown.
+    """
+    bias = np.array([predictor.line_terms(line)[0] for line in LINES])
+    slope = np.array([predictor.line_terms(line)[1] for line in LINES])
+    probs = 1.0 / (1.0 + np.exp(-(bias + slope * (home_ratings - away_ratings))))
+    return np.where(np.isnan(probs), 0.5, probs)
+
+
+# -- Simulation --
+def bracket_order(n):
+    """
+    Seeds (0 = top seed) in knockout bracket order, e.g. 4 -> [0, 3, 1, 2].
+    """
+    order = [0]
+    while len(order) < n:
+        size = 2 * len(order)
+        order = [s for seed in order for s in (seed, size - 1 - seed)]
+    return order
+
+def _playoff_size(n_teams, playoff_spots):
+    size = 1
+    while size * 2 <= min(n_teams, playoff_spots):
+        size *= 2
+    return size
+
+def _knockout(seeds, ratings, draws, predictor):
+    """
+    Play a seeded knockout for every simulation at once.
+
+    Parameters:
+        seeds (array): (sims, size) team indices, best seed first
+        ratings (array): (teams, 6) pair ratings
+        draws (array): (sims, size - 1, 7) uniforms: six lines and a coin per game
+
+    Returns:
+        tuple: (champion, finalists) team indices, shapes (sims,) and (sims, 2)
+    """
+    size = seeds.shape[1]
+    alive_seed = np.tile(np.array(bracket_order(size)), (len(seeds), 1))
+    game = 0
+    finalists = None
+    while alive_seed.shape[1] > 1:
+        if alive_seed.shape[1] == 2:
+            finalists = np.take_along_axis(seeds, alive_seed, axis=1)
+        a, b = alive_seed[:, 0::2], alive_seed[:, 1::2]
+        home_seed, away_seed = np.minimum(a, b), np.maximum(a, b)
+        home = np.take_along_axis(seeds, home_seed, axis=1)
+        away = np.take_along_axis(seeds, away_seed, axis=1)
+
+        n_games = home.shape[1]
+        u = draws[:, game:game + n_games]
+        probs = line_win_probs(ratings[home], ratings[away], predictor)
+        home_lines = (u[..., :6] < probs).sum(axis=2)
+        home_wins = (2 * home_lines > len(LINES)) | ((2 * home_lines == len(LINES)) & (u[..., 6] < 0.5))
+        alive_seed = np.where(home_wins, home_seed, away_seed)
+        game += n_games
+
+    champion = np.take_along_axis(seeds, alive_seed, axis=1)[:, 0]
+    return champion, finalists
+
+def simulate_season(standings, fixtures, lineups, predictor, n_sims=DEFAULT_SIMS,
+                    playoff_spots=DEFAULT_PLAYOFF_SPOTS, seed=None, chunk_size=None,
+                    division_col="Division", home_col="Home Team", away_col="Away Team"):
+    """
+    Simulate the remaining fixtures and playoffs n_sims times.
+
+    Parameters:
+        standings (DataFrame): current_standings output (may be empty)
+        fixtures (DataFrame): remaining team matches (Division, Home Team, Away Team)
+        lineups (dict): {team: {line: (key, key)}}, e.g. from recent_lineups
+        predictor (MatchupPredictor): ratings and line adjustments
+        playoff_spots (int): teams per division in the knockout (a power of two;
+                             divisions with fewer teams use the largest that fits)
+        seed (int, optional): random seed
+        chunk_size (int, optional): simulations held in memory at once
+                                    (default: fits in DEFAULT_CHUNK_BYTES)
+
+    Returns:
+        dict: standings (DataFrame per team: Division, Team, played, points,
+              remaining, mean_points, expected_rank, p_first, p_playoffs,
+              p_final, p_champion), rank_probs (DataFrame: P(finishing in each place)),
+              n_sims
+    """
+    fixtures = fixtures.reset_index(drop=True)
+
+    # Team index: every (Division, Team) in the table or the fixtures
+    teams = pd.concat([
+        standings[["Division", "Team"]],
+        fixtures[[division_col, home_col]].set_axis(["Division", "Team"], axis=1),
+        fixtures[[division_col, away_col]].set_axis(["Division", "Team"], axis=1),
+    ], ignore_index=True).astype("object").drop_duplicates().sort_values(["Division", "Team"])
+    teams = teams.reset_index(drop=True)
+    index = {(d, t): i for i, (d, t) in enumerate(teams.itertuples(index=False))}
+    n_teams, n_fixtures = len(teams), len(fixtures)
+
+    current = standings.set_index(["Division", "Team"])
+    base = np.array([
+        float(current["points"].get((d, t), 0)) for d, t in teams.itertuples(index=False)
+    ])
+
+    home = np.array([index[(d, t)] for d, t in zip(fixtures[division_col], fixtures[home_col])], dtype=np.intp)
+    away = np.array([index[(d, t)] for d, t in zip(fixtures[division_col], fixtures[away_col])], dtype=np.intp)
+    home_onehot = np.zeros((n_fixtures, n_teams), dtype=np.float32)
+    away_onehot = np.zeros((n_fixtures, n_teams), dtype=np.float32)
+    home_onehot[np.arange(n_fixtures), home] = 1
+    away_onehot[np.arange(n_fixtures), away] = 1
+
+    ratings = team_line_ratings(teams["Team"].tolist(), lineups, predictor)
+    fixture_probs = line_win_probs(ratings[home], ratings[away], predictor).astype(np.float32)
+
+    divisions = [
+        (division, group.index.to_numpy(), _playoff_size(len(group), playoff_spots))
+        for division, group in teams.groupby("Division", sort=True)
+    ]
+    n_games = sum(size - 1 for _, _, size in divisions)
+    max_size = max((len(members) for _, members, _ in divisions), default=0)
+
+    # Uniforms per simulation: fixture lines, table tiebreaks, playoff games (six lines and a coin)
+    n_lines = n_fixtures * len(LINES)
+    n_uniforms = n_lines + n_teams + 7 * n_games
+    if chunk_size is None:
+        chunk_size = DEFAULT_CHUNK_BYTES // (4 * n_uniforms + 8 * (n_fixtures + n_teams) + 1)
+    blocks_per_chunk = max(1, -(-int(chunk_size) // SIM_BLOCK))
+
+    n_blocks = -(-n_sims // SIM_BLOCK)
+    generators = [np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(n_blocks)]
+
+    points_sum = np.zeros(n_teams)
+    rank_counts = np.zeros((n_teams, max_size))
+    playoff_counts = np.zeros(n_teams)
+    final_counts = np.zeros(n_teams)
+    champion_counts = np.zeros(n_teams)
+
+    for first in range(0, n_blocks, blocks_per_chunk):
+        blocks = range(first, min(first + blocks_per_chunk, n_blocks))
+        u = np.concatenate([
+            generators[b].random((min(SIM_BLOCK, n_sims - b * SIM_BLOCK), n_uniforms), dtype=np.float32)
+            for b in blocks
+        ])
+        sims = len(u)
+
+        # Remaining fixtures: lines won by each side
+        line_draws = u[:, :n_lines].reshape(sims, n_fixtures, len(LINES))
+        home_lines = (line_draws < fixture_probs).sum(axis=2, dtype=np.int32).astype(np.float32)
+        away_lines = len(LINES) - home_lines
+        points = base + (home_lines @ home_onehot + away_lines @ away_onehot)
+        points_sum += points.sum(axis=0)
+
+        # Table order, ties broken at random
+        key = points + u[:, n_lines:n_lines + n_teams]
+        playoff_draws = u[:, n_lines + n_teams:].reshape(sims, n_games, 7)
+        game = 0
+        for _, members, size in divisions:
+            order = np.argsort(-key[:, members], axis=1, kind="stable")
+            ranks = np.empty_like(order)
+            np.put_along_axis(ranks, order, np.arange(len(members)), axis=1)
+            n = len(members)
+            counts = np.bincount((np.arange(n) * n + ranks).ravel(), minlength=n * n).reshape(n, n)
+            rank_counts[members, :n] += counts
+
+            seeds = members[order[:, :size]]
+            np.add.at(playoff_counts, seeds.ravel(), 1)
+            if size == 1:
+                np.add.at(champion_counts, seeds[:, 0], 1)
+                continue
+            champion, finalists = _knockout(seeds, ratings, playoff_draws[:, game:game + size - 1], predictor)
+            game += size - 1
+            np.add.at(final_counts, finalists.ravel(), 1)
+            np.add.at(champion_counts, champion, 1)
+
+    result = teams.copy()
+    result["played"] = [int(current["played"].get(k, 0)) for k in teams.itertuples(index=False)]
+    result["points"] = base.astype(int)
+    result["remaining"] = np.bincount(home, minlength=n_teams) + np.bincount(away, minlength=n_teams)
+    result["mean_points"] = points_sum / n_sims
+    result["expected_rank"] = (rank_counts / n_sims) @ np.arange(1, max_size + 1)
+    result["p_first"] = rank_counts[:, 0] / n_sims if max_size else 0.0
+    result["p_playoffs"] = playoff_counts / n_sims
+    result["p_final"] = final_counts / n_sims
+    result["p_champion"] = champion_counts / n_sims
+    result = result.sort_values(["Division", "expected_rank"], kind="stable").reset_index(drop=True)
+
+    rank_probs = pd.DataFrame(
+        rank_counts / n_sims,
+        index=pd.MultiIndex.from_frame(teams),
+        columns=range(1, max_size + 1),
+    )
+    return {"standings": result, "rank_probs": rank_probs, "n_sims": n_sims}
@@ -0,0 +1,118 @@
+# scripts/snapshot_store.py
+"""
+Content-addressed store of raw fetched HTML.
+
+Every page_source the scrapers fetch can be saved here, gzip-compressed and
+named by its SHA-256, so identical pages are stored once:
+
+    data/snapshots/objects/3f/3fa9...e1.html.gz
+    data/snapshots/index.jsonl      one line per fetch: kind, season, division, team, url, fetched_at, sha256
+
+The index keeps every fetch; list_snapshots returns the latest one per page.
+See reparse_snapshots.py to rebuild match and roster outputs without scraping.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timezone
+
+import pandas as pd
+
+DEFAULT_SNAPSHOT_PATH = "data/snapshots"
+
+INDEX_FILE = "index.jsonl"
+INDEX_COLUMNS = ["kind", "season", "division", "team", "team_id", "url", "fetched_at", "sha256"]
+
+# Fields that identify "the same page" when picking the latest snapshot
+PAGE_KEY = ["kind", "season", "division", "team_id"]
+
+_index_lock = threading.Lock()
+
+
+def object_path(root, sha256):
+    return os.path.join(root, "objects", sha256[:2], f"{sha256}.html.gz")
+
+
+def save_snapshot(html, kind, season=None, division=None, team=None, team_id=None, url=None,
+                  root=DEFAULT_SNAPSHOT_PATH, fetched_at=None):
+    """
+    Save a fetched page and record it in the index.
+
+    Parameters:
+        html (str): page_source
+        kind (str): 'matches' (division matches page) or 'roster'
+
+    Returns:
+        str: the page's SHA-256
+    """
+    data = html.encode("utf-8")
+    sha256 = hashlib.sha256(data).hexdigest()
+    path = object_path(root, sha256)
+
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp_path, "wb", compresslevel=6) as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    entry = {
+        "kind": kind,
+        "season": None if season is None else str(season),
+        "division": division,
+        "team": team,
+        "team_id": None if team_id is None else str(team_id),
+        "url": url,
+        "fetched_at": fetched_at or datetime.now(timezone.utc).isoformat(),
+        "sha256": sha256,
+    }
+    with _index_lock:
+        os.makedirs(root, exist_ok=True)
+        with open(os.path.join(root, INDEX_FILE), "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+
+    return sha256
+
+
+def load_snapshot(sha256, root=DEFAULT_SNAPSHOT_PATH):
+    """
+    Return the HTML for a snapshot hash.
+    """
+    with gzip.open(object_path(root, sha256), "rb") as f:
+        return f.read().decode("utf-8")
+
+
+def list_snapshots(root=DEFAULT_SNAPSHOT_PATH, kind=None, season=None, latest=True):
+    """
+    The snapshot index as a DataFrame.
+
+    Parameters:
+        kind (str, optional): 'matches' or 'roster'
+        season (optional): only this season
+        latest (bool): keep only the most recent fetch of each page
+
+    Returns:
+        pandas DataFrame with INDEX_COLUMNS
+    """
+    index_path = os.path.join(root, INDEX_FILE)
+    if not os.path.exists(index_path):
+        return pd.DataFrame(columns=INDEX_COLUMNS)
+
+    df = pd.read_json(index_path, lines=True, dtype=False)
+    df = df.reindex(columns=INDEX_COLUMNS)
+
+    if kind is not None:
+        df = df[df["kind"] == kind]
+    if season is not None:
+        df = df[df["season"] == str(season)]
+
+    if latest and not df.empty:
+        df = (
+            df.sort_values("fetched_at", kind="stable")
+            .drop_duplicates(subset=PAGE_KEY, keep="last")
+        )
+
+    return df.sort_values(PAGE_KEY + ["fetched_at"], na_position="first").reset_index(drop=True)
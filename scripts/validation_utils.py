@@ -0,0 +1,85 @@
+# validation_utils.py
+import pandas as pd
+
+
+# -- Dates --
+def validate_dates(df, date_col='Date_fixed'):
+    """
+    Report how many dates failed to parse and the match counts by Year and Month.
+    """
+    num_bad_dates = df[date_col].isna().sum()
+    print(f"⚠️  Number of bad (missing) dates: {num_bad_dates}")
+
+    if num_bad_dates < len(df):
+        date_summary = df.groupby([df[date_col].dt.year, df[date_col].dt.month]).size().sort_index()
+        date_summary.index.names = ['year', 'month']
+        print("📅 Match counts by Year and Month:")
+        print(date_summary)
+    else:
+        print("⚠️  All dates missing — check your data!")
+
+
+# -- Divisions --
+def validate_division_levels(df, level_col='division_level', division_col='Division'):
+    """
+    Report divisions that don't fit the expected schema (Major, A, B, C).
+    """
+    bad_divisions = df[df[level_col].isna()]
+
+    if not bad_divisions.empty:
+        print("⚠️  Warning: Found divisions that don't fit the expected schema (Major, A, B, C):")
+        print(bad_divisions[division_col].value_counts())
+    else:
+        print("✅ All divisions fit expected schema.")
+
+
+# -- Lines --
+def validate_line_values(df, line_col='Line_validated', raw_line_col='Line'):
+    """
+    Report Line values that are not 1–6.
+    """
+    bad_lines = df[df[line_col].isna()]
+
+    if not bad_lines.empty:
+        print("⚠️  Warning: Found invalid Line values (should be 1–6 only):")
+        print(bad_lines[raw_line_col].value_counts())
+    else:
+        print("✅ All Line values are valid (1–6).")
+
+
+# -- Team matches --
+def validate_team_match_lines(df, team_id_col='temp_team_match_id', line_col='Line_validated'):
+    """
+    Report team matches that repeat a Line.
+
+    Returns:
+        list: Problematic team match IDs
+    """
+    num_team_matches = df[team_id_col].nunique()
+    print(f"✅ Created {num_team_matches} unique team matches.")
+
+    valid = df[line_col].notna()
+    duplicated = df[valid].duplicated(subset=[team_id_col, line_col])
+    bad_team_matches = df[valid].loc[duplicated, team_id_col].unique().tolist()
+
+    if bad_team_matches:
+        print(f"⚠️  Warning: Found {len(bad_team_matches)} team matches with invalid or duplicate Lines.")
+        print("Problematic team_match_ids:", bad_team_matches)
+    else:
+        print("✅ All team matches have valid, distinct Lines (1–6).")
+
+    return bad_team_matches
+
+
+# -- Individual matches --
+def validate_unique_temp_match_ids(df, match_id_col='temp_match_id'):
+    """
+    Report whether every row has its own match ID.
+    """
+    num_rows = len(df)
+    num_unique_matches = df[match_id_col].nunique()
+
+    if num_rows == num_unique_matches:
+        print(f"✅ All {num_rows} individual matches have unique match IDs.")
+    else:
+        print(f"⚠️  Warning: Found {num_rows} rows but only {num_unique_matches} unique temp_match_ids!")
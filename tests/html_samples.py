@@ -0,0 +1,83 @@
+# tests/html_samples.py
+"""
+Small stand-in pages shaped like the tenniscores division matches and roster pages.
+"""
+
+import base64
+
+def player_href(player_id):
+    encoded = base64.b64encode(player_id.encode("utf-8")).decode("ascii")
+    return f"player.php?print&p={encoded}"
+
+def _pair(names):
+    return " / ".join(f'<a href="{player_href("id-" + n)}">{n}</a>' for n in names)
+
+def match_line_html(home, away, score, home_won=True, note=None):
+    home_img = '<img src="check.png">' if home_won else ''
+    away_img = '' if home_won else '<img src="check.png">'
+    note_html = f"<span>{note}</span>" if note else ""
+    return f"""
+    <div class="match_results_content">
+      <div class="points">{home_img}</div>
+      <div class="team_name">{_pair(home)}</div>
+      <div class="match_rest">{score} {note_html}</div>
+      <div class="team_name2">{_pair(away)}</div>
+      <div class="points2">{away_img}</div>
+    </div>"""
+
+def fixture_html(date, home_team, away_team, lines):
+    return f"""
+  <div class="match_results_table">
+    <div class="match_results_content">
+      <div class="team_name"><a href="team.php?team=1">{home_team}</a></div>
+      <div class="match_rest">{date}</div>
+      <div class="team_name2"><a href="team.php?team=2">{away_team}</a></div>
+    </div>
+    {''.join(lines)}
+  </div>"""
+
+def division_page_html(fixtures, season="2024", division="A - West"):
+    return f"""<html><body>
+  <select id="arch_season_list"><option selected value="s1">{season}</option></select>
+  <select id="divgs_div_list"><option value="">Select a division</option><option selected value="d1">{division}</option></select>
+  <div id="content">{''.join(fixtures)}</div>
+</body></html>"""
+
+def sample_division_page(season="2024", division="A - West"):
+    fixtures = [
+        fixture_html("6/3/2024", "Toronto Aces", "Scarborough Smashers", [
+            match_line_html(["Alice", "Amy"], ["Bea", "Cat"], "6-4, 6-3"),
+            match_line_html(["Carol", "Dan"], ["Eve", "Fred"], "6-7 [4-7], 6-2, 1-0 [10-8]"),
+            match_line_html(["Gus", "Hal"], ["Ian", "Jon"], "6-0, 2-0", home_won=False, note="Retired"),
+        ]),
+        fixture_html("6/10/2024", "Oakville Rockets", "Toronto Aces", [
+            match_line_html(["Kim", "Lou"], ["Alice", "Amy"], "0-0", home_won=False, note="Default"),
+        ]),
+    ]
+    return division_page_html(fixtures, season=season, division=division)
+
+def team_list_html(teams):
+    """
+    teams: list of (division, team_name, team_id)
+    """
+    items = []
+    current = None
+    for division, team_name, team_id in teams:
+        if division != current:
+            items.append(f'<li class="division">{division}</li>')
+            current = division
+        items.append(f'<li class="divteamer"><a href="roster.html?team={team_id}"><div>{team_name}</div></a></li>')
+    return f'<html><body><ul class="team-selector">{"".join(items)}</ul></body></html>'
+
+def roster_page_html(division, captains, players):
+    def rows(names):
+        return "".join(
+            f'<tr><td><a href="{player_href("id-" + n)}">{n}</a> (S)</td></tr>' for n in names
+        )
+    return f"""<html><body>
+  <div class="shader team_nav team_nav2"><div>{division} Standings</div></div>
+  <table class="team_roster_table">
+    <tr><th class="player_col">Captains</th></tr>{rows(captains)}
+    <tr><th class="player_col">Players</th></tr>{rows(players)}
+  </table>
+</body></html>"""
@@ -0,0 +1,66 @@
+# tests/test_batch_parse.py
+
+import gzip
+
+import pandas as pd
+import pytest
+from scripts.batch_parse import batch_parse_pages, collect_jobs, page_context
+from scripts.scraper_utils import extract_all_matches
+from scripts.snapshot_store import save_snapshot
+from tests.html_samples import sample_division_page
+
+
+def _write_pages(folder, n):
+    folder.mkdir()
+    for i in range(n):
+        html = sample_division_page(season="2024", division=f"A - West {i:02d}")
+        if i % 2:
+            with gzip.open(folder / f"page{i:02d}.html.gz", "wt", encoding="utf-8") as f:
+                f.write(html)
+        else:
+            (folder / f"page{i:02d}.html").write_text(html, encoding="utf-8")
+
+
+def test_page_context():
+    assert page_context(sample_division_page(season="2023", division="B - East")) == ("2023", "B - East")
+
+def test_batch_parse_folder_matches_serial(tmp_path):
+    _write_pages(tmp_path / "pages", 9)
+    output = tmp_path / "out" / "matches.parquet"
+
+    summary = batch_parse_pages(str(tmp_path / "pages"), str(output), max_workers=3)
+    assert summary == {"pages": 9, "matches": 36, "output": str(output)}
+
+    df = pd.read_parquet(output)
+    expected = pd.DataFrame([
+        m for i in range(9)
+        for m in extract_all_matches(sample_division_page(division=f"A - West {i:02d}"), "2024", f"A - West {i:02d}")
+    ])
+    assert df["Division"].tolist() == expected["Division"].tolist()
+    assert df["Score"].tolist() == expected["Score"].tolist()
+    assert df["Home ID 1"].tolist() == expected["Home ID 1"].tolist()
+
+def test_batch_parse_is_deterministic(tmp_path):
+    _write_pages(tmp_path / "pages", 6)
+
+    batch_parse_pages(str(tmp_path / "pages"), str(tmp_path / "one.parquet"), max_workers=1)
+    batch_parse_pages(str(tmp_path / "pages"), str(tmp_path / "four.parquet"), max_workers=4)
+
+    assert pd.read_parquet(tmp_path / "one.parquet").equals(pd.read_parquet(tmp_path / "four.parquet"))
+
+def test_batch_parse_failure_leaves_no_files(tmp_path):
+    _write_pages(tmp_path / "pages", 3)
+    (tmp_path / "pages" / "page99.html.gz").write_bytes(b"not gzip")
+    output = tmp_path / "out" / "matches.parquet"
+
+    with pytest.raises(gzip.BadGzipFile):
+        batch_parse_pages(str(tmp_path / "pages"), str(output), max_workers=1)
+    assert list((tmp_path / "out").iterdir()) == []
+
+def test_collect_jobs_from_snapshot_store(tmp_path):
+    save_snapshot(sample_division_page(), "matches", season="2024", division="A - West", root=tmp_path)
+    save_snapshot("<html></html>", "roster", season="2024", team="Toronto Aces", team_id="1", root=tmp_path)
+
+    jobs = collect_jobs(str(tmp_path))
+    assert len(jobs) == 1
+    assert jobs[0][1:] == ("2024", "A - West")
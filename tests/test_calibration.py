@@ -0,0 +1,61 @@
+# tests/test_calibration.py
+
+import numpy as np
+import pandas as pd
+import pytest
+from scripts.calibration import attach_arrays, calibrate, calibration_arrays, release_arrays, share_arrays
+from scripts.clean_metadata import clean_metadata_pipeline
+from scripts.elo import param_grid, sweep_elo
+
+
+def _raw_matches(n_team_matches=40, seed=0):
+    rng = np.random.default_rng(seed)
+    teams = ['Toronto Aces', 'Oakville Rockets', 'Ajax Smash', 'Markham Lobs']
+    rows = []
+    for t in range(n_team_matches):
+        home, away = rng.choice(4, size=2, replace=False)
+        players = rng.choice(40, size=24, replace=False)
+        for line in range(1, 7):
+            h1, h2, a1, a2 = players[4 * (line - 1):4 * line]
+            home_won = bool(rng.random() < 0.5)
+            rows.append({
+                'Season': 2024,
+                'Division': 'Majors' if t % 2 else 'A - West',
+                'Date': f'6/{t % 28 + 1}/2024',
+                'Home Team': teams[home], 'Away Team': teams[away],
+                'Line': line,
+                'Score': '6-4, 6-3' if home_won else '3-6, 4-6',
+                'Home Player 1': f'P{h1}', 'Home ID 1': f'id{h1}',
+                'Home Player 2': f'P{h2}', 'Home ID 2': f'id{h2}',
+                'Away Player 1': f'P{a1}', 'Away ID 1': f'id{a1}',
+                'Away Player 2': f'P{a2}', 'Away ID 2': f'id{a2}',
+            })
+    return pd.DataFrame(rows)
+
+
+def test_shared_arrays_roundtrip():
+    arrays = {'a': np.arange(5, dtype=np.int64), 'b': np.linspace(0, 1, 3)}
+    blocks, spec = share_arrays(arrays)
+    try:
+        attached_blocks, attached = attach_arrays(spec)
+        np.testing.assert_array_equal(attached['a'], arrays['a'])
+        assert not attached['b'].flags.writeable
+        release_arrays(attached_blocks)
+    finally:
+        release_arrays(blocks, unlink=True)
+
+def test_calibrate_ranks_grid_like_a_single_sweep():
+    df_clean = clean_metadata_pipeline(_raw_matches())
+    grid = param_grid([8, 16, 32, 64], [1500], [None, {'Major': 100}])
+
+    results = calibrate(df_clean, grid, max_workers=2, n_chunks=3, burn_in=24)
+
+    assert len(results) == 8
+    assert results['rank'].tolist() == list(range(1, 9))
+    assert results['log_loss'].is_monotonic_increasing
+    assert sorted(results['chunk'].unique()) == [0, 1, 2]
+    assert (results['chunk_seconds'] > 0).all()
+
+    expected = sweep_elo(calibration_arrays(df_clean), grid, burn_in=24)
+    merged = results.merge(expected, on=list(grid.columns), suffixes=('', '_single'))
+    assert merged['log_loss'].to_numpy() == pytest.approx(merged['log_loss_single'].to_numpy())
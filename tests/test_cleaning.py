@@ -8,7 +8,13 @@ from scripts.cleaning import (
     cast_division_level, 
     validate_line,
     create_team_match_id,
-    create_match_id
+    create_match_id,
+    parse_score_string,
+    parse_scores_vectorized,
+    calculate_set_wins,
+    calculate_game_wins,
+    determine_winner,
+    clean_full_dataframe
     )
 
 # --- Test fix_match_date ---
@@ -114,3 +120,65 @@ def test_create_match_id_basic():
     assert 'Alice & Alice2' in df_result.loc[0, 'temp_match_id_label']
     assert 'Bob & Bob2' in df_result.loc[0, 'temp_match_id_label']
 
+
+# --- Test parse_scores_vectorized ---
+
+def test_parse_scores_vectorized_matches_scalar_parser():
+    scores = pd.Series([
+        '6-4, 6-3',
+        '6-7 [4-7], 7-6 [7-5], 1-0 [10-8]',
+        'N/A',
+        None,
+        '6-4, 6-3',
+        '7-6 [7 - 3]'
+    ])
+
+    sets = parse_scores_vectorized(scores)
+
+    expected = [
+        dict(match_id=i, set_no=j + 1, **s)
+        for i, score in enumerate(scores)
+        for j, s in enumerate(parse_score_string(score))
+    ]
+    result = sets.astype(object).where(sets.notna(), None).to_dict('records')
+    assert result == expected
+
+def test_parse_scores_vectorized_dtypes():
+    sets = parse_scores_vectorized(pd.Series(['6-7 [4-7], 6-2']), match_ids=[42])
+
+    assert sets['match_id'].tolist() == [42, 42]
+    assert sets['set_no'].tolist() == [1, 2]
+    assert sets['home_games'].dtype.kind == 'i'
+    assert str(sets['home_tb_points'].dtype) == 'Int32'
+    assert pd.isna(sets.loc[1, 'home_tb_points'])
+    assert sets['tiebreak_type'].tolist() == ['regular', 'none']
+
+# --- Test calculation functions ---
+
+def test_set_and_game_wins():
+    score_list = parse_score_string('6-7 [4-7], 7-5, 1-0 [10-8]')
+    assert calculate_set_wins(score_list) == (2, 1)
+    assert calculate_game_wins(score_list) == (14, 12)
+    assert determine_winner(2, 1) == 'Home'
+    assert determine_winner(0, 2) == 'Away'
+    assert determine_winner(1, 1) is None
+
+def test_clean_full_dataframe():
+    test_df = pd.DataFrame({
+        'Score': ['6-4, 6-3', '6-7 [4-7], 7-6 [7-5], 0-1 [8-10]', 'N/A'],
+        'Home Won': [True, True, False],
+        'Away Won': [False, False, False]
+    })
+
+    df_result = clean_full_dataframe(test_df)
+
+    assert df_result['set_wins_home'].tolist() == [2, 1, 0]
+    assert df_result['set_wins_away'].tolist() == [0, 2, 0]
+    assert df_result['game_wins_away'].tolist() == [7, 14, 0]
+    assert df_result['regular_tiebreaks'].tolist() == [0, 2, 0]
+    assert df_result['super_tiebreaks'].tolist() == [0, 1, 0]
+    assert df_result['winner'].tolist()[:2] == ['Home', 'Away']
+    assert pd.isna(df_result.loc[2, 'winner'])
+
+    # Row 1 disagrees with the scraped flags
+    assert df_result['winner_mismatch'].tolist() == [False, True, False]
@@ -0,0 +1,91 @@
+# tests/test_dimensions.py
+
+import numpy as np
+import pandas as pd
+import pytest
+from scripts.dimensions import read_dimensions, split_dimensions, write_dimensions
+
+
+def _matches():
+    return pd.DataFrame({
+        'Season': [2023, 2024, 2024],
+        'Division': ['A - West', 'A - West', 'B - East'],
+        'division_level': ['A', 'A', 'B'],
+        'Line': [1, 2, 1],
+        'Home Team': ['Toronto Aces', 'Toronto Aces', 'Oakville Rockets'],
+        'Away Team': ['Oakville Rockets', 'Ajax Smash', ' Ajax Smash '],
+        'Home Player 1': ['Alice', 'Alice B.', 'Cara'],
+        'Home ID 1': ['p1', 'p1', 'p3'],
+        'Home Player 2': ['Amy', 'Amy', None],
+        'Home ID 2': ['p2', 'p2', 'N/A'],
+        'Away Player 1': ['Bea', 'Alice B.', 'Dee'],
+        'Away ID 1': ['p4', 'p1', 'N/A'],
+        'Away Player 2': ['Eve', 'Eve', 'Fay'],
+        'Away ID 2': ['p5', 'p5', 'p6'],
+        'Home Won': [True, False, True],
+        'Away Won': [False, True, False],
+    })
+
+
+def test_split_dimensions():
+    tables = split_dimensions(_matches())
+    players, teams, matches = tables['players'], tables['teams'], tables['matches']
+
+    assert players['player_key'].dtype == np.int32
+    assert players['player_key'].tolist() == list(range(1, len(players) + 1))
+    alice = players.set_index('identity').loc['p1']
+    assert alice['name'] == 'Alice B.'  # most used name
+    assert list(alice['seasons']) == [2023, 2024]
+    # No ID on the page: tracked by name
+    assert pd.isna(players.set_index('identity').loc['name:Dee', 'player_id'])
+
+    assert teams['team'].tolist() == ['Ajax Smash', 'Oakville Rockets', 'Toronto Aces']
+
+    assert not any(dtype == object for dtype in matches.dtypes)
+    key = dict(zip(players['identity'], players['player_key']))
+    assert matches['home1_key'].tolist() == [key['p1'], key['p1'], key['p3']]
+    assert matches['home2_key'].tolist()[2] == 0  # no partner
+    assert matches['away_team_key'].tolist()[1:] == [1, 1]
+    assert matches['home_won'].tolist() == [True, False, True]
+
+def test_existing_keys_are_kept(tmp_path):
+    first = split_dimensions(_matches())
+    write_dimensions(first, tmp_path)
+
+    newer = pd.concat([_matches(), _matches().assign(**{'Home ID 1': 'p0', 'Season': 2025})])
+    second = split_dimensions(newer, existing=read_dimensions(tmp_path))
+
+    players = second['players']
+    old = first['players'].set_index('identity')['player_key']
+    assert (players.set_index('identity').loc[old.index, 'player_key'] == old).all()
+    # New players get new keys after the old ones
+    assert players.set_index('identity').loc['p0', 'player_key'] == old.max() + 1
+
+def test_unknown_line_and_season_are_zero():
+    matches = _matches().astype({'Season': 'object', 'Line': 'object'})
+    matches.loc[2, ['Season', 'Line']] = [None, 'x']
+    facts = split_dimensions(matches)['matches']
+
+    assert facts['season'].dtype == np.int16
+    assert facts['line'].dtype == np.int8
+    assert facts['season'].tolist() == [2023, 2024, 0]
+    assert facts['line'].tolist() == [1, 2, 0]
+
+def test_non_numeric_season_is_an_error():
+    matches = _matches().astype({'Season': 'object'})
+    matches.loc[2, 'Season'] = '2024 Winter'
+    with pytest.raises(ValueError, match='2024 Winter'):
+        split_dimensions(matches)
+
+def test_existing_season_summaries_are_merged(tmp_path):
+    write_dimensions(split_dimensions(_matches()), tmp_path)
+
+    # Only 2025 rows this run: earlier seasons come from the previous tables
+    newer = _matches().iloc[[1]].assign(Season=2025)
+    players = split_dimensions(newer, existing=read_dimensions(tmp_path))['players'].set_index('identity')
+
+    assert list(players.loc['p1', 'seasons']) == [2023, 2024, 2025]
+    assert players.loc['p1', ['first_season', 'last_season']].tolist() == [2023, 2025]
+    assert players['first_season'].dtype == 'Int16'
+    # Not seen this run: carried over unchanged
+    assert list(players.loc['p3', 'seasons']) == [2024]
@@ -0,0 +1,148 @@
+# tests/test_elo.py
+
+import numpy as np
+import pandas as pd
+import pytest
+from scripts.elo import (
+    EloEngine,
+    independent_waves,
+    match_arrays,
+    param_grid,
+    score_predictions,
+    sweep_elo
+    )
+
+
+def _facts(n=200, n_players=30, seed=0):
+    rng = np.random.default_rng(seed)
+    keys = np.stack([rng.permutation(np.arange(1, n_players + 1))[:4] for _ in range(n)]).astype(np.int32)
+    keys[::5, 1] = 0  # some singles / missing partners
+    home_won = rng.random(n) < 0.5
+    return pd.DataFrame({
+        'match_id': np.arange(n, dtype=np.int64) + 100,
+        'team_match_id': np.arange(n) // 6,
+        'date': pd.Timestamp('2024-06-01') + pd.to_timedelta(np.arange(n) // 6, unit='D'),
+        'division_key': np.ones(n, dtype=np.int16),
+        'line': (np.arange(n) % 6 + 1).astype(np.int8),
+        'home1_key': keys[:, 0], 'home2_key': keys[:, 1],
+        'away1_key': keys[:, 2], 'away2_key': keys[:, 3],
+        'home_won': home_won, 'away_won': ~home_won,
+    })
+
+
+def test_single_match_update():
+    engine = EloEngine(k_factor=32)
+    p = engine.update_match(1, 2, 3, 4, home_won=True)
+    assert p == pytest.approx(0.5)
+    assert engine.rating(1) == pytest.approx(1516)
+    assert engine.rating(4) == pytest.approx(1484)
+
+def test_doubles_use_partner_mean():
+    engine = EloEngine(k_factor=32)
+    engine.update_match(1, 0, 2, 0, home_won=True)    # 1516 vs 1484
+    p = engine.update_match(1, 3, 2, 4, home_won=False)
+    # Home pair averages 1508, away pair 1492
+    assert p == pytest.approx(1 / (1 + 10 ** (-16 / 400)))
+
+def test_division_offsets_set_starting_rating():
+    divisions = pd.DataFrame({'division_key': [1, 2], 'Division': ['Majors', 'C - North'],
+                              'division_level': ['Major', 'C']})
+    facts = _facts(n=1)
+    engine = EloEngine(division_offsets={'Major': 200})
+    result = engine.update_matches(facts.assign(division_key=1), divisions)
+    # Everyone started at 1700, so the first match was a coin flip
+    assert result['home_win_prob'].tolist() == [pytest.approx(0.5)]
+    assert sorted(engine.ratings_table()['rating'].round()) == [1684, 1716, 1716]
+
+def test_match_arrays_drops_unrateable_rows():
+    facts = _facts(n=6)
+    facts.loc[0, ['home_won', 'away_won']] = False
+    facts.loc[1, 'away1_key'] = 0
+    assert len(match_arrays(facts)['home1']) == 4
+
+def test_incremental_matches_full_replay(tmp_path):
+    facts = _facts()
+    full = EloEngine()
+    full.update_matches(facts)
+
+    streamed = EloEngine()
+    streamed.update_matches(facts.iloc[:120])
+    streamed.save(tmp_path / 'state.npz')
+    streamed = EloEngine.load(tmp_path / 'state.npz')
+    # Feeding the whole table again only rates the new matches
+    new = streamed.update_matches(facts)
+
+    assert len(new) == 80
+    assert streamed.n_matches == full.n_matches == 200
+    np.testing.assert_allclose(streamed.ratings[full.rated], full.ratings[full.rated])
+def test_single_matches_agree_with_batch_replay():
+    facts = _facts()
+    batch = EloEngine()
+    expected = batch.update_matches(facts)['home_win_prob'].to_numpy()
+
+    single = EloEngine()
+    arrays = match_arrays(facts)
+    probs = [
+        single.update_match(*(int(arrays[name][i]) for name in ['home1', 'home2', 'away1', 'away2']),
+                            home_won=arrays['outcome'][i] == 1.0)
+        for i in range(len(arrays['outcome']))
+    ]
+    np.testing.assert_allclose(probs, expected)
+    keys = np.flatnonzero(batch.rated)
+    np.testing.assert_allclose(single.ratings[keys], batch.ratings[keys])
+
+def _changed_slots(before, after):
+    return np.flatnonzero(~((before == after) | (np.isnan(before) & np.isnan(after))))
+
+def test_single_match_updates_touch_only_their_players():
+    engine = EloEngine(n_players=1000)
+    engine.update_matches(_facts(n=50))
+    ratings = engine.ratings
+
+    # Scalar path: four player slots, in place
+    before = ratings.copy()
+    engine.update_match(3, 4, 900, 901, home_won=True)
+    assert engine.ratings is ratings
+    assert _changed_slots(before, engine.ratings).tolist() == [3, 4, 900, 901]
+
+    # One-match chunk through update_matches: same, and only that match ID is added
+    match = _facts(n=1).assign(match_id=[7], home1_key=[5], home2_key=[6], away1_key=[902], away2_key=[903])
+    before = ratings.copy()
+    engine.update_matches(match)
+    assert engine.ratings is ratings
+    assert _changed_slots(before, engine.ratings).tolist() == [5, 6, 902, 903]
+    assert isinstance(engine.seen_match_ids, set) and 7 in engine.seen_match_ids
+
+# --- Test parameter sweeps ---
+
+def test_param_grid():
+    grid = param_grid([16, 32], [1500], [None, {'Major': 100}])
+    assert len(grid) == 4
+    assert grid['offset_Major'].tolist() == [0, 0, 100, 100]
+
+def test_independent_waves_keep_player_order():
+    arrays = match_arrays(_facts())
+    order, bounds = independent_waves(arrays['home1'], arrays['home2'], arrays['away1'], arrays['away2'])
+    assert sorted(order) == list(range(len(order)))
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        players = np.concatenate([arrays[k][order[lo:hi]] for k in ('home1', 'home2', 'away1', 'away2')])
+        players = players[players > 0]
+        assert len(players) == len(set(players))
+
+def test_sweep_matches_single_runs():
+    facts = _facts(n=300).assign(division_key=np.arange(300) % 2 + 1)
+    divisions = pd.DataFrame({'division_key': [1, 2], 'Division': ['Majors', 'C - North'],
+                              'division_level': ['Major', 'C']})
+    arrays = match_arrays(facts, divisions)
+    grid = param_grid([16, 40], [1400, 1500], [None, {'Major': 150}])
+
+    results = sweep_elo(arrays, grid, burn_in=50)
+
+    for config in results.itertuples(index=False):
+        engine = EloEngine(k_factor=config.k_factor, initial_rating=config.initial_rating,
+                           division_offsets={'Major': config.offset_Major})
+        expected = engine.update_matches(facts, divisions)['home_win_prob'].to_numpy()
+        scores = score_predictions(expected[50:], arrays['outcome'][50:])
+        assert config.log_loss == pytest.approx(scores['log_loss'], rel=1e-9)
+        assert config.brier == pytest.approx(scores['brier'], rel=1e-9)
+        assert config.n_scored == 250
@@ -0,0 +1,154 @@
+# tests/test_http_fetch.py
+
+import http.server
+import threading
+from urllib.parse import urlparse
+
+import pandas as pd
+import pytest
+from scripts.http_fetch import (
+    HttpFetcher,
+    discover_divisions,
+    load_division_matches_http,
+    option_url
+    )
+from scripts.roster_store import read_roster_table
+from scripts.scraper_utils import scrape_all_teams, scrape_season_divisions, scrape_roster_page
+from tests.html_samples import sample_division_page, roster_page_html, team_list_html
+
+
+def _site_pages():
+    """
+    A stand-in league site: entry page -> group page -> division pages -> Matches tab.
+    Division options use plain values sent as ?did=..., like a form GET.
+    """
+    entry = """<html><body>
+      <select id="arch_season_list"><option value="s23">2023</option><option selected value="s24">2024</option></select>
+      <select id="divgs_list"><option>Select a group</option><option value="/group.html">A Division</option></select>
+    </body></html>"""
+    group = """<html><body>
+      <select id="divgs_div_list" name="did">
+        <option value="">Select a division</option>
+        <option value="1">A - West</option>
+        <option value="2">A - East</option>
+      </select>
+    </body></html>"""
+    pages = {"/entry.html": entry, "/group.html": group}
+    for did, division in [("1", "A - West"), ("2", "A - East")]:
+        pages[f"/group.html?did={did}"] = f'<html><body><a href="/matches.html?did={did}">Matches</a></body></html>'
+        pages[f"/matches.html?did={did}"] = sample_division_page(division=division)
+    pages["/roster.html?team=7"] = roster_page_html("A - West", ["Alice"], ["Amy", "Bea"])
+    pages["/roster.html?team=8"] = roster_page_html("A - West", ["Cara"], ["Dee"])
+    pages["/roster.html?team=9"] = roster_page_html("A - East", ["Eve"], [])
+    pages["/teams.html"] = team_list_html([
+        ("A - West", "Toronto Aces", "7"),
+        ("A - West", "Oakville Rockets", "8"),
+        ("A - East", "Ajax Smash", "9"),
+    ])
+    return pages
+
+
+@pytest.fixture
+def site():
+    pages = _site_pages()
+    requests_seen = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+
+        def do_GET(self):
+            requests_seen.append(self.path)
+            body = pages.get(self.path)
+            if body is None:
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            data = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", requests_seen
+    server.shutdown()
+
+# --- Test option_url ---
+
+def test_option_url():
+    assert option_url("http://x/a/page.php?mod=1", "did", "5") == "http://x/a/page.php?mod=1&did=5"
+    assert option_url("http://x/a/page.php?mod=1", "did", "other.php?d=2") == "http://x/a/other.php?d=2"
+
+# --- Test against the stand-in site ---
+
+def test_discover_and_load(site):
+    base_url, _ = site
+    fetcher = HttpFetcher()
+
+    season, division_urls = discover_divisions(fetcher, f"{base_url}/entry.html")
+    assert season == "2024"
+    assert list(division_urls) == ["A - West", "A - East"]
+    assert urlparse(division_urls["A - East"]).query == "did=2"
+
+    html = load_division_matches_http(fetcher, division_urls["A - West"])
+    assert "match_results_table" in html
+    fetcher.quit()
+
+def test_discover_divisions_without_group_dropdown(site):
+    base_url, _ = site
+    fetcher = HttpFetcher()
+    with pytest.raises(ValueError, match="divgs_list"):
+        discover_divisions(fetcher, f"{base_url}/entry.html", group_index=5)
+    fetcher.quit()
+
+def test_scrape_season_divisions_http_backend(site, tmp_path):
+    base_url, requests_seen = site
+
+    scrape_season_divisions(
+        f"{base_url}/entry.html", store_path=str(tmp_path / "matches"),
+        max_workers=2, output_dir=str(tmp_path / "raw"), backend="http"
+    )
+
+    df = pd.read_csv(tmp_path / "raw" / "ic_mixed_matches_2024_A--East.csv")
+    assert len(df) == 4
+    assert df["Division"].unique().tolist() == ["A - East"]
+    assert "/matches.html?did=1" in requests_seen
+
+def test_roster_page_http_backend(site):
+    base_url, _ = site
+    players = scrape_roster_page(HttpFetcher(), f"{base_url}/roster.html?team=7", "Toronto Aces", "7")
+
+    assert [p["Name"] for p in players] == ["Alice", "Amy", "Bea"]
+    assert [p["Role"] for p in players] == ["Captain", "Player", "Player"]
+    assert players[0]["Division"] == "A - West"
+    assert players[0]["ID"] == "id-Alice"
+    assert players[0]["Suffix"] == "(S)"
+
+def test_scrape_all_teams_writes_one_roster_table(site, tmp_path):
+    base_url, requests_seen = site
+
+    players = scrape_all_teams(
+        f"{base_url}/teams.html", year="2024", backend="http",
+        max_workers=3, max_rate=50, output_dir=str(tmp_path)
+    )
+    assert len(players) == 6
+
+    roster = read_roster_table("2024", output_dir=str(tmp_path))
+    # Team-list order, regardless of which worker finished first
+    assert roster["Name"].tolist() == ["Alice", "Amy", "Bea", "Cara", "Dee", "Eve"]
+    assert roster["Team"].astype(str).tolist()[3:] == ["Oakville Rockets", "Oakville Rockets", "Ajax Smash"]
+    assert isinstance(roster["Division"].dtype, pd.CategoricalDtype)
+    assert not list(tmp_path.glob("ic_mixed_roster_2024_*"))
+    assert sum(path.startswith("/roster.html") for path in requests_seen) == 3
+
+    # A re-pull with nothing changed leaves the table and change log alone
+    mtime = (tmp_path / "ic_mixed_roster_2024.parquet").stat().st_mtime_ns
+    scrape_all_teams(f"{base_url}/teams.html", year="2024", backend="http", max_rate=50, output_dir=str(tmp_path))
+    assert (tmp_path / "ic_mixed_roster_2024.parquet").stat().st_mtime_ns == mtime
+    assert len(pd.read_csv(tmp_path / "roster_changes_2024.csv")) == 6
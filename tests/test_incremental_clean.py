@@ -0,0 +1,80 @@
+# tests/test_incremental_clean.py
+
+import pandas as pd
+import pytest
+from scripts.clean_metadata import clean_metadata_pipeline
+from scripts.incremental_clean import clean_incremental, input_files
+
+
+def _division_csv(path, division, home_team, date='6/3/2024'):
+    pd.DataFrame({
+        'Season': [2024, 2024],
+        'Division': [division, division],
+        'Date': [date, date],
+        'Home Team': [home_team, home_team],
+        'Away Team': ['Scarborough Smashers', 'Scarborough Smashers'],
+        'Line': [1, 2],
+        'Score': ['6-4, 6-3', '6-2, 6-1'],
+        'Home Player 1': ['Alice', 'Carol'],
+        'Home Player 2': ['Amy', 'Dan'],
+        'Away Player 1': ['Bea', 'Eve'],
+        'Away Player 2': ['Cat', 'Fred'],
+    }).to_csv(path, index=False)
+    return str(path)
+
+
+def test_incremental_runs(tmp_path):
+    cleaned = str(tmp_path / 'cleaned.parquet')
+    manifest = str(tmp_path / 'manifest.json')
+    a = _division_csv(tmp_path / 'a.csv', 'A - West', 'Toronto Aces')
+    b = _division_csv(tmp_path / 'b.csv', 'B - East', 'Oakville Rockets')
+
+    first = clean_incremental([a, b], cleaned, manifest)
+    assert sorted(first['cleaned']) == [a, b]
+    assert first['rows'] == 4
+
+    # No changes: nothing is cleaned
+    second = clean_incremental([a, b], cleaned, manifest)
+    assert second['cleaned'] == [] and second['rows'] == 4
+
+    # One new division: only it is cleaned, existing IDs are kept
+    ids_before = set(pd.read_parquet(cleaned)['temp_team_match_id'])
+    c = _division_csv(tmp_path / 'c.csv', 'C - North', 'Ajax Aces', date='5/1/2024')
+    third = clean_incremental([a, b, c], cleaned, manifest)
+    assert third['cleaned'] == [c]
+
+    df = pd.read_parquet(cleaned)
+    assert len(df) == 6
+    assert ids_before <= set(df['temp_team_match_id'])
+
+    # Same IDs as a full clean of everything at once
+    full = clean_metadata_pipeline(
+        pd.concat([pd.read_csv(p) for p in [a, b, c]], ignore_index=True), id_method='hash'
+    )
+    assert sorted(df['temp_match_id']) == sorted(full['temp_match_id'])
+
+def test_changed_and_removed_inputs(tmp_path):
+    cleaned = str(tmp_path / 'cleaned.parquet')
+    manifest = str(tmp_path / 'manifest.json')
+    a = _division_csv(tmp_path / 'a.csv', 'A - West', 'Toronto Aces')
+    b = _division_csv(tmp_path / 'b.csv', 'B - East', 'Oakville Rockets')
+    clean_incremental([a, b], cleaned, manifest)
+
+    _division_csv(tmp_path / 'a.csv', 'A - West', 'Milton Lobs')
+    summary = clean_incremental([a], cleaned, manifest)
+    assert summary['cleaned'] == [a]
+    assert summary['removed'] == [b]
+
+    df = pd.read_parquet(cleaned)
+    assert df['Home Team'].unique().tolist() == ['Milton Lobs']
+
+def test_input_files_prefers_the_parquet_store(tmp_path):
+    csv = _division_csv(tmp_path / 'ic_mixed_matches_a.csv', 'A - West', 'Toronto Aces')
+    csv_pattern = str(tmp_path / 'ic_mixed_matches*.csv')
+    store_pattern = str(tmp_path / 'matches' / '**' / '*.parquet')
+    assert input_files(store_pattern, csv_pattern) == [csv]
+
+    part = tmp_path / 'matches' / 'Season=2024'
+    part.mkdir(parents=True)
+    pd.read_csv(csv).to_parquet(part / 'a.parquet')
+    assert input_files(store_pattern, csv_pattern) == [str(part / 'a.parquet')]
@@ -0,0 +1,119 @@
+# tests/test_lineup.py
+
+from math import comb
+
+import numpy as np
+import pandas as pd
+import pytest
+import scripts.lineup as lineup
+from scripts.elo import EloEngine
+from scripts.lineup import LINE_RULES, optimize_lineup, pair_values, player_genders, search_lineups
+from scripts.predict import MatchupPredictor
+
+
+def _setup(n_ours, seed=0):
+    """
+    An engine with our n_ours players (keys 1..n_ours, alternating M / F) and
+    12 opponents (keys 101..112), all with random ratings.
+    """
+    rng = np.random.default_rng(seed)
+    engine = EloEngine()
+    engine._ensure_capacity(112)
+    keys = list(range(1, n_ours + 1)) + list(range(101, 113))
+    engine.ratings[keys] = rng.normal(1500, 120, len(keys))
+    engine.rated[keys] = True
+
+    roster = pd.DataFrame({
+        'Name': [f'Player {k}' for k in range(1, n_ours + 1)],
+        'ID': [f'id{k}' for k in range(1, n_ours + 1)],
+        'Gender': ['M' if k % 2 else 'F' for k in range(1, n_ours + 1)],
+    })
+    players = pd.DataFrame({'identity': roster['ID'], 'player_key': range(1, n_ours + 1)})
+    opponent = [(101 + 2 * i, 102 + 2 * i) for i in range(6)]
+    return MatchupPredictor(engine), roster, players, opponent
+
+
+def _brute_force(predictor, keys, genders, opponent):
+    """
+    Every complete lineup, by expected lines won.
+    """
+    n = len(keys)
+    pairs = {
+        line: [
+            ((1 << i) | (1 << j), predictor.predict_line((keys[i], keys[j]), opponent[line], line))
+            for i in range(n) for j in range(i + 1, n)
+            if not rule[0] or sorted([genders[i], genders[j]]) == sorted(rule)
+        ]
+        for line, rule in LINE_RULES.items()
+    }
+    values = []
+
+    def walk(lines, used, value):
+        if not lines:
+            values.append(value)
+            return
+        for mask, p in pairs[lines[0]]:
+            if not mask & used:
+                walk(lines[1:], used | mask, value + p)
+
+    walk(list(LINE_RULES), 0, 0.0)
+    return sorted(values, reverse=True)
+
+
+def test_player_genders():
+    roster = pd.DataFrame({'Name': ['Ann Lee', 'Bob Ray', 'Cam Poe'], 'ID': ['a', 'b', 'c'],
+                           'Gender': ['Female', None, 'x']})
+    assert player_genders(roster, mapping={'b': 'm', 'Cam Poe': 'F'}) == ['F', 'M', 'F']
+    assert player_genders(roster.drop(columns='Gender')) == [None, None, None]
+
+def test_search_matches_brute_force():
+    predictor, roster, players, opponent = _setup(13)
+    opponent = dict(zip(LINE_RULES, opponent))
+    keys, genders = list(range(1, 14)), ['F'] * 5 + ['M'] * 8
+    ratings = [predictor.pair_rating(k) for k in keys]
+    values = pair_values(ratings, {line: predictor.pair_rating(opponent[line]) for line in LINE_RULES}, predictor)
+
+    found = search_lineups(ratings, genders, values, top_k=5)
+    assert [value for value, _ in found] == pytest.approx(_brute_force(predictor, keys, genders, opponent)[:5])
+    for value, assignment in found:
+        assert sum(predictor.predict_line((keys[i], keys[j]), opponent[line], line)
+                   for line, (i, j) in assignment.items()) == pytest.approx(value)
+
+def test_optimize_lineup_respects_rules():
+    predictor, roster, players, opponent = _setup(20)
+    lineups = optimize_lineup(roster, opponent, predictor, players, top_k=3)
+
+    assert len(lineups) == 3
+    assert lineups[0]['expected_lines'] >= lineups[1]['expected_lines'] >= lineups[2]['expected_lines']
+
+    best = lineups[0]['lines']
+    assert best['Line_label'].tolist() == ['Ladies', 'Mixed 1', 'Mixed 2', 'Mens', 'Open 1', 'Open 2']
+    gender = dict(zip(roster['Name'], roster['Gender']))
+    line_genders = [sorted(gender[name] for name in pair) for pair in best['players']]
+    assert line_genders[:4] == [['F', 'F'], ['F', 'M'], ['F', 'M'], ['M', 'M']]
+    names = [name for pair in best['players'] for name in pair]
+    assert len(set(names)) == 12
+    assert best['win_prob'].sum() == pytest.approx(lineups[0]['expected_lines'])
+    assert lineups[0]['team']['expected_lines'] == pytest.approx(lineups[0]['expected_lines'])
+
+def test_optimize_lineup_scores_few_player_sets(monkeypatch):
+    predictor, roster, players, opponent = _setup(20, seed=3)
+    scored = []
+
+    def counting_score_set(*args):
+        scored.append(args)
+        return score_set(*args)
+
+    score_set = lineup._score_set
+    monkeypatch.setattr(lineup, '_score_set', counting_score_set)
+    optimize_lineup(roster, opponent, predictor, players, top_k=5)
+
+    # 10 women and 10 men give 123,480 possible sets of 12; domination leaves a few dozen
+    all_sets = sum(comb(10, women) * comb(10, 12 - women) for women in range(4, 9))
+    assert 0 < len(scored) < all_sets / 500
+
+def test_not_enough_women():
+    predictor, roster, players, opponent = _setup(20)
+    roster['Gender'] = ['M'] * 17 + ['F'] * 3
+    with pytest.raises(ValueError):
+        optimize_lineup(roster, opponent, predictor, players)
@@ -0,0 +1,68 @@
+# tests/test_match_store.py
+
+import pandas as pd
+import pytest
+from scripts.match_store import (
+    write_matches,
+    read_matches,
+    division_group
+    )
+
+
+def _matches_df():
+    return pd.DataFrame({
+        'Season': [2024, 2024, 2023, 2024],
+        'Division': ['A - West', 'B - East', 'A - West', 'Majors West'],
+        'Date': ['6/3/2024', '6/3/2024', '6/5/2023', '6/4/2024'],
+        'Home Team': ['Toronto Aces', 'Oakville Rockets', 'Toronto Aces', 'Barrie Bombers'],
+        'Away Team': ['Scarborough Smashers', 'Milton Lobs', 'Ajax Aces', 'Guelph Gophers'],
+        'Line': [1, 2, 1, 4],
+        'Score': ['6-4, 6-3', '6-2, 6-1', '7-6 [7-4], 6-0', '6-4, 6-4'],
+        'Defaulted': [False] * 4,
+        'Retired': [False] * 4,
+        'Home Won': [True, False, True, True],
+        'Away Won': [False, True, False, False],
+        'Home Player 1': ['Alice', 'Carol', 'Alice', 'Erin']
+    })
+
+# --- Test division_group ---
+
+def test_division_group():
+    assert division_group('Majors West') == 'Major'
+    assert division_group('B - East') == 'B'
+    assert division_group('Playoffs') == 'Other'
+
+# --- Test write / read ---
+
+def test_round_trip_with_pushdown(tmp_path):
+    write_matches(_matches_df(), tmp_path)
+
+    assert (tmp_path / 'Season=2024' / 'division_group=A').is_dir()
+
+    df = read_matches(tmp_path, seasons=[2024], division_groups=['A', 'Major'], columns=['Division', 'Line', 'Home Won'])
+    assert list(df.columns) == ['Division', 'Line', 'Home Won']
+    assert sorted(df['Division']) == ['A - West', 'Majors West']
+
+    everything = read_matches(tmp_path)
+    assert len(everything) == 4
+    assert everything['Home ID 1'].isna().all()
+
+def test_rewriting_a_division_replaces_only_that_division(tmp_path):
+    df = _matches_df()
+    write_matches(df, tmp_path)
+    write_matches(df.iloc[[0]].assign(Score='6-0, 6-0'), tmp_path)
+
+    result = read_matches(tmp_path, seasons=['2024'])
+    assert len(result) == 3
+    assert result.loc[result['Division'] == 'A - West', 'Score'].tolist() == ['6-0, 6-0']
+
+def test_divisions_with_the_same_file_stem_are_kept_apart(tmp_path):
+    df = _matches_df()
+    west = df[df['Division'] == 'A - West']
+    write_matches(west, tmp_path)
+    write_matches(west.assign(Division='A West'), tmp_path)
+    write_matches(west.assign(Division='A/West'), tmp_path)
+
+    result = read_matches(tmp_path, divisions=['A - West', 'A West', 'A/West'])
+    assert sorted(result['Division'].unique()) == ['A - West', 'A West', 'A/West']
+    assert len(result) == 3 * len(west)
@@ -0,0 +1,293 @@
+# tests/test_metadata_utils.py
+
+import numpy as np
+import pandas as pd
+import pytest
+import scripts.metadata_utils as metadata_utils
+from rapidfuzz import process
+from scripts.metadata_utils import (
+    fix_match_date,
+    fix_match_dates,
+    parse_division_level,
+    cast_division_level,
+    map_unique,
+    parse_division_levels,
+    validate_lines,
+    create_team_match_id,
+    create_match_id,
+    render_match_labels,
+    normalize_player_name,
+    soundex,
+    resolve_player_names,
+    apply_player_aliases,
+    update_player_aliases,
+    load_player_aliases
+    )
+
+# --- Test fix_match_dates ---
+
+def test_fix_match_dates_matches_scalar():
+    dates = pd.Series([
+        '2025-06-03', '6/3/2025', 'May 12th 2024', '2025/08/13 7:00 PM',
+        'invalid date', None, '2025-06-03', pd.Timestamp('2024-01-01')
+    ])
+
+    fixed, used_fallback = fix_match_dates(dates)
+
+    assert fixed.equals(dates.apply(fix_match_date))
+    assert used_fallback.tolist() == [False, False, True, True, True, False, False, True]
+
+def test_fix_match_dates_keeps_index():
+    dates = pd.Series(['6/3/2025', '6/3/2025'], index=[10, 20])
+
+    fixed, used_fallback = fix_match_dates(dates)
+
+    assert fixed.index.tolist() == [10, 20]
+    assert (fixed == pd.Timestamp('2025-06-03')).all()
+    assert not used_fallback.any()
+
+# --- Test unique-value mapping ---
+
+def test_map_unique_matches_apply():
+    divisions = pd.Series(['A - West', None, 'Majors - Central', 'X - Division', 'A - West'])
+    assert map_unique(divisions, parse_division_level).tolist() == divisions.apply(parse_division_level).tolist()
+
+def test_map_unique_calls_func_once_per_value():
+    calls = []
+
+    def spy(value):
+        calls.append(value)
+        return value
+
+    map_unique(pd.Series(['a', 'b'] * 1000), spy)
+    assert len(calls) == 3  # two distinct values plus one for missing
+
+def test_parse_division_levels_matches_cast():
+    divisions = pd.Series(['C - North', 'Major - East', None, 'B 2', 'Q'], index=[5, 6, 7, 8, 9])
+    result = parse_division_levels(divisions)
+    expected = cast_division_level(divisions.apply(parse_division_level))
+    assert result.equals(expected)
+    assert result.cat.ordered is True
+
+def test_validate_lines():
+    lines = pd.Series([1, 6, 7, 'Mixed Doubles', None, 3])
+    result = validate_lines(lines)
+    assert str(result.dtype) == 'Int64'
+    assert result.tolist() == [1, 6, pd.NA, pd.NA, pd.NA, 3]
+
+# --- Test ID assignment ---
+
+def _team_match_df():
+    return pd.DataFrame({
+        'Date_fixed': pd.to_datetime(['2025-06-03', '2025-06-01', '2025-06-01']),
+        'Division': ['A', 'A', 'A'],
+        'Home Team': ['Oakville Rockets', 'Toronto Aces', 'Toronto Aces'],
+        'Away Team': ['Mississauga Smashers', 'Scarborough Smashers', 'Scarborough Smashers'],
+        'Line_validated': pd.array([1, 2, 1], dtype='Int64'),
+        'Home Player 1': ['Charlie', 'Alice', 'Alice'],
+        'Home Player 2': ['Charlie2', 'Alice2', 'Alice2'],
+        'Away Player 1': ['David', 'Bob', 'Bob'],
+        'Away Player 2': ['David2', 'Bob2', 'Bob2']
+    })
+
+def test_create_team_match_id_sequential():
+    df_result = create_team_match_id(_team_match_df())
+    assert df_result['temp_team_match_id'].tolist() == [1, 1, 2]
+
+def test_hash_ids_stable_when_data_is_added():
+    df = _team_match_df()
+
+    full = create_match_id(create_team_match_id(df, id_method='hash'), id_method='hash')
+    subset = create_match_id(create_team_match_id(df.iloc[[0]], id_method='hash'), id_method='hash')
+
+    oakville = full[full['Home Team'] == 'Oakville Rockets']
+    assert subset['temp_team_match_id'].tolist() == oakville['temp_team_match_id'].tolist()
+    assert subset['temp_match_id'].tolist() == oakville['temp_match_id'].tolist()
+    assert full['temp_match_id'].nunique() == len(full)
+
+def test_hash_ids_ignore_dtypes():
+    df = _team_match_df()
+    df_float = df.assign(Line_validated=df['Line_validated'].astype('float64'))
+
+    ids = create_match_id(df, id_method='hash')['temp_match_id']
+    ids_float = create_match_id(df_float, id_method='hash')['temp_match_id']
+    assert ids.tolist() == ids_float.tolist()
+
+def test_hash_ids_treat_all_missing_values_alike():
+    df = _team_match_df()
+    ids = []
+    for missing in [None, np.nan, pd.NA]:
+        rows = df.astype({'Away Player 2': 'object'})
+        rows['Away Player 2'] = [missing] * len(rows)
+        ids.append(create_match_id(rows, id_method='hash')['temp_match_id'].tolist())
+    # Same missing partner, read as a string column (e.g. from Parquet)
+    rows = df.assign(**{'Away Player 2': pd.array([None] * len(df), dtype='string')})
+    ids.append(create_match_id(rows, id_method='hash')['temp_match_id'].tolist())
+
+    assert ids[1:] == ids[:1] * 3
+
+def test_unknown_id_method():
+    with pytest.raises(ValueError):
+        create_team_match_id(_team_match_df(), id_method='random')
+
+# --- Test labels ---
+
+def test_team_match_labels_are_categorical():
+    df_result = create_team_match_id(_team_match_df())
+
+    assert isinstance(df_result['team_match_id_label'].dtype, pd.CategoricalDtype)
+    assert len(df_result['team_match_id_label'].cat.categories) == 2
+    assert df_result.loc[0, 'team_match_id_label'] == '2025-06-01 A Toronto Aces vs Scarborough Smashers'
+
+def test_labels_rendered_on_demand():
+    df_result = create_match_id(_team_match_df(), labels=None)
+    assert 'match_id_label' not in df_result.columns
+
+    eager = create_match_id(_team_match_df(), labels='string')
+    assert render_match_labels(df_result).tolist() == eager['match_id_label'].tolist()
+    assert '(1 - Ladies) - Alice & Alice2 vs Bob & Bob2' in eager.loc[0, 'match_id_label']
+
+
+# --- Test player name resolution ---
+
+def _player_rows():
+    """
+    Name variants across two divisions: 'Jon Smith' / 'Smith, Jon' / 'Jon Smyth'
+    (one player), 'Joan Smith' (a different player with her own ID).
+    """
+    return pd.DataFrame({
+        'temp_team_match_id': [1, 2, 3, 4],
+        'Season': [2024, 2024, 2024, 2024],
+        'Division': ['A', 'A', 'A', 'B'],
+        'Home Player 1': ['Jon Smith', 'Smith, Jon', 'Jon Smyth', 'Jon Smith'],
+        'Home ID 1': ['j1', None, 'N/A', 'j1'],
+        'Away Player 1': ['Joan Smith', 'Joan Smith', 'Ann Lee', 'Ann Lee'],
+        'Away ID 1': ['j2', 'j2', None, None],
+    })
+
+def test_normalize_player_name_and_soundex():
+    assert normalize_player_name('  Smith,  Jón ') == 'jon smith'
+    assert normalize_player_name("Mary-Kate O'Neil") == 'mary kate oneil'
+    assert normalize_player_name(None) is None
+    assert soundex('Robert') == soundex('Rupert') == 'R163'
+    assert soundex('Ashcraft') == 'A261'
+    assert soundex('Smith') == soundex('Smyth')
+
+def test_resolve_player_names_merges_variants():
+    aliases = resolve_player_names(_player_rows(), threshold=85).set_index('name')
+
+    assert aliases.loc['jon smyth', 'canonical'] == 'jon smith'
+    assert aliases.loc['jon smyth', 'source'] == 'fuzzy'
+    assert aliases.loc['jon smith', 'player_id'] == 'j1'
+    # Similar name, but both sides have different IDs in the same season
+    assert aliases.loc['joan smith', 'canonical'] == 'joan smith'
+    assert aliases.loc['ann lee', 'display_name'] == 'Ann Lee'
+
+def test_one_letter_apart_first_names_stay_apart():
+    rows = pd.DataFrame({
+        'temp_team_match_id': [1, 2, 3],
+        'Division': ['A', 'A', 'A'],
+        'Home Player 1': ['John Smith', 'Joan Smith', 'Jonathan Smith'],
+        'Away Player 1': ['Ann Lee', 'Bo Ray', 'Jonathon Smith'],
+    })
+    aliases = resolve_player_names(rows).set_index('name')['canonical']
+    assert aliases['john smith'] != aliases['joan smith']
+    # Partners in the same team match are two people, however close the names
+    assert aliases['jonathan smith'] != aliases['jonathon smith']
+
+def test_changed_id_is_resolved():
+    rows = pd.DataFrame({
+        'temp_team_match_id': [1, 2, 3],
+        'Season': [2023, 2023, 2024],
+        'Division': ['A', 'A', 'A'],
+        'Home Player 1': ['Jonathan Smith', 'Jonathan Smith', 'Jonathon Smith'],
+        'Home ID 1': ['old1', 'old1', 'new1'],
+    })
+    aliases = resolve_player_names(rows).set_index('name')
+    assert aliases.loc['jonathon smith', 'canonical'] == 'jonathan smith'
+    assert aliases.loc['jonathan smith', 'player_id'] == 'new1'
+
+    resolved = apply_player_aliases(rows, aliases.reset_index())
+    assert resolved['Home ID 1'].tolist() == ['new1'] * 3
+    assert resolved['Home Player 1'].tolist() == ['Jonathan Smith'] * 3
+
+    # The same two IDs in one season belong to two players
+    same_season = resolve_player_names(rows.assign(Season=2024)).set_index('name')
+    assert same_season.loc['jonathon smith', 'canonical'] == 'jonathon smith'
+
+def test_apply_player_aliases_fills_names_and_ids():
+    rows = _player_rows()
+    resolved = apply_player_aliases(rows, resolve_player_names(rows, threshold=85))
+
+    assert resolved['Home Player 1'].tolist() == ['Jon Smith'] * 4
+    assert resolved['Home ID 1'].tolist() == ['j1'] * 4
+    assert resolved['Away ID 1'].isna().tolist() == [False, False, True, True]
+    assert rows.loc[2, 'Home Player 1'] == 'Jon Smyth'  # input untouched
+
+def test_alias_table_reuses_decisions(tmp_path):
+    path = str(tmp_path / 'aliases.csv')
+    first = update_player_aliases(_player_rows(), path=path, threshold=85)
+
+    # Override a decision by hand: Jon Smyth is someone else
+    edited = first.set_index('name')
+    edited.loc['jon smyth', ['canonical', 'display_name', 'source']] = ['jon smyth', 'Jon Smyth', 'manual']
+    edited.reset_index().to_csv(path, index=False)
+
+    # 'Jon Smithe' is close to both Jon Smith and Jon Smyth
+    more = pd.concat([_player_rows(), pd.DataFrame({
+        'temp_team_match_id': [5], 'Season': [2024], 'Division': ['A'],
+        'Home Player 1': ['Jon Smithe'], 'Away Player 1': ['Ann Leigh'],
+    })], ignore_index=True)
+    second = update_player_aliases(more, path=path, threshold=85).set_index('name')
+    before = first.set_index('name')
+
+    assert second.loc['jon smyth', 'canonical'] == 'jon smyth'
+    assert second.loc['jon smyth', 'source'] == 'manual'
+    # Every earlier name keeps its canonical; the new name joins at most one group
+    for name in ['jon smith', 'joan smith', 'ann lee']:
+        assert second.loc[name, 'canonical'] == before.loc[name, 'canonical']
+        assert second.loc[name, 'resolved_at'] == before.loc[name, 'resolved_at']
+    assert second.loc['jon smithe', 'canonical'] in ('jon smith', 'jon smyth')
+    assert second.loc['jon smith', 'canonical'] != second.loc['jon smyth', 'canonical']
+    assert len(load_player_aliases(path)) == len(second)
+
+def test_resolve_player_names_compares_only_within_blocks(monkeypatch):
+    # ~10,000 distinct players, each in one division, over 40,000 rows
+    rng = np.random.default_rng(0)
+    syllables = ['ba', 'ker', 'lin', 'mor', 'son', 'ta', 'vel', 'ri', 'chen', 'do', 'gan', 'wei', 'pat', 'el', 'ro']
+    first = np.array([a.title() + b for a in syllables for b in syllables])
+    last = np.array([a.title() + b + c for a in syllables for b in syllables for c in ['', 'ton', 'ley', 'er']])
+    n_players, n = 10000, 40000
+    players = pd.DataFrame({
+        'name': pd.Series(rng.choice(first, n_players)) + ' ' + pd.Series(rng.choice(last, n_players)),
+        'division': rng.choice(['A', 'B', 'C', 'Major'], n_players),
+    }).drop_duplicates('name')
+    home = players.iloc[rng.integers(0, len(players), n)]
+    away = players.iloc[rng.integers(0, len(players), n)]
+    df = pd.DataFrame({
+        'temp_team_match_id': np.arange(n) // 6,
+        'Division': home['division'].to_numpy(),
+        'Home Player 1': home['name'].to_numpy(), 'Home ID 1': None,
+        'Away Player 1': away['name'].to_numpy(), 'Away ID 1': None,
+    })
+    n_names = pd.concat([df['Home Player 1'], df['Away Player 1']]).nunique()
+
+    compared = []
+
+    class CountingProcess:
+        @staticmethod
+        def cdist(queries, choices, **kwargs):
+            compared.append(len(queries) * len(choices))
+            return process.cdist(queries, choices, **kwargs)
+
+    monkeypatch.setattr(metadata_utils, 'process', CountingProcess)
+    aliases = resolve_player_names(df)
+    assert len(aliases) == n_names
+    # Blocking keeps the fuzzy comparisons far below all pairs of names
+    assert 0 < sum(compared) < n_names ** 2 / 50
+
+    # A later run only scores the new names
+    compared.clear()
+    newcomer = df.iloc[:6].assign(**{'Home Player 1': 'Zed Newcomer', 'temp_team_match_id': -1})
+    resolve_player_names(pd.concat([df, newcomer]), aliases=aliases)
+    assert sum(compared) < len(df)
@@ -0,0 +1,84 @@
+# tests/test_page_readiness.py
+
+import pytest
+from selenium.common.exceptions import TimeoutException
+from scripts.page_readiness import (
+    NO_MATCHES_XPATH,
+    LatencyRecorder,
+    elements_stable,
+    require_navigation,
+    wait_for_stable
+    )
+
+
+class GrowingPage:
+    """
+    Fake driver whose match tables appear a few at a time, then stop changing.
+    """
+    def __init__(self, counts, no_matches=False):
+        self.counts = counts
+        self.no_matches = no_matches
+        self.calls = 0
+
+    def find_elements(self, by, value):
+        if by == "xpath":
+            return [object()] if self.no_matches else []
+        count = self.counts[min(self.calls, len(self.counts) - 1)]
+        self.calls += 1
+        return [object()] * count
+
+# --- Test wait conditions ---
+
+def test_elements_stable_waits_for_count_to_settle():
+    page = GrowingPage([0, 2, 5, 5, 5])
+    condition = elements_stable(("css selector", "div.match_results_table"), polls=2)
+
+    results = [condition(page) for _ in range(4)]
+    assert results[:3] == [False, False, False]
+    assert len(results[3]) == 5
+
+def test_wait_for_stable_returns_elements():
+    page = GrowingPage([1, 3, 3])
+    elements = wait_for_stable(page, "div.match_results_table", timeout=2, poll_interval=0.01)
+    assert len(elements) == 3
+
+def test_wait_for_stable_raises_on_timeout():
+    page = GrowingPage([0])
+    with pytest.raises(TimeoutException, match="div.match_results_table"):
+        wait_for_stable(page, "div.match_results_table", timeout=0.1, poll_interval=0.01)
+
+def test_wait_for_stable_returns_at_once_on_empty_division():
+    page = GrowingPage([0], no_matches=True)
+    assert wait_for_stable(page, "div.match_results_table", timeout=5, empty_xpath=NO_MATCHES_XPATH) == []
+    assert page.calls == 1  # the first poll saw the marker
+
+class StillThere:
+    """
+    An element that never goes stale: the page did not change.
+    """
+    def is_enabled(self):
+        return True
+
+def test_require_navigation_raises_when_page_does_not_change():
+    with pytest.raises(TimeoutException, match="selecting division"):
+        require_navigation(object(), StillThere(), "selecting division 'A - West'", timeout=0.3)
+
+# --- Test LatencyRecorder ---
+
+def test_latency_recorder_summary_and_histogram():
+    recorder = LatencyRecorder()
+    for seconds in [0.1, 0.2, 1.5]:
+        recorder.record("open_matches", seconds)
+    with recorder.time("parse_matches"):
+        pass
+
+    summary = recorder.summary()
+    assert summary.loc["open_matches", "count"] == 3
+    assert summary.loc["open_matches", "max"] == pytest.approx(1.5)
+
+    histogram = recorder.histogram()
+    assert histogram.loc["open_matches"].sum() == 3
+    assert histogram.loc["parse_matches"].iloc[0] == 1
+
+    recorder.reset()
+    assert recorder.samples().empty
@@ -0,0 +1,93 @@
+# tests/test_predict.py
+
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+from scripts.elo import EloEngine
+from scripts.predict import MatchupPredictor, fit_line_adjustments, known_pairs_from
+
+
+def _engine():
+    engine = EloEngine(k_factor=32)
+    engine.update_match(1, 2, 3, 4, home_won=True)   # 1, 2 -> 1516; 3, 4 -> 1484
+    engine.update_match(5, 6, 7, 8, home_won=False)  # 5, 6 -> 1484; 7, 8 -> 1516
+    return engine
+
+
+def test_predict_line_matches_elo_expectation():
+    predictor = MatchupPredictor(_engine())
+    p = predictor.predict_line((1, 2), (3, 4), line='Mixed 1')
+    assert p == pytest.approx(1 / (1 + 10 ** (-32 / 400)))
+    assert predictor.predict_line((3, 4), (1, 2), line=2) == pytest.approx(1 - p)
+    # Order of partners doesn't matter
+    assert predictor.pair_rating((2, 1)) == predictor.pair_rating((1, 2))
+
+def test_unknown_player_raises():
+    with pytest.raises(KeyError):
+        MatchupPredictor(_engine()).predict_line((1, 99), (3, 4))
+
+def test_lru_cache_and_refresh():
+    engine = _engine()
+    predictor = MatchupPredictor(engine, cache_size=2, known_pairs=[(1, 2)])
+    predictor.pair_rating((1, 2))
+    predictor.pair_rating((3, 4))
+    predictor.pair_rating((5, 6))  # evicts (1, 2), the least recently used
+    assert predictor.cache_info()['size'] == 2
+    assert predictor.cache_info()['hits'] == 1
+
+    before = predictor.pair_rating((3, 4))
+    engine.update_match(3, 4, 1, 2, home_won=True)
+    assert predictor.pair_rating((3, 4)) > before
+
+def test_team_match_distribution():
+    predictor = MatchupPredictor(_engine())
+    lineup = [((1, 2), (3, 4))] * 3 + [((5, 6), (7, 8))] * 3
+    result = predictor.predict_team_match(lineup)
+
+    p = result['line_probs'][0]
+    assert result['line_probs'][3] == pytest.approx(1 - p)
+    assert sum(result['lines_won_dist']) == pytest.approx(1)
+    assert result['expected_lines'] == pytest.approx(3)
+    assert result['home_win'] == pytest.approx(result['away_win'])
+    assert result['home_win'] + result['tie'] + result['away_win'] == pytest.approx(1)
+    # Exactly 6 lines won: all three favoured lines and all three underdog lines
+    assert result['lines_won_dist'][6] == pytest.approx(p ** 3 * (1 - p) ** 3)
+
+def test_repeated_team_matches_hit_the_cache():
+    predictor = MatchupPredictor(_engine())
+    lineup = [((1, 2), (3, 4)), ((5, 6), (7, 8))] * 3
+    predictor.predict_team_match(lineup)
+    first = predictor.cache_info()
+    assert first['misses'] == 4
+
+    for _ in range(1000):
+        predictor.predict_team_match(lineup)
+    # Every later pair lookup is a cache hit: no rating recomputed, no refresh
+    info = predictor.cache_info()
+    assert info['misses'] == first['misses']
+    assert info['hits'] == first['hits'] + 1000 * 12
+
+def test_fit_line_adjustments():
+    rng = np.random.default_rng(0)
+    x = rng.normal(0, 1, 6000)
+    line = np.repeat(np.arange(1, 7), 1000)
+    # Line 4 results are twice as predictable as the ratings suggest
+    slope = np.where(line == 4, 2.0, 1.0)
+    outcome = (rng.random(6000) < 1 / (1 + np.exp(-slope * x))).astype(float)
+    predictions = pd.DataFrame({'home_win_prob': 1 / (1 + np.exp(-x)), 'outcome': outcome, 'line': line})
+
+    adjustments = fit_line_adjustments(predictions)
+    assert adjustments.loc[4, 'Line_label'] == 'Mens'
+    assert adjustments.loc[4, 'slope'] == pytest.approx(2.0, abs=0.3)
+    assert adjustments.loc[1, 'slope'] == pytest.approx(1.0, abs=0.2)
+
+    predictor = MatchupPredictor(_engine(), line_adjustments=adjustments)
+    assert predictor.predict_line((1, 2), (3, 4), 'Mens') > predictor.predict_line((1, 2), (3, 4), 'Ladies')
+
+def test_known_pairs_from_facts():
+    facts = pd.DataFrame({'home1_key': [1, 2, 1], 'home2_key': [2, 1, 0],
+                          'away1_key': [3, 3, 4], 'away2_key': [4, 4, 5]})
+    assert known_pairs_from(facts)[-1] in [(2, 1), (4, 3)]
+    assert sorted(known_pairs_from(facts)) == [(2, 1), (4, 3), (5, 4)]
@@ -0,0 +1,159 @@
+# tests/test_roster_store.py
+
+import threading
+import time
+
+import pandas as pd
+from scripts.roster_store import (
+    ROSTER_COLUMNS,
+    changes_path,
+    read_roster_table,
+    roster_fingerprint,
+    roster_table,
+    team_key,
+    update_roster_table,
+    write_roster_table
+    )
+from scripts.scraper_utils import RateLimiter
+
+
+def _player(name, team="Toronto Aces", role="Player", team_id="7"):
+    return {
+        "Division": "A - West", "Team": team, "Team ID": team_id,
+        "Name": name, "Suffix": "(S)", "ID": f"id-{name}", "Role": role,
+    }
+
+# --- Test roster_table ---
+
+def test_roster_table_types():
+    df = roster_table([_player("Alice", role="Captain"), _player("Amy")], 2024)
+
+    assert df.columns.tolist() == ROSTER_COLUMNS
+    assert df["Season"].tolist() == ["2024", "2024"]
+    assert isinstance(df["Team"].dtype, pd.CategoricalDtype)
+    assert isinstance(df["Role"].dtype, pd.CategoricalDtype)
+    assert df["Name"].dtype == "string"
+
+def test_roster_table_empty():
+    df = roster_table([], "2024")
+    assert df.empty
+    assert df.columns.tolist() == ROSTER_COLUMNS
+
+def test_roster_table_keeps_missing_values_missing():
+    df = roster_table([_player("Alice", role=None, team_id=None)], "2024")
+    assert df["Role"].isna().all()
+    assert df["Team ID"].isna().all()
+    assert "None" not in df["Role"].cat.categories
+
+# --- Test write / read ---
+
+def test_write_and_read_roster_table(tmp_path):
+    df = roster_table([_player("Alice"), _player("Cara", team="Oakville Rockets")], "2024")
+    write_roster_table(df, "2024", output_dir=tmp_path)
+
+    loaded = read_roster_table("2024", output_dir=tmp_path)
+    pd.testing.assert_frame_equal(loaded, df)
+    assert read_roster_table("2023", output_dir=tmp_path) is None
+    assert read_roster_table("2024", output_dir=tmp_path, columns=["Name"]).columns.tolist() == ["Name"]
+
+# --- Test change detection ---
+
+def test_roster_fingerprint_ignores_order_and_whitespace():
+    a = [_player("Alice", role="Captain"), _player("Amy")]
+    b = [_player("Amy"), dict(_player("Alice", role="Captain"), Name=" Alice ")]
+    assert roster_fingerprint(a) == roster_fingerprint(b)
+    assert roster_fingerprint(a) != roster_fingerprint(a[:1])
+
+def test_update_roster_table_skips_unchanged_teams(tmp_path):
+    aces = [_player("Alice", role="Captain"), _player("Amy")]
+    rockets = [_player("Cara", team="Oakville Rockets", team_id="8")]
+
+    first = update_roster_table({"7": aces, "8": rockets}, "2024", output_dir=tmp_path, detected_at="w1")
+    assert first["changed"] == ["7", "8"]
+    assert first["changes"]["change"].tolist() == ["added"] * 3
+
+    second = update_roster_table({"7": aces, "8": rockets}, "2024", output_dir=tmp_path, detected_at="w2")
+    assert second["changed"] == []
+    assert second["unchanged"] == 2
+    assert second["path"] is None
+    assert second["changes"].empty
+
+def test_update_roster_table_diffs_changed_team(tmp_path):
+    aces = [_player("Alice", role="Captain"), _player("Amy")]
+    rockets = [_player("Cara", team="Oakville Rockets", team_id="8")]
+    update_roster_table({"7": aces, "8": rockets}, "2024", output_dir=tmp_path, detected_at="w1")
+
+    # Amy leaves, Bea joins; the Rockets page failed to load this week
+    update = update_roster_table(
+        {"7": [_player("Alice", role="Captain"), _player("Bea")]}, "2024", output_dir=tmp_path, detected_at="w2"
+    )
+    assert update["changed"] == ["7"]
+    changes = update["changes"]
+    assert list(zip(changes["change"], changes["Name"])) == [("added", "Bea"), ("removed", "Amy")]
+
+    roster = read_roster_table("2024", output_dir=tmp_path)
+    assert roster["Name"].tolist() == ["Alice", "Bea", "Cara"]
+
+    log = pd.read_csv(changes_path("2024", tmp_path))
+    assert log["detected_at"].tolist() == ["w1"] * 3 + ["w2"] * 2
+
+def test_update_roster_table_logs_role_changes(tmp_path):
+    update_roster_table({"7": [_player("Alice", role="Captain"), _player("Amy")]}, "2024",
+                        output_dir=tmp_path, detected_at="w1")
+
+    # Amy takes over as captain: same players, new roles
+    update = update_roster_table({"7": [_player("Alice"), _player("Amy", role="Captain")]}, "2024",
+                                 output_dir=tmp_path, detected_at="w2")
+    assert update["changed"] == ["7"]
+    changes = update["changes"]
+    assert list(zip(changes["change"], changes["Name"], changes["Role"])) == [
+        ("modified", "Alice", "Player"), ("modified", "Amy", "Captain")
+    ]
+
+def test_update_roster_table_keys_teams_without_id_by_division_and_team(tmp_path):
+    aces = [_player("Alice", team_id="N/A")]
+    rockets = [_player("Cara", team="Oakville Rockets", team_id=None)]
+    assert team_key("A - West", "Toronto Aces", "N/A") == "A - West / Toronto Aces"
+    assert team_key("A - West", "Toronto Aces", "7") == "7"
+
+    first = update_roster_table({"aces": aces, "rockets": rockets}, "2024", output_dir=tmp_path, detected_at="w1")
+    assert first["changed"] == ["A - West / Toronto Aces", "A - West / Oakville Rockets"]
+
+    # Only the Aces were refreshed: the Rockets' rows stay
+    update_roster_table({"aces": aces + [_player("Amy", team_id="N/A")]}, "2024", output_dir=tmp_path, detected_at="w2")
+    roster = read_roster_table("2024", output_dir=tmp_path)
+    assert sorted(roster["Name"]) == ["Alice", "Amy", "Cara"]
+
+def test_update_roster_table_treats_empty_roster_as_failed_fetch(tmp_path):
+    aces = [_player("Alice", role="Captain"), _player("Amy")]
+    update_roster_table({"7": aces}, "2024", output_dir=tmp_path, detected_at="w1")
+
+    update = update_roster_table({"7": []}, "2024", output_dir=tmp_path, detected_at="w2")
+    assert update["empty"] == ["7"]
+    assert update["changed"] == []
+    assert update["changes"].empty
+    assert read_roster_table("2024", output_dir=tmp_path)["Name"].tolist() == ["Alice", "Amy"]
+
+    # The next successful fetch is still compared against the last good roster
+    assert update_roster_table({"7": aces}, "2024", output_dir=tmp_path, detected_at="w3")["changed"] == []
+
+# --- Test RateLimiter ---
+
+def test_rate_limiter_spaces_calls_across_threads():
+    limiter = RateLimiter(50)
+    times = []
+
+    def worker():
+        for _ in range(3):
+            limiter.wait()
+            times.append(time.monotonic())
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    times.sort()
+    # 9 calls at ≤ 50/s take at least 8 intervals of 20ms
+    assert times[-1] - times[0] >= 8 * 0.02 - 0.01
@@ -0,0 +1,204 @@
+# tests/test_scraper_utils.py
+
+import functools
+import http.server
+import threading
+import time
+from urllib.request import urlopen
+
+import numpy as np
+import pandas as pd
+import pytest
+import scripts.scraper_utils as scraper_utils
+from scripts.scraper_utils import (
+    clear_malformed_player_ids,
+    decode_player_id,
+    decode_player_ids,
+    extract_all_matches,
+    extract_all_matches_lxml,
+    malformed_player_ids,
+    run_driver_pool,
+    scrape_all_teams,
+    scrape_division
+    )
+from tests.html_samples import (
+    player_href,
+    sample_division_page,
+    division_page_html,
+    fixture_html,
+    match_line_html
+    )
+
+
+@pytest.fixture
+def static_server(tmp_path):
+    """
+    Serve tmp_path over HTTP on localhost, standing in for the league site.
+    """
+    handler = functools.partial(http.server.SimpleHTTPRequestHandler, directory=str(tmp_path))
+    handler.log_message = lambda *args: None
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+class FakeDriver:
+    """
+    Minimal stand-in for a Selenium driver that fetches pages over plain HTTP.
+    """
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.pages = 0
+        self.closed = False
+
+    def load_division(self, division):
+        self.pages += 1
+        time.sleep(0.05)  # stand-in for page load time
+        return urlopen(f"{self.base_url}/{division}.html").read().decode("utf-8")
+
+    def quit(self):
+        self.closed = True
+
+# --- Test player ID decoding ---
+
+def test_decode_player_id_reports_malformed():
+    clear_malformed_player_ids()
+    assert decode_player_id(player_href("p-1")) == "p-1"
+    assert decode_player_id("/player.php?p=not-base64") == "not-base64"
+    assert decode_player_id("/player.php") == "N/A"
+    # Cached repeats are not reported twice
+    decode_player_id("/player.php")
+
+    malformed = malformed_player_ids()
+    assert malformed["href"].tolist() == ["/player.php?p=not-base64", "/player.php"]
+    assert malformed["reason"].tolist()[1] == "no p parameter"
+
+    clear_malformed_player_ids()
+    assert malformed_player_ids().empty
+
+def test_decode_player_ids_bulk():
+    hrefs = [player_href("p-1"), player_href("p-2"), player_href("p-1")]
+    assert decode_player_ids(hrefs) == ["p-1", "p-2", "p-1"]
+
+    series = pd.Series(hrefs, index=[10, 11, 12], name="href")
+    decoded = decode_player_ids(series)
+    assert decoded.tolist() == ["p-1", "p-2", "p-1"]
+    assert decoded.index.tolist() == [10, 11, 12]
+
+    # Missing anchors are "N/A", not malformed
+    clear_malformed_player_ids()
+    missing = pd.Series([hrefs[0], None, np.nan])
+    assert decode_player_ids(missing).tolist() == ["p-1", "N/A", "N/A"]
+    assert decode_player_ids([hrefs[0], None, np.nan]) == ["p-1", "N/A", "N/A"]
+    assert malformed_player_ids().empty
+
+# --- Test extract_all_matches ---
+
+def test_extract_all_matches_sample_page():
+    matches = extract_all_matches(sample_division_page(), "2024", "A - West")
+
+    assert len(matches) == 4
+    assert matches[0]["Home Team"] == "Toronto Aces"
+    assert matches[1]["Line"] == 2
+    assert matches[0]["Home ID 1"] == "id-Alice"
+    assert matches[2]["Retired"] and matches[2]["Away Won"]
+    assert matches[3]["Defaulted"]
+
+# --- Test the lxml engine ---
+
+def test_lxml_engine_matches_bs4_engine():
+    odd_lines = [
+        match_line_html(["Di &amp; Co", "Ed"], ["Fa", "Gi"], "6-4, 6-3", note="<b>Retired</b>"),
+        match_line_html(["Al", "Bo"], ["Fa", "Gi"], "6-4, 6-3", note="<!--Default-->"),
+        match_line_html([], [], "N/A"),
+        match_line_html(["Al"], ["Fa", "Gi"], "6-0, 6-0", note="Forfeit"),
+        match_line_html(["Al", "Bo"], ["Fa", "Gi"], "6-1").replace("href=", "data-href=", 1),
+    ]
+    pages = [
+        sample_division_page(),
+        division_page_html([fixture_html("7/1/2024", "T&amp;A", "B", odd_lines)]),
+        "<html><body>No matches yet</body></html>",
+    ]
+
+    for page in pages:
+        assert extract_all_matches_lxml(page, "2024", "A - West") == extract_all_matches(page, "2024", "A - West")
+
+# --- Test the driver pool ---
+
+def test_run_driver_pool_reuses_drivers(static_server, tmp_path):
+    divisions = [f"div-{i}" for i in range(12)]
+    for division in divisions:
+        (tmp_path / f"{division}.html").write_text(sample_division_page(division=division))
+
+    drivers = []
+
+    def factory():
+        driver = FakeDriver(static_server)
+        drivers.append(driver)
+        return driver
+
+    results = run_driver_pool(
+        divisions,
+        lambda d, division: scrape_division(
+            d, division, "2024", output_dir=str(tmp_path / "raw"),
+            load_html=lambda driver, name: driver.load_division(name)
+        ),
+        factory,
+        max_workers=3
+    )
+
+    assert results == [4] * 12
+    assert len(drivers) == 3
+    assert sum(d.pages for d in drivers) == 12
+    assert all(d.closed for d in drivers)
+
+    written = sorted(p.name for p in (tmp_path / "raw").iterdir())
+    assert len(written) == 12 and not any(name.endswith(".tmp") for name in written)
+    df = pd.read_csv(tmp_path / "raw" / "ic_mixed_matches_2024_div-3.csv")
+    assert df["Division"].unique().tolist() == ["div-3"]
+
+def test_run_driver_pool_runs_concurrently():
+    # Every item waits until 4 are in flight at once: only 4 concurrent workers get past it
+    barrier = threading.Barrier(4, timeout=5)
+
+    def work(driver, item):
+        barrier.wait()
+        return item
+
+    results = run_driver_pool(list(range(8)), work, lambda: FakeDriver(""), max_workers=4)
+    assert results == list(range(8))
+    assert not barrier.broken
+
+def test_run_driver_pool_survives_failures():
+    def work(driver, item):
+        if item == 2:
+            raise RuntimeError("page did not load")
+        return item * 10
+
+    results = run_driver_pool([1, 2, 3], work, lambda: FakeDriver(""), max_workers=2)
+    assert results == [10, None, 30]
+
+def test_run_driver_pool_keeps_repeated_items():
+    calls = iter(range(100))
+    work = lambda driver, item: (item, next(calls))
+
+    results = run_driver_pool(["a", "b", "a"], work, lambda: FakeDriver(""), max_workers=1)
+    assert results == [("a", 0), ("b", 1), ("a", 2)]
+
+def test_scrape_all_teams_rejects_unknown_backend():
+    with pytest.raises(ValueError, match="Unknown backend"):
+        scrape_all_teams("http://127.0.0.1:1/standings", backend="requests")
+
+def test_scrape_all_teams_quits_driver_when_discovery_fails(monkeypatch):
+    driver = FakeDriver("")
+
+    def broken_links(driver, base_url):
+        raise RuntimeError("standings page did not load")
+
+    monkeypatch.setattr(scraper_utils, "make_driver", lambda: driver)
+    monkeypatch.setattr(scraper_utils, "get_team_links", broken_links)
+    with pytest.raises(RuntimeError):
+        scrape_all_teams("http://127.0.0.1:1/standings")
+    assert driver.closed
@@ -0,0 +1,121 @@
+# tests/test_season_sim.py
+
+import numpy as np
+import pandas as pd
+import pytest
+from scripts.elo import EloEngine
+from scripts.predict import MatchupPredictor
+from scripts.season_sim import (
+    bracket_order, current_standings, line_win_probs, recent_lineups, simulate_season,
+)
+
+TEAMS = ['Aces', 'Baseliners', 'Cross Court', 'Drop Shots', 'Volleys']
+
+
+def _played():
+    """
+    Two played team matches: Aces beat Baseliners 4-2, Cross Court and Drop Shots draw 3-3.
+    """
+    rows = []
+    for team_match, home, away, home_lines in [(1, 'Aces', 'Baseliners', 4), (2, 'Cross Court', 'Drop Shots', 3)]:
+        for line in range(1, 7):
+            won = line <= home_lines
+            rows.append({'temp_team_match_id': team_match, 'Division': 'A', 'Home Team': home,
+                         'Away Team': away, 'Line_validated': line, 'Home Won': won, 'Away Won': not won})
+    return pd.DataFrame(rows)
+
+
+def _fixtures():
+    pairs = [(h, a) for h in TEAMS for a in TEAMS if h != a]
+    return pd.DataFrame({'Division': 'A', 'Home Team': [h for h, _ in pairs], 'Away Team': [a for _, a in pairs]})
+
+
+def _model(strengths):
+    """
+    A predictor and lineups where every pair of team t is rated strengths[t].
+    """
+    engine = EloEngine()
+    engine._ensure_capacity(12 * len(TEAMS))
+    lineups = {}
+    for t, (team, strength) in enumerate(zip(TEAMS, strengths)):
+        keys = np.arange(12 * t + 1, 12 * t + 13)
+        engine.ratings[keys] = strength
+        engine.rated[keys] = True
+        lineups[team] = {line: (int(keys[2 * line - 2]), int(keys[2 * line - 1])) for line in range(1, 7)}
+    return MatchupPredictor(engine), lineups
+
+
+# --- Test current standings ---
+def test_current_standings():
+    table = current_standings(_played()).set_index('Team')
+    assert table.loc['Aces', 'points'] == 4
+    assert table.loc['Baseliners', 'points'] == 2
+    assert table.loc['Drop Shots', ['played', 'points', 'lines_lost']].tolist() == [1, 3, 3]
+
+
+# --- Test line probabilities ---
+def test_recent_lineups_keeps_the_latest_pair():
+    facts = pd.DataFrame({
+        'team_match_id': [1, 2], 'line': [1, 1],
+        'home_team_key': [1, 1], 'away_team_key': [2, 2],
+        'home1_key': [10, 11], 'home2_key': [20, 21], 'away1_key': [30, 31], 'away2_key': [40, 0],
+    })
+    teams = pd.DataFrame({'team_key': [1, 2], 'team': ['Aces', 'Baseliners']})
+    assert recent_lineups(facts, teams) == {'Aces': {1: (11, 21)}, 'Baseliners': {1: (31, 0)}}
+
+def test_unknown_ratings_give_even_odds():
+    predictor, _ = _model([1500] * 5)
+    probs = line_win_probs(np.array([[1600.0] * 6]), np.array([[np.nan] + [1500.0] * 5]), predictor)
+    assert probs[0, 0] == 0.5
+    assert probs[0, 1] == pytest.approx(1 / (1 + 10 ** (-100 / 400)))
+
+
+# --- Test simulation ---
+def test_bracket_order():
+    assert bracket_order(4) == [0, 3, 1, 2]
+    assert bracket_order(8) == [0, 7, 3, 4, 1, 6, 2, 5]
+
+def test_seed_gives_same_results_whatever_the_chunk_size():
+    predictor, lineups = _model([1600, 1550, 1500, 1450, 1400])
+    args = (current_standings(_played()), _fixtures(), lineups, predictor)
+    whole = simulate_season(*args, n_sims=1000, seed=7)
+    chunked = simulate_season(*args, n_sims=1000, seed=7, chunk_size=256)
+    pd.testing.assert_frame_equal(whole['standings'], chunked['standings'])
+    other = simulate_season(*args, n_sims=1000, seed=8)
+    assert not other['standings']['mean_points'].equals(whole['standings']['mean_points'])
+
+def test_probabilities_are_consistent():
+    predictor, lineups = _model([1600, 1550, 1500, 1450, 1400])
+    standings = current_standings(_played())
+    result = simulate_season(standings, _fixtures(), lineups, predictor, n_sims=20000, playoff_spots=4, seed=1)
+    table = result['standings'].set_index('Team')
+
+    assert table['p_first'].sum() == pytest.approx(1.0)
+    assert table['p_playoffs'].sum() == pytest.approx(4.0)
+    assert table['p_final'].sum() == pytest.approx(2.0)
+    assert table['p_champion'].sum() == pytest.approx(1.0)
+    assert np.allclose(result['rank_probs'].sum(axis=1), 1.0)
+    assert table.loc['Volleys', ['played', 'points', 'remaining']].tolist() == [0, 0, 8]
+
+    # Mean points: points so far plus the expected lines won in the remaining fixtures
+    fixtures = _fixtures()
+    expected = dict(zip(standings['Team'], standings['points'].astype(float)))
+    strength = dict(zip(TEAMS, [1600, 1550, 1500, 1450, 1400]))
+    for home, away in zip(fixtures['Home Team'], fixtures['Away Team']):
+        p = 1 / (1 + 10 ** ((strength[away] - strength[home]) / 400))
+        expected[home] = expected.get(home, 0.0) + 6 * p
+        expected[away] = expected.get(away, 0.0) + 6 * (1 - p)
+    for team in TEAMS:
+        assert table.loc[team, 'mean_points'] == pytest.approx(expected[team], abs=0.1)
+
+    # The strongest team is the most likely champion, the weakest the least
+    assert table['p_champion'].idxmax() == 'Aces'
+    assert table['p_champion'].idxmin() == 'Volleys'
+
+def test_dominant_team_wins_almost_always():
+    predictor, lineups = _model([2500, 1500, 1500, 1500, 1500])
+    result = simulate_season(current_standings(_played()), _fixtures(), lineups, predictor,
+                             n_sims=2000, playoff_spots=2, seed=3)
+    table = result['standings'].set_index('Team')
+    assert table.loc['Aces', 'p_first'] > 0.99
+    assert table.loc['Aces', 'p_champion'] > 0.99
@@ -0,0 +1,66 @@
+# tests/test_snapshot_store.py
+
+import os
+
+import pandas as pd
+import pytest
+from scripts.snapshot_store import save_snapshot, load_snapshot, list_snapshots
+from scripts.reparse_snapshots import reparse_matches, reparse_rosters
+from scripts.roster_store import read_roster_table, update_roster_table
+from scripts.scraper_utils import parse_roster_html
+from tests.html_samples import sample_division_page, roster_page_html
+
+
+def test_snapshots_are_content_addressed(tmp_path):
+    html = sample_division_page()
+    first = save_snapshot(html, "matches", season=2024, division="A - West", root=tmp_path, fetched_at="2024-06-01T00:00:00")
+    second = save_snapshot(html, "matches", season=2024, division="A - West", root=tmp_path, fetched_at="2024-06-08T00:00:00")
+
+    assert first == second
+    assert load_snapshot(first, tmp_path) == html
+    assert len(list(tmp_path.glob("objects/*/*.html.gz"))) == 1
+
+    assert len(list_snapshots(tmp_path, latest=False)) == 2
+    latest = list_snapshots(tmp_path)
+    assert latest["fetched_at"].tolist() == ["2024-06-08T00:00:00"]
+
+def test_latest_snapshot_per_page(tmp_path):
+    save_snapshot("<html>old</html>", "roster", season=2024, team="Toronto Aces", team_id=1, root=tmp_path, fetched_at="2024-06-01")
+    save_snapshot("<html>new</html>", "roster", season=2024, team="Toronto Aces", team_id=1, root=tmp_path, fetched_at="2024-06-08")
+    save_snapshot("<html>other</html>", "roster", season=2024, team="Oakville Rockets", team_id=2, root=tmp_path, fetched_at="2024-06-02")
+    save_snapshot("<html>2023</html>", "roster", season=2023, team="Toronto Aces", team_id=1, root=tmp_path, fetched_at="2023-06-02")
+
+    latest = list_snapshots(tmp_path, kind="roster", season=2024)
+    assert len(latest) == 2
+    assert load_snapshot(latest.loc[latest["team_id"] == "1", "sha256"].iloc[0], tmp_path) == "<html>new</html>"
+
+def test_reparse_from_snapshots(tmp_path):
+    root = tmp_path / "snapshots"
+    save_snapshot(sample_division_page(division="A - West"), "matches", season="2024", division="A - West", root=root)
+    save_snapshot(roster_page_html("A - West", ["Alice"], ["Amy"]), "roster", season="2024", team="Toronto Aces", team_id="7", root=root)
+
+    assert reparse_matches(root, output_dir=tmp_path / "raw", store_path=tmp_path / "matches") == 4
+    assert reparse_rosters(root, output_dir=tmp_path / "processed") == 2
+
+    df = pd.read_csv(tmp_path / "raw" / "ic_mixed_matches_2024_A--West.csv")
+    assert df["Home ID 1"].iloc[0] == "id-Alice"
+    roster = read_roster_table("2024", output_dir=tmp_path / "processed")
+    assert roster["Name"].tolist() == ["Alice", "Amy"]
+    assert roster["Team"].tolist() == ["Toronto Aces", "Toronto Aces"]
+
+def test_reparse_refreshes_roster_fingerprints(tmp_path):
+    root = tmp_path / "snapshots"
+    html = roster_page_html("A - West", ["Alice"], ["Amy"])
+    save_snapshot(html, "roster", season="2024", team="Toronto Aces", team_id="7", root=root)
+    output_dir = tmp_path / "processed"
+    # Rows from an older parser, then a reparse
+    update_roster_table({"7": [{"Division": "A - West", "Team": "Toronto Aces", "Team ID": "7",
+                                "Name": "Alice (C)", "Suffix": "", "ID": "", "Role": "Player"}]},
+                        "2024", output_dir=output_dir, detected_at="w1")
+    reparse_rosters(root, output_dir=output_dir)
+
+    # The next scrape sees the same rows as the reparse: nothing changed
+    update = update_roster_table({"7": parse_roster_html(html, "Toronto Aces", "7")}, "2024",
+                                 output_dir=output_dir, detected_at="w2")
+    assert update["changed"] == []
+    assert update["changes"].empty